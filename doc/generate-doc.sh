@@ -10,3 +10,11 @@ SCRIPT_DIR=$(dirname "$(readlink -f "$0")")
 CPPIG_SRC_DIR="$SCRIPT_DIR/../src"
 
 "$CPPIG_SRC_DIR"/cppincludegraphgen --help > "$SCRIPT_DIR"/cmd_args.txt
+
+## help of subcommands
+COMMANDS_LIST=$(cd "$CPPIG_SRC_DIR" && python3 -c "from cppincludegraph.main import COMMANDS; print(' '.join(COMMANDS))")
+
+for cmd in $COMMANDS_LIST; do
+    printf "\n\n" >> "$SCRIPT_DIR"/cmd_args.txt
+    "$CPPIG_SRC_DIR"/cppincludegraphgen "$cmd" --help >> "$SCRIPT_DIR"/cmd_args.txt
+done
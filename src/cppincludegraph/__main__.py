@@ -4,7 +4,9 @@
 ##
 
 
+import sys
+
 from .main import main
 
 
-main()
+sys.exit(main())
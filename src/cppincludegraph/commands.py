@@ -0,0 +1,484 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Subcommands of 'cppincludegraphgen' working on include graph: diff, parse, why, includers, query, impact.
+##
+## Each command has its own arguments parser and is called with list of arguments following name of command.
+##
+
+import os
+import sys
+import logging
+import argparse
+
+from cppincludegraph import logger
+from cppincludegraph.logparser import find_build_logs, read_files_info
+from cppincludegraph.graphinput import build_include_graph, add_graph_input_arguments, read_input_graph
+from cppincludegraph.treestream import write_include_trees, TREE_FORMATS
+from cppincludegraph.querygraph import IncludeQuery, format_chain, get_node_label, DEFAULT_CHAINS_LIMIT
+from cppincludegraph.impactindex import (
+    build_impact_index,
+    save_impact_index,
+    load_impact_index,
+    write_impact,
+    IMPACT_FORMATS,
+)
+from cppincludegraph.graphdiff import (
+    GraphSummary,
+    summarize_graph,
+    summarize_graph_file,
+    diff_graphs,
+    write_diff_json,
+    generate_diff_page,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+def main_diff(args_list=None):
+    parser = argparse.ArgumentParser(prog="cppincludegraphgen diff", description="compare include graphs of two builds")
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    for side in ["old", "new"]:
+        parser.add_argument(
+            f"--{side}_logs",
+            nargs="+",
+            action="store",
+            required=False,
+            default="",
+            help=f"Build log files of {side} build",
+        )
+        parser.add_argument(
+            f"--{side}_graph",
+            action="store",
+            required=False,
+            default="",
+            help=f"Graph file of {side} build (created with '--save_graph'), alternative to '--{side}_logs'",
+        )
+        parser.add_argument(
+            f"--{side}_build_dir",
+            action="store",
+            required=False,
+            default=".",
+            help=f"Build root directory of {side} build",
+        )
+        parser.add_argument(
+            f"--{side}_rel_names",
+            action="store",
+            required=False,
+            default="",
+            help=f"Reduce prefix of all names of {side} build (nodes are matched by reduced names)",
+        )
+        parser.add_argument(
+            f"--{side}_files_info",
+            action="store",
+            required=False,
+            default="",
+            help=f"Files information of {side} build",
+        )
+    parser.add_argument(
+        "--build_regex",
+        action="store",
+        required=False,
+        default="",
+        help=r"Build object regex. If not given then '.*Building \S* object (.*)$' is used.",
+    )
+    parser.add_argument(
+        "-rd",
+        "--reduce_dirs",
+        nargs="+",
+        action="store",
+        required=False,
+        default="",
+        help="List of headers directories to reduce",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for cache of parsed build logs (only new or changed logs are parsed)",
+    )
+    parser.add_argument("--out_json", action="store", required=False, default="", help="Output JSON report file")
+    parser.add_argument("--out_html", action="store", required=False, default="", help="Output HTML report file")
+    parser.add_argument(
+        "--limit", type=int, action="store", required=False, default=None, help="Limit number of items in report lists"
+    )
+    parser.add_argument(
+        "--fail_threshold",
+        type=float,
+        action="store",
+        required=False,
+        default=None,
+        help="Exit with code 2 if total size of object files grows more than given value [kB]",
+    )
+
+    args = parser.parse_args(args_list)
+
+    if args.logall is True:
+        logger.configure(logLevel=logging.DEBUG)
+    else:
+        logger.configure(logLevel=logging.INFO)
+
+    old_summary = read_graph_summary(args, "old")
+    if old_summary is None:
+        return 1
+    new_summary = read_graph_summary(args, "new")
+    if new_summary is None:
+        return 1
+
+    _LOGGER.info("comparing graphs")
+    graph_diff = diff_graphs(old_summary, new_summary)
+    _LOGGER.info("diff result: %s", graph_diff)
+
+    if args.out_json:
+        write_diff_json(graph_diff, args.out_json, args.limit)
+    if args.out_html:
+        generate_diff_page(graph_diff, args.out_html, args.limit)
+
+    if args.fail_threshold is not None and graph_diff.getTotalSizeDelta() > args.fail_threshold * 1024:
+        _LOGGER.error("total size of object files exceeded threshold: %s kB", args.fail_threshold)
+        return 2
+
+    _LOGGER.info("--- completed ---")
+    return 0
+
+
+def read_graph_summary(args, side) -> GraphSummary:
+    graph_path = getattr(args, f"{side}_graph")
+    if graph_path:
+        try:
+            return summarize_graph_file(graph_path)
+        except (OSError, ValueError) as exc:
+            _LOGGER.error("unable to load graph: %s", exc)
+            return None
+
+    log_files = getattr(args, f"{side}_logs")
+    if not log_files:
+        _LOGGER.error("missing input of %s build (use '--%s_logs' or '--%s_graph')", side, side, side)
+        return None
+    build_args = argparse.Namespace(
+        log_dir="",
+        log_name="",
+        log_files=log_files,
+        build_dir=getattr(args, f"{side}_build_dir"),
+        reduce_dirs=args.reduce_dirs,
+        build_regex=args.build_regex,
+        namefromlogfile=False,
+        cache_dir=args.cache_dir,
+        rel_names=getattr(args, f"{side}_rel_names"),
+        collapse_dirs=None,
+        collapse_depth=None,
+    )
+    files_info_dict = read_files_info(getattr(args, f"{side}_files_info"))
+    build_tree = build_include_graph(build_args, files_info_dict)
+    if build_tree is None:
+        return None
+    return summarize_graph(build_tree)
+
+
+## ===================================================================
+
+
+def main_parse(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen parse",
+        description="write include trees of object files as JSON Lines (without building include graph)",
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument(
+        "-lf", "--log_files", nargs="+", action="store", required=False, default="", help="List of build log files"
+    )
+    parser.add_argument(
+        "--log_dir", action="store", required=False, default="", help="Root for search for build log files"
+    )
+    parser.add_argument(
+        "--log_name", action="store", required=False, default="", help="Name of build log file to search for"
+    )
+    parser.add_argument(
+        "--build_dir", action="store", required=False, default=".", help="Build root directory (used to reduce paths)"
+    )
+    parser.add_argument(
+        "--build_regex",
+        action="store",
+        required=False,
+        default="",
+        help=r"Build object regex. If not given then '.*Building \S* object (.*)$' is used.",
+    )
+    parser.add_argument(
+        "--tree_format",
+        choices=TREE_FORMATS,
+        action="store",
+        required=False,
+        default="nested",
+        help="Format of include tree: nested lists of includes or flat list of unique headers",
+    )
+    parser.add_argument(
+        "--out_jsonl",
+        action="store",
+        required=False,
+        default="",
+        help="Output file (if not given, then lines are printed to standard output)",
+    )
+
+    args = parser.parse_args(args_list)
+
+    if args.logall is True:
+        logger.configure(logLevel=logging.DEBUG)
+    elif not args.out_jsonl:
+        ## keep printed lines parsable
+        logger.configure(logLevel=logging.WARNING)
+    else:
+        logger.configure(logLevel=logging.INFO)
+
+    found_logs = find_build_logs(args.log_dir or None, args.log_name or None)
+    if len(args.log_files) > 0:
+        found_logs.extend(args.log_files)
+    if not found_logs:
+        _LOGGER.error("missing build logs (use '--log_files' or '--log_dir')")
+        return 1
+    build_dir = os.path.realpath(args.build_dir)
+
+    if args.out_jsonl:
+        _LOGGER.info("writing include trees: %s", args.out_jsonl)
+        with open(args.out_jsonl, "w", encoding="utf-8") as out_file:
+            objects_count = write_include_trees(found_logs, build_dir, out_file, args.build_regex, args.tree_format)
+    else:
+        objects_count = write_include_trees(found_logs, build_dir, sys.stdout, args.build_regex, args.tree_format)
+
+    _LOGGER.info("written %s object files", objects_count)
+    _LOGGER.info("--- completed ---")
+    return 0
+
+
+## ============================================================
+
+
+def main_why(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen why", description="print include chains leading from object file to header"
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument("source", help="Name of object file (or header), suffix of path is enough if unique")
+    parser.add_argument("target", help="Name of included header, suffix of path is enough if unique")
+    parser.add_argument(
+        "--all", action="store_true", required=False, default=False, help="Print all include chains (not only shortest)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        action="store",
+        required=False,
+        default=DEFAULT_CHAINS_LIMIT,
+        help="Maximum number of chains printed with '--all'",
+    )
+    add_graph_input_arguments(parser)
+
+    args = parser.parse_args(args_list)
+    configure_query_logger(args)
+
+    build_tree = read_input_graph(args)
+    if build_tree is None:
+        return 1
+    query = IncludeQuery(build_tree)
+    try:
+        print_chains(query, args.source, args.target, args.all, args.limit)
+    except ValueError as exc:
+        _LOGGER.error("%s", exc)
+        return 1
+    return 0
+
+
+def main_includers(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen includers", description="print direct includers and object files including header"
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument("target", help="Name of header, suffix of path is enough if unique")
+    add_graph_input_arguments(parser)
+
+    args = parser.parse_args(args_list)
+    configure_query_logger(args)
+
+    build_tree = read_input_graph(args)
+    if build_tree is None:
+        return 1
+    query = IncludeQuery(build_tree)
+    try:
+        print_includers(query, args.target)
+    except ValueError as exc:
+        _LOGGER.error("%s", exc)
+        return 1
+    return 0
+
+
+def main_query(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen query",
+        description="load graph once and answer queries read from standard input, one per line:"
+        " 'why SOURCE TARGET', 'whyall SOURCE TARGET', 'includers TARGET'",
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        action="store",
+        required=False,
+        default=DEFAULT_CHAINS_LIMIT,
+        help="Maximum number of chains printed by 'whyall'",
+    )
+    add_graph_input_arguments(parser)
+
+    args = parser.parse_args(args_list)
+    configure_query_logger(args)
+
+    build_tree = read_input_graph(args)
+    if build_tree is None:
+        return 1
+    query = IncludeQuery(build_tree)
+    for line in sys.stdin:
+        words = line.split()
+        if not words:
+            continue
+        command = words[0]
+        try:
+            if command == "why" and len(words) == 3:
+                print_chains(query, words[1], words[2])
+            elif command == "whyall" and len(words) == 3:
+                print_chains(query, words[1], words[2], True, args.limit)
+            elif command == "includers" and len(words) == 2:
+                print_includers(query, words[1])
+            else:
+                _LOGGER.error("invalid query: %s", line.strip())
+        except ValueError as exc:
+            _LOGGER.error("%s", exc)
+        ## answer is visible before next query is read
+        sys.stdout.flush()
+    return 0
+
+
+def configure_query_logger(args):
+    if args.logall is True:
+        logger.configure(logLevel=logging.DEBUG)
+    else:
+        ## keep printed answers readable
+        logger.configure(logLevel=logging.WARNING)
+
+
+def print_chains(query: IncludeQuery, source_name, target_name, all_chains=False, limit=DEFAULT_CHAINS_LIMIT):
+    source = query.findNode(source_name)
+    target = query.findNode(target_name)
+    if all_chains:
+        chains_list = query.getAllChains(source, target, limit)
+    else:
+        chains_list = [query.getShortestChain(source, target)]
+        chains_list = [chain for chain in chains_list if chain]
+    if not chains_list:
+        print(f"{get_node_label(target)} is not included by {get_node_label(source)}")
+        return
+    for chain in chains_list:
+        print(format_chain(chain))
+
+
+def print_includers(query: IncludeQuery, target_name):
+    target = query.findNode(target_name)
+    includers_list = query.getIncluders(target)
+    objects_list = query.getIncludingObjects(target)
+    target_label = get_node_label(target)
+    print(f"Direct includers of {target_label} ({len(includers_list)}):")
+    for node in includers_list:
+        print(f"    {get_node_label(node)}")
+    print(f"Object files including {target_label} ({len(objects_list)}):")
+    for node in objects_list:
+        print(f"    {get_node_label(node)}")
+
+
+## ============================================================
+
+
+def main_impact(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen impact",
+        description="print object files and packages rebuilt when given files change",
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument("changed_files", nargs="*", help="Changed files, suffix of path is enough")
+    parser.add_argument(
+        "--changed_list",
+        action="store",
+        required=False,
+        default="",
+        help="File with list of changed files, one per line (e.g. output of 'git diff --name-only'), '-' for stdin",
+    )
+    parser.add_argument(
+        "--load_impact",
+        action="store",
+        required=False,
+        default="",
+        help="Impact index file (created with '--save_impact'), alternative to graph input",
+    )
+    parser.add_argument(
+        "--save_impact", action="store", required=False, default="", help="Store impact index to given file"
+    )
+    parser.add_argument(
+        "--impact_format",
+        choices=IMPACT_FORMATS,
+        action="store",
+        required=False,
+        default="text",
+        help="Format of output: summary, JSON or plain list of affected object files",
+    )
+    parser.add_argument(
+        "--impact_out",
+        action="store",
+        required=False,
+        default="",
+        help="Output file (if not given, then result is printed to standard output)",
+    )
+    add_graph_input_arguments(parser)
+
+    args = parser.parse_args(args_list)
+    configure_query_logger(args)
+
+    if args.load_impact:
+        try:
+            impact_index = load_impact_index(args.load_impact)
+        except (OSError, ValueError) as exc:
+            _LOGGER.error("unable to load impact index: %s", exc)
+            return 1
+    else:
+        build_tree = read_input_graph(args)
+        if build_tree is None:
+            return 1
+        impact_index = build_impact_index(build_tree)
+    if args.save_impact:
+        save_impact_index(impact_index, args.save_impact)
+
+    changed_list = list(args.changed_files)
+    if args.changed_list == "-":
+        changed_list.extend(line.strip() for line in sys.stdin)
+    elif args.changed_list:
+        with open(args.changed_list, "r", encoding="utf-8") as list_file:
+            changed_list.extend(line.strip() for line in list_file)
+    changed_list = [item for item in changed_list if item]
+    if not changed_list:
+        if args.save_impact:
+            return 0
+        _LOGGER.error("missing changed files (use positional arguments or '--changed_list')")
+        return 1
+
+    impact = impact_index.getImpact(changed_list)
+    if args.impact_out:
+        with open(args.impact_out, "w", encoding="utf-8") as out_file:
+            write_impact(impact, out_file, args.impact_format)
+    else:
+        write_impact(impact, sys.stdout, args.impact_format)
+    return 0
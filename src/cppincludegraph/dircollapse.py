@@ -0,0 +1,93 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Collapsing of headers into directory nodes.
+##
+## Headers under chosen directories (or below chosen path depth) are replaced by single node
+## representing whole directory. Collapsing is done on raw graph, before 'IncludeGraph' is
+## built, so all derived data, graphs and pages are calculated on reduced graph.
+##
+
+import os
+import logging
+from typing import List, Dict
+
+from cppincludegraph.includegraph import GraphNode, NodeData, get_descendants_set
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def collapse_directories(
+    packages_list: List[GraphNode], collapse_dirs: List[str] = None, collapse_depth=None, base_dir=None
+) -> Dict[str, GraphNode]:
+    """Replace headers under given directories (or below given path depth) by single directory nodes.
+
+    Size of directory node is sum of sizes of its headers, edges of headers are merged and includes
+    inside directory are dropped. Graph is modified in place. Return dict of created directory nodes.
+    """
+    all_nodes = get_descendants_set(packages_list)
+    dir_nodes: Dict[str, GraphNode] = {}
+    replace_dict: Dict[GraphNode, GraphNode] = {}
+    for node in all_nodes:
+        if node.data.type is not NodeData.NodeType.HEADER:
+            continue
+        dir_name = get_collapse_dir(node.data.name, collapse_dirs, collapse_depth, base_dir)
+        if dir_name is None:
+            continue
+        dir_node = dir_nodes.get(dir_name, None)
+        if dir_node is None:
+            dir_node = GraphNode()
+            dir_node.data.name = dir_name
+            dir_node.data.type = NodeData.NodeType.HEADER
+            dir_nodes[dir_name] = dir_node
+        dir_node.data.fsize += node.data.fsize
+        replace_dict[node] = dir_node
+    if not replace_dict:
+        return dir_nodes
+
+    _LOGGER.info("collapsing %s headers into %s directories", len(replace_dict), len(dir_nodes))
+    ## sorted order makes children order of directory nodes stable
+    new_children: Dict[GraphNode, Dict[GraphNode, None]] = {}
+    for node in sorted(all_nodes, key=lambda item: item.data.name):
+        target = replace_dict.get(node, node)
+        target_children = new_children.setdefault(target, {})
+        for child in node.children:
+            child_target = replace_dict.get(child, child)
+            if child_target is not target:
+                target_children[child_target] = None
+
+    for node in new_children:
+        node.parents = set()
+    for node, children in new_children.items():
+        node.children = []
+        node.addChildren(children)
+    return dir_nodes
+
+
+## return directory collapsing given file or None if file should stay as it is
+def get_collapse_dir(file_path, collapse_dirs: List[str] = None, collapse_depth=None, base_dir=None):
+    if collapse_dirs:
+        for dir_path in collapse_dirs:
+            dir_path = dir_path.rstrip("/")
+            if file_path.startswith(dir_path + "/"):
+                return dir_path
+    if not collapse_depth or collapse_depth < 1:
+        return None
+    prefix = ""
+    if base_dir:
+        base_dir = base_dir.rstrip("/")
+        if file_path.startswith(base_dir + "/"):
+            ## depth is counted from names base directory
+            prefix = base_dir
+    dir_path = os.path.dirname(file_path[len(prefix) :])
+    path_items = [item for item in dir_path.split("/") if item]
+    if not path_items:
+        return None
+    root_sep = "/" if dir_path.startswith("/") else ""
+    return prefix + root_sep + "/".join(path_items[:collapse_depth])
@@ -0,0 +1,102 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Dominator tree calculation based on iterative algorithm by Cooper, Harvey and Kennedy
+## ("A Simple, Fast Dominance Algorithm").
+##
+## Graph is given in compact form: nodes are consecutive integers and 'children' list
+## contains list of successors of each node.
+##
+
+from typing import List, Tuple, Iterable
+
+
+def calculate_dominators(children: List[List[int]], start: int) -> Tuple[List[int], List[int]]:
+    """Return pair (nodes reachable from start in reverse postorder, immediate dominators).
+
+    Immediate dominators are indexed by position in reverse postorder and point to position
+    of dominating node. Start node is placed on position 0 and dominates itself.
+    """
+    ## iterative DFS -- include graphs are too deep for recursion
+    postorder: List[int] = []
+    visited = {start}
+    stack = [(start, iter(children[start]))]
+    while stack:
+        node, children_iter = stack[-1]
+        for child in children_iter:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(children[child])))
+                break
+        else:
+            stack.pop()
+            postorder.append(node)
+    postorder.reverse()
+    order = postorder
+
+    position = {node: pos for pos, node in enumerate(order)}
+    predecessors: List[List[int]] = [[] for _ in order]
+    for pos, node in enumerate(order):
+        for child in children[node]:
+            predecessors[position[child]].append(pos)
+
+    ## positions in reverse postorder allow to compare nodes with plain integers
+    idom = [-1] * len(order)
+    idom[0] = 0
+    changed = True
+    while changed:
+        changed = False
+        for pos in range(1, len(order)):
+            new_idom = -1
+            for pred in predecessors[pos]:
+                if idom[pred] < 0:
+                    ## not processed yet
+                    continue
+                if new_idom < 0:
+                    new_idom = pred
+                    continue
+                finger1 = pred
+                finger2 = new_idom
+                while finger1 != finger2:
+                    while finger1 > finger2:
+                        finger1 = idom[finger1]
+                    while finger2 > finger1:
+                        finger2 = idom[finger2]
+                new_idom = finger1
+            if idom[pos] != new_idom:
+                idom[pos] = new_idom
+                changed = True
+
+    return (order, idom)
+
+
+def calculate_exclusive_sizes(children: List[List[int]], sizes: List[int], start: int) -> Tuple[List[int], List[int]]:
+    """Return pair (nodes reachable from start, exclusive sizes of the nodes).
+
+    Exclusive size of node is sum of sizes of all nodes dominated by the node (including itself),
+    so it is amount of data that would disappear from start node after removing the node.
+    """
+    order, idom = calculate_dominators(children, start)
+    exclusive = [sizes[node] for node in order]
+    ## dominated nodes are always placed after dominator
+    for pos in range(len(order) - 1, 0, -1):
+        exclusive[idom[pos]] += exclusive[pos]
+    return (order, exclusive)
+
+
+def aggregate_exclusive_sizes(children: List[List[int]], sizes: List[int], start_list: Iterable[int]) -> List[int]:
+    """Sum exclusive sizes of nodes over subgraphs of all given start nodes.
+
+    Start nodes themselves are not counted in their own subgraphs.
+    """
+    ret_list = [0] * len(children)
+    for start in start_list:
+        order, exclusive = calculate_exclusive_sizes(children, sizes, start)
+        for pos in range(1, len(order)):
+            ret_list[order[pos]] += exclusive[pos]
+    return ret_list
@@ -0,0 +1,143 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Lightweight DOT graph writer.
+##
+## Graph keeps only nodes attributes and edges and emits DOT text directly. Rendering
+## is done by piping the text into Graphviz process.
+##
+
+import logging
+import subprocess  # nosec
+from typing import List, Set, Dict, Tuple
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DotNode:
+
+    def __init__(self, name, attributes: Dict[str, str]):
+        self.name = name
+        self.attributes: Dict[str, str] = attributes
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def get(self, key):
+        return self.attributes.get(key)
+
+
+class DotGraph:
+
+    def __init__(self, name="G", graph_type="digraph"):
+        self.name = name
+        self.graph_type = graph_type
+        self.attributes: Dict[str, str] = {}
+        self.nodes: Dict[str, DotNode] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self.ranks: List[Tuple[str, List[str]]] = []
+        self._has_parent: Set[str] = set()
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def copy(self) -> "DotGraph":
+        ret_graph = DotGraph(self.name, self.graph_type)
+        ret_graph.attributes = self.attributes.copy()
+        ret_graph.nodes = {name: DotNode(name, node.attributes.copy()) for name, node in self.nodes.items()}
+        ret_graph.edges = self.edges.copy()
+        ret_graph.ranks = self.ranks.copy()
+        ret_graph._has_parent = self._has_parent.copy()  # pylint: disable=protected-access
+        return ret_graph
+
+    def addNode(self, name, **attributes) -> DotNode:
+        """Add node to graph. Return None if node already exists."""
+        if name in self.nodes:
+            return None
+        node = DotNode(name, attributes)
+        self.nodes[name] = node
+        return node
+
+    def getNode(self, name) -> DotNode:
+        return self.nodes.get(name)
+
+    def addEdge(self, from_name, to_name):
+        self.edges.append((from_name, to_name))
+        self._has_parent.add(to_name)
+
+    ## get nodes without incoming edges
+    def getNodesTop(self) -> List[DotNode]:
+        return [node for name, node in self.nodes.items() if name not in self._has_parent]
+
+    def setNodesRank(self, nodes_list: List[DotNode], rank):
+        self.ranks.append((rank, [node.name for node in nodes_list]))
+
+    def toString(self) -> str:
+        edge_op = "->" if self.graph_type == "digraph" else "--"
+        lines = [f"{self.graph_type} {quote(self.name)} {{"]
+        for key, value in self.attributes.items():
+            lines.append(f"{key}={quote(value)};")
+        for node in self.nodes.values():
+            lines.append(f"{quote(node.name)}{format_attributes(node.attributes)};")
+        for from_name, to_name in self.edges:
+            lines.append(f"{quote(from_name)} {edge_op} {quote(to_name)};")
+        for rank, names_list in self.ranks:
+            names = " ".join(quote(name) + ";" for name in names_list)
+            lines.append(f"{{rank={quote(rank)}; {names}}}")
+        lines.append("}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render(self, file_format="svg", engine="dot") -> bytes:
+        return render_dot(self.toString(), file_format, engine)
+
+    ## write rendered graph to file path or binary file object
+    def write(self, out, file_format="svg"):
+        content = self.render(file_format)
+        if hasattr(out, "write"):
+            out.write(content)
+            return
+        with open(out, "wb") as out_file:
+            out_file.write(content)
+
+    def writePNG(self, out_path):
+        self.write(out_path, file_format="png")
+
+
+def set_node_style(node: DotNode, style: Dict[str, str]):
+    for key, value in style.items():
+        node.set(key, value)
+
+
+def quote(value) -> str:
+    ## backslash is escaped first, so escapes of quotes are not doubled
+    value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{value}"'
+
+
+def format_attributes(attributes: Dict[str, str]) -> str:
+    if not attributes:
+        return ""
+    items = ", ".join(f"{key}={quote(value)}" for key, value in attributes.items() if value is not None)
+    return f" [{items}]"
+
+
+## raises subprocess.TimeoutExpired if rendering exceeds timeout (in seconds)
+def render_dot(dot_source: str, file_format="svg", engine="dot", timeout=None, extra_args=None) -> bytes:
+    command = [engine, f"-T{file_format}"]
+    if extra_args:
+        command.extend(extra_args)
+    _LOGGER.debug("executing: %s", command)
+    result = subprocess.run(  # nosec
+        command, input=dot_source.encode("utf-8"), capture_output=True, check=False, timeout=timeout
+    )
+    if result.returncode != 0:
+        error_message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"unable to render graph with '{engine}': {error_message}")
+    return result.stdout
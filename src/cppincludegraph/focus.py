@@ -0,0 +1,93 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Selection of nodes presented on separate pages (focus mode).
+##
+## Pages are generated only for selected nodes, remaining nodes are presented in tables
+## and graphs without links.
+##
+
+import re
+import fnmatch
+import logging
+from typing import List, Set, Dict, Any, Iterable
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph, NodeData
+
+
+_LOGGER = logging.getLogger(__name__)
+
+FOCUS_ORDERS = ["ai_size", "objects"]
+
+
+def select_focus_nodes(build_tree: IncludeGraph, focus_config: Dict[str, Any] = None) -> Set[GraphNode]:
+    """Return nodes chosen by selectors of config or None if no selector is given.
+
+    Config keys: 'names' (glob patterns matched against names and labels), 'regex' (regular
+    expression searched in names and labels), 'top' (number of biggest headers), 'top_order'
+    (one of 'FOCUS_ORDERS'), 'packages' (names or labels of packages, object files of packages
+    are also selected) and 'hops' (selection is extended by includers and includes within
+    given distance).
+    """
+    if not focus_config:
+        return None
+    names_list = focus_config.get("names")
+    regex = focus_config.get("regex")
+    top_count = focus_config.get("top")
+    packages_list = focus_config.get("packages")
+    if not names_list and not regex and not top_count and not packages_list:
+        return None
+
+    all_nodes: Set[GraphNode] = set(build_tree.getFlatList())
+    selected: Set[GraphNode] = set()
+    if names_list:
+        selected.update(node for node in all_nodes if match_patterns(node, names_list))
+    if regex:
+        pattern = re.compile(regex)
+        selected.update(
+            node for node in all_nodes if pattern.search(node.data.name) or pattern.search(node.data.label or "")
+        )
+    if top_count:
+        selected.update(find_top_headers(all_nodes, top_count, focus_config.get("top_order")))
+    if packages_list:
+        for package_node in build_tree.getPackageNodes():
+            if package_node.data.name in packages_list or package_node.data.label in packages_list:
+                selected.add(package_node)
+                selected.update(package_node.children)
+
+    hops = focus_config.get("hops")
+    if hops and selected:
+        ## sorted seed makes result independent of order of set
+        seed_list = sorted(selected, key=lambda item: item.data.name)
+        selected, _ = build_tree.getConnectedNodesBounded(seed_list, radius=hops)
+
+    _LOGGER.info("focus: selected %s of %s nodes", len(selected), len(all_nodes))
+    return selected
+
+
+def match_patterns(node: GraphNode, patterns_list: List[str]) -> bool:
+    for pattern in patterns_list:
+        if fnmatch.fnmatchcase(node.data.name, pattern):
+            return True
+        if node.data.label and fnmatch.fnmatchcase(node.data.label, pattern):
+            return True
+    return False
+
+
+## return biggest headers, equal items are sorted by name
+def find_top_headers(nodes_list: Iterable[GraphNode], top_count, top_order=None) -> List[GraphNode]:
+    if top_order is None:
+        top_order = FOCUS_ORDERS[0]
+    if top_order not in FOCUS_ORDERS:
+        raise ValueError(f"invalid focus order: {top_order}")
+    headers_list = [node for node in nodes_list if node.data.type is NodeData.NodeType.HEADER]
+    if top_order == "objects":
+        headers_list.sort(key=lambda item: (-len(item.data.all_obj_files or []), item.data.name))
+    else:
+        headers_list.sort(key=lambda item: (-item.data.ai_size, item.data.name))
+    return headers_list[:top_count]
@@ -9,29 +9,62 @@ import os
 import logging
 from typing import List, Set, Dict, Any, Tuple
 import collections
-import io
-
-from showgraph.graphviz import Graph, set_node_style
+import tempfile
+import gzip
+import multiprocessing
 
 from cppincludegraph import texttemplate
+from cppincludegraph.dotwriter import DotGraph, set_node_style
+from cppincludegraph.layout import render_graph, get_layout_config
 from cppincludegraph.includegraph import GraphNode, IncludeGraph, get_names
+from cppincludegraph.graphstore import save_graph, load_graph
+from cppincludegraph.rendercache import RenderCache, replace_file_if_changed, calculate_hash, write_file_atomic
+from cppincludegraph.pagewriter import PageIndex, PageWriter, PAGE_TEMPLATE_PATH, BODY_COLOR
 
 
 _LOGGER = logging.getLogger(__name__)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+## modes of storing graphs: embedded into page, separate SVG file, separate compressed SVG file
+SVG_MODES = ["embed", "file", "svgz"]
+
+## subdirectory of output directory containing graphs files
+SVG_DIR_NAME = "graphs"
+
+## options of generation of pages
+DEFAULT_PAGES_OPTIONS: Dict[str, Any] = {
+    "jobs": 1,  ## number of processes generating pages of nodes
+    "render_cache_dir": None,
+    "graph_radius": None,
+    "graph_max_nodes": None,
+    "layout_config": None,  ## see 'get_layout_config'
+    "table_limit": None,
+    "listing_page_size": None,
+    "svg_mode": "embed",
+    "focus_nodes": None,  ## set of nodes, if given then pages are generated only for them
+}
+
 
 ## ===================================================================
 
 
+def get_pages_options(pages_options=None) -> Dict[str, Any]:
+    ret_options = DEFAULT_PAGES_OPTIONS.copy()
+    if pages_options:
+        ret_options.update(pages_options)
+    return ret_options
+
+
 def generate_pages(
     build_tree: IncludeGraph,
     out_dir,
     files_info_dict=None,
     config_params_dict=None,
+    *,
     no_highlight=False,
     mark_hotpath=False,
+    pages_options=None,
 ):
     if files_info_dict is None:
         files_info_dict = {}
@@ -39,101 +72,251 @@ def generate_pages(
         config_params_dict = {}
 
     params_dict: Dict[str, Any] = {}
-    generate_graph_pages(build_tree, params_dict, no_highlight, mark_hotpath, out_dir)
+    options = get_pages_options(pages_options)
+    graph_config = get_graph_config(
+        no_highlight, mark_hotpath, options["graph_radius"], options["graph_max_nodes"], options["svg_mode"]
+    )
+    focus_nodes: Set[GraphNode] = options["focus_nodes"]
+    if focus_nodes is not None:
+        ## pages are generated only for focused nodes
+        graph_config["linked_names"] = {node.data.name for node in focus_nodes}
+    generate_graph_pages(build_tree, params_dict, graph_config, out_dir, options)
+
+
+## parameters of 'generate_dot_graph2'
+def get_graph_config(no_highlight=False, mark_hotpath=False, graph_radius=None, graph_max_nodes=None, svg_mode="embed"):
+    graph_config = {
+        "no_highlight": no_highlight,
+        "mark_hotpath": mark_hotpath,
+        "radius": graph_radius,
+        "max_nodes": graph_max_nodes,
+        "link_target": None,
+        "linked_names": None,
+    }
+    if svg_mode != "embed":
+        ## links of graph presented by 'object' tag have to open in main window
+        graph_config["link_target"] = "_top"
+    return graph_config
 
 
 ##
-def generate_graph_pages(build_tree: IncludeGraph, item_config_dict, no_highlight, mark_hotpath, output_dir):
-    pages_subdirs = build_tree.subdir_mode
-
-    main_page_link = os.path.join(output_dir, "index.html")
-
+def generate_graph_pages(build_tree: IncludeGraph, item_config_dict, graph_config, output_dir, pages_options=None):
     all_nodes: List[GraphNode] = build_tree.getFlatList()
 
     #     graph_generator = GraphFactory( build_tree, output_dir )
 
-    package_nodes = build_tree.getPackageNodes()
-
-    object_files_names = set()
-    for package_node in package_nodes:
-        object_files_names.update([child.data.name for child in package_node.children])
-
-    child_counter = 0
-    child_size = len(all_nodes)
+    options = get_pages_options(pages_options)
+    pages_config = get_pages_config(build_tree, item_config_dict, graph_config, output_dir, options)
+    jobs = options["jobs"]
 
+    linked_names = graph_config.get("linked_names")
+    nodes_list: List[GraphNode] = []
     handled_nodes: Set[str] = set()
     ## child_node: GraphNode
     for child_node in all_nodes:
-        child_counter += 1
-
         child_name = child_node.data.name
         if child_name in handled_nodes:
             continue
-
-        _LOGGER.info("%s/%s: generating data for child %s", child_counter, child_size, child_name)
+        if linked_names is not None and child_name not in linked_names:
+            continue
         handled_nodes.add(child_name)
+        nodes_list.append(child_node)
 
-        _LOGGER.info("generating dot graph")
-        child_dir = os.path.join(output_dir, child_node.data.subdir)
+    page_index = PageIndex(build_tree, output_dir, linked_names)
 
-        if pages_subdirs:
-            os.makedirs(child_dir, exist_ok=True)
-            html_out_path = os.path.join(child_dir, "index.html")
-        else:
-            html_out_path = child_dir + ".html"
-            child_dir = os.path.join(child_dir, os.pardir)
-
-        child_graph: Graph = generate_dot_graph2(build_tree, [child_node], child_dir, no_highlight, mark_hotpath)
-
-        _LOGGER.info("storing dot graph")
-        # store_dot_graph(child_graph, child_dir)
-        svg_content = get_graph_svg(child_graph)
-
-        if child_node in package_nodes:
-            ## package
-            include_counter = count_packages_includes([child_node])
-            included_list = get_includes_list(build_tree, object_files_names, include_counter)
-        else:
-            ## header
-            included_list = get_includes_list(build_tree, object_files_names, child_node.data.include_counter)
-
-        page_params = item_config_dict.copy()
-        page_params.update(
-            {
-                "root_dir": output_dir,
-                "main_page_link": main_page_link,
-                "item_data": child_node.data,
-                "children_list": child_node.children,
-                "included_list": included_list,
-                "svg_embed_content": svg_content,
-            }
-        )
-        generate_html_page(html_out_path, page_params)
+    if jobs > 1 and len(nodes_list) > 1:
+        generate_node_pages_parallel(build_tree, nodes_list, pages_config, page_index, jobs)
+    else:
+        child_size = len(nodes_list)
+        for child_counter, child_node in enumerate(nodes_list, 1):
+            _LOGGER.info("%s/%s: generating data for child %s", child_counter, child_size, child_node.data.name)
+            generate_node_page(build_tree, child_node, pages_config, page_index)
 
     ## generate main page
     _LOGGER.info("generating main page")
-    graph: Graph = generate_dot_graph2(build_tree, package_nodes, output_dir, no_highlight, mark_hotpath)
+    package_nodes = build_tree.getPackageNodes()
+    graph_base_dir = pages_config["svg_dir"] or output_dir
+    graph: DotGraph = generate_dot_graph2(build_tree, package_nodes, graph_base_dir, graph_config)
     # store_dot_graph(graph, output_dir)
-    svg_content = get_graph_svg(graph)
+    html_out_path, page_params = get_main_page_params(build_tree, graph, pages_config)
 
     _LOGGER.info("generating main graph image")
     out_png = os.path.join(output_dir, "include_tree.gv.png")
-    graph.writePNG(out_png)
+    with open(out_png, "wb") as out_file:
+        out_file.write(render_graph(graph, "png", pages_config["layout_config"]))
+
+    generate_html_page(html_out_path, page_params, page_index, pages_config["tables_config"])
 
+
+## 'pages_options' -- see 'DEFAULT_PAGES_OPTIONS'
+def get_pages_config(
+    build_tree: IncludeGraph, item_config_dict, graph_config, output_dir, pages_options=None
+) -> Dict[str, Any]:
+    options = get_pages_options(pages_options)
+    svg_mode = options["svg_mode"]
+    object_files_names = set()
+    for package_node in build_tree.getPackageNodes():
+        object_files_names.update([child.data.name for child in package_node.children])
+
+    pages_config = {
+        "item_config": item_config_dict,
+        "graph_config": graph_config,
+        "output_dir": output_dir,
+        "object_files_names": object_files_names,
+        "render_cache": None,
+        "layout_config": get_layout_config(options["layout_config"]),
+        ## parameters of tables of pages
+        "tables_config": {"limit": options["table_limit"], "page_size": options["listing_page_size"]},
+        "svg_dir": None,
+        "svg_compress": svg_mode == "svgz",
+    }
+    if svg_mode not in SVG_MODES:
+        raise ValueError(f"invalid SVG mode: {svg_mode}")
+    if svg_mode != "embed":
+        pages_config["svg_dir"] = os.path.join(output_dir, SVG_DIR_NAME)
+        os.makedirs(pages_config["svg_dir"], exist_ok=True)
+    if options["render_cache_dir"]:
+        pages_config["render_cache"] = RenderCache(options["render_cache_dir"])
+    return pages_config
+
+
+## return path and template parameters of main page
+def get_main_page_params(build_tree: IncludeGraph, graph: DotGraph, pages_config) -> Tuple[str, Dict[str, Any]]:
+    output_dir = pages_config["output_dir"]
+    svg_params = get_page_svg_params(graph, pages_config, output_dir)
+
+    package_nodes = build_tree.getPackageNodes()
     include_counter = count_packages_includes(package_nodes)
-    included_list = get_includes_list(build_tree, object_files_names, include_counter)
+    included_list = get_includes_list(build_tree, pages_config["object_files_names"], include_counter)
 
     html_out_path = os.path.join(output_dir, "index.html")
-    page_params = item_config_dict.copy()
+    page_params = pages_config["item_config"].copy()
     page_params.update(
         {
             "root_dir": output_dir,
             "children_list": package_nodes,
             "included_list": included_list,
-            "svg_embed_content": svg_content,
         }
     )
-    generate_html_page(html_out_path, page_params)
+    page_params.update(svg_params)
+    return html_out_path, page_params
+
+
+def generate_node_page(build_tree: IncludeGraph, child_node: GraphNode, pages_config, page_index: PageIndex):
+    html_out_path, page_params = get_node_page_params(build_tree, child_node, pages_config)
+    generate_html_page(html_out_path, page_params, page_index, pages_config["tables_config"])
+
+
+## return path and template parameters of page of node
+def get_node_page_params(
+    build_tree: IncludeGraph, child_node: GraphNode, pages_config, make_dirs=True
+) -> Tuple[str, Dict[str, Any]]:
+    output_dir = pages_config["output_dir"]
+    main_page_link = os.path.join(output_dir, "index.html")
+    package_nodes = build_tree.getPackageNodes()
+
+    _LOGGER.info("generating dot graph")
+    child_dir = os.path.join(output_dir, child_node.data.subdir)
+
+    if build_tree.subdir_mode:
+        if make_dirs:
+            os.makedirs(child_dir, exist_ok=True)
+        html_out_path = os.path.join(child_dir, "index.html")
+    else:
+        html_out_path = child_dir + ".html"
+        child_dir = os.path.join(child_dir, os.pardir)
+
+    graph_base_dir = pages_config["svg_dir"] or child_dir
+    child_graph: DotGraph = generate_dot_graph2(build_tree, [child_node], graph_base_dir, pages_config["graph_config"])
+
+    _LOGGER.info("storing dot graph")
+    # store_dot_graph(child_graph, child_dir)
+    svg_params = get_page_svg_params(child_graph, pages_config, os.path.dirname(html_out_path))
+
+    object_files_names = pages_config["object_files_names"]
+    if child_node in package_nodes:
+        ## package
+        include_counter = count_packages_includes([child_node])
+        included_list = get_includes_list(build_tree, object_files_names, include_counter)
+    else:
+        ## header
+        included_list = get_includes_list(build_tree, object_files_names, child_node.data.include_counter)
+
+    page_params = pages_config["item_config"].copy()
+    page_params.update(
+        {
+            "root_dir": output_dir,
+            "main_page_link": main_page_link,
+            "item_data": child_node.data,
+            "children_list": child_node.children,
+            "included_list": included_list,
+        }
+    )
+    page_params.update(svg_params)
+    return html_out_path, page_params
+
+
+## state of worker process: graph, nodes to generate and pages config -- tasks are indexes of nodes,
+## so object graph is never pickled
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def generate_node_pages_parallel(
+    build_tree: IncludeGraph, nodes_list: List[GraphNode], pages_config, page_index: PageIndex, jobs
+):
+    child_size = len(nodes_list)
+    chunk_size = max(1, child_size // (jobs * 16))
+    _LOGGER.info("generating %s pages using %s processes", child_size, jobs)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if "fork" in multiprocessing.get_all_start_methods():
+            ## child processes inherit state of parent (including compiled template)
+            texttemplate.get_module(PAGE_TEMPLATE_PATH)
+            _WORKER_STATE.update(
+                {
+                    "build_tree": build_tree,
+                    "nodes_list": nodes_list,
+                    "pages_config": pages_config,
+                    "page_index": page_index,
+                }
+            )
+            mp_context: multiprocessing.context.BaseContext = multiprocessing.get_context("fork")
+            initializer = None
+            initargs: Tuple = ()
+        else:
+            ## child processes load graph from snapshot
+            graph_path = os.path.join(tmp_dir, "graph.bin")
+            save_graph(build_tree, graph_path)
+            nodes_names = [node.data.name for node in nodes_list]
+            mp_context = multiprocessing.get_context()
+            initializer = init_pages_worker
+            initargs = (graph_path, build_tree.root_dir, nodes_names, pages_config)
+
+        try:
+            with mp_context.Pool(jobs, initializer=initializer, initargs=initargs) as pool:
+                tasks_iter = pool.imap_unordered(generate_node_page_task, range(child_size), chunk_size)
+                for child_counter, child_name in enumerate(tasks_iter, 1):
+                    _LOGGER.info("%s/%s: generated data for child %s", child_counter, child_size, child_name)
+        finally:
+            _WORKER_STATE.clear()
+
+
+def init_pages_worker(graph_path, root_dir, nodes_names, pages_config):
+    build_tree = load_graph(graph_path)
+    build_tree.setRootDir(root_dir)
+    nodes_list = [build_tree.getNode(name) for name in nodes_names]
+    page_index = PageIndex(build_tree, pages_config["output_dir"], pages_config["graph_config"].get("linked_names"))
+    _WORKER_STATE.update(
+        {"build_tree": build_tree, "nodes_list": nodes_list, "pages_config": pages_config, "page_index": page_index}
+    )
+
+
+def generate_node_page_task(node_index):
+    child_node = _WORKER_STATE["nodes_list"][node_index]
+    generate_node_page(
+        _WORKER_STATE["build_tree"], child_node, _WORKER_STATE["pages_config"], _WORKER_STATE["page_index"]
+    )
+    return child_node.data.name
 
 
 def get_includes_list(build_tree, object_files_names, include_counter):
@@ -144,7 +327,7 @@ def get_includes_list(build_tree, object_files_names, include_counter):
             continue
         node = build_tree.getNode(node_name)
         rounded_total = round(count * node.data.fsize / 1024, 2)
-        included_list.append((node.data, count, rounded_total))
+        included_list.append((node, count, rounded_total))
     return included_list
 
 
@@ -158,41 +341,83 @@ def count_packages_includes(package_nodes_list: List[GraphNode]):
 
 
 ##
-def generate_html_page(out_path, page_params):
+def generate_html_page(out_path, page_params, page_index: PageIndex, tables_config=None):
     # svg_path = os.path.join(page_dir, "include_tree.gv.svg")
     # svg_content = read_file(svg_path)
     # os.remove(svg_path)  ## remove file -- content embedded into HTML
 
+    ## page is streamed to temporary file -- unchanged page is not replaced
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out_file:
+        listing_base = os.path.splitext(out_path)[0]
+        write_html_page(
+            out_file, out_path, page_params, page_index, listing_base=listing_base, tables_config=tables_config
+        )
+
+    if replace_file_if_changed(tmp_path, out_path):
+        _LOGGER.info("writing page: file://%s", out_path)
+    else:
+        _LOGGER.info("page unchanged: file://%s", out_path)
+
+
+## write page to file object (without 'listing_base' tables are not split into listing files)
+def write_html_page(out_file, out_path, page_params, page_index: PageIndex, *, listing_base=None, tables_config=None):
     page_dir = os.path.dirname(out_path)
 
     ## prepare input for template
     page_params.update(
         {
             "page_dir": page_dir,
-            "body_color": "#bbbbbb",
+            "body_color": BODY_COLOR,
             # "svg_name": "include_tree.gv.svg",
         }
     )
 
-    template_path = os.path.join(SCRIPT_DIR, "template", "include_tree_page.html.tmpl")
-
-    _LOGGER.info("writing page: file://%s", out_path)
-    texttemplate.generate(template_path, out_path, INPUT_DICT=page_params)
-
-
-def generate_dot_graph2(
-    build_tree: IncludeGraph, nodes_list: List[GraphNode], base_dir, no_highlight=False, mark_hotpath=False
-) -> Graph:
-    active_nodes = build_tree.getConnectedNodes(nodes_list)
-    graph: Graph = generate_base_graph(active_nodes, base_dir)
+    template_module = texttemplate.get_module(PAGE_TEMPLATE_PATH)
+    out_file.write(template_module.page_begin(INPUT_DICT=page_params))
+    page_writer = PageWriter(out_file, page_index, page_dir, listing_base, tables_config)
+    write_page_tables(page_writer, page_params)
+    out_file.write(template_module.page_end())
+
+
+def write_page_tables(page_writer: PageWriter, page_params):
+    item_data = page_params.get("item_data")
+    item_type = "ROOT"
+    if item_data:
+        item_type = item_data.getTypeName()
+        if item_type == "HEADER":
+            page_writer.writeObjectFilesTables(item_data.all_obj_files)
+
+    children_list = page_params.get("children_list")
+    if children_list:
+        page_writer.writeChildrenTables(item_type, children_list)
+
+    page_writer.writeIncludeTables(page_params.get("included_list"))
+
+
+## 'graph_config' -- see 'get_graph_config'
+def generate_dot_graph2(build_tree: IncludeGraph, nodes_list: List[GraphNode], base_dir, graph_config=None) -> DotGraph:
+    if graph_config is None:
+        graph_config = get_graph_config()
+    radius = graph_config["radius"]
+    max_nodes = graph_config["max_nodes"]
+    if radius is None and max_nodes is None:
+        active_nodes = build_tree.getConnectedNodes(nodes_list)
+        hidden_dict: Dict[GraphNode, Tuple[int, int]] = {}
+    else:
+        active_nodes, hidden_dict = build_tree.getConnectedNodesBounded(nodes_list, radius, max_nodes)
+    graph: DotGraph = generate_base_graph(
+        active_nodes, base_dir, graph_config["link_target"], graph_config["linked_names"]
+    )
 
     top_nodes = graph.getNodesTop()
+    add_hidden_nodes(graph, hidden_dict)
     graph.setNodesRank(top_nodes, "min")
-    if no_highlight:
+    if graph_config["no_highlight"]:
         # highlight disabled - do nothing
         return graph
 
-    if mark_hotpath:
+    if graph_config["mark_hotpath"]:
         include_nodes = build_tree.findMaxIncludeNodes(nodes_list)
 
         ## tree_node: GraphNode
@@ -223,15 +448,31 @@ def generate_dot_graph2(
     return graph
 
 
-def generate_base_graph(all_nodes, base_dir) -> Graph:
-    graph: Graph = Graph()
-    base_graph = graph.base_graph
-    base_graph.set_name("include_graph")
-    base_graph.set_type("digraph")
-    base_graph.set_rankdir("LR")
+## add summary nodes in place of nodes hidden due to graph limits
+def add_hidden_nodes(graph: DotGraph, hidden_dict: Dict[GraphNode, Tuple[int, int]]):
+    for tree_node in sorted(hidden_dict, key=lambda item: item.data.label):
+        parents_count, children_count = hidden_dict[tree_node]
+        item_label = tree_node.data.label
+        if parents_count > 0:
+            summary_name = item_label + "#includers"
+            graph.addNode(summary_name, shape="box", style="dashed", label=f"+{parents_count} more includers")
+            graph.addEdge(summary_name, item_label)
+        if children_count > 0:
+            summary_name = item_label + "#includes"
+            graph.addNode(summary_name, shape="box", style="dashed", label=f"+{children_count} more includes")
+            graph.addEdge(item_label, summary_name)
+
+
+## if 'linked_names' is given, then only nodes of given names link to pages
+def generate_base_graph(all_nodes, base_dir, link_target=None, linked_names=None) -> DotGraph:
+    graph: DotGraph = DotGraph("include_graph", "digraph")
+    graph.set("rankdir", "LR")
 
     ## add nodes
 
+    ## sort nodes to get the same output independent of order of sets
+    all_nodes = sorted(all_nodes, key=lambda item: item.data.label)
+
     #     added_nodes = set()
     for item_node in all_nodes:
         item_name = item_node.data.name
@@ -244,16 +485,20 @@ def generate_base_graph(all_nodes, base_dir) -> Graph:
         new_node = graph.addNode(item_label, shape="box", label=base_name)
         if new_node:
             new_node.set("tooltip", item_label)
-            rel_link = os.path.relpath(item_node.data.href, base_dir)
-            new_node.set("href", rel_link)
+            if linked_names is None or item_name in linked_names:
+                rel_link = os.path.relpath(item_node.data.href, base_dir)
+                new_node.set("href", rel_link)
+                if link_target:
+                    new_node.set("target", link_target)
 
+    active_nodes = set(all_nodes)
     added_edges: Set[Tuple[str, str]] = set()
     for child in all_nodes:
         parents = child.parents
         if parents is None:
             continue
-        for parent in parents:
-            if parent not in all_nodes:
+        for parent in sorted(parents, key=lambda item: item.data.label):
+            if parent not in active_nodes:
                 continue
             new_dege = (parent.data.label, child.data.label)
             if new_dege in added_edges:
@@ -265,7 +510,7 @@ def generate_base_graph(all_nodes, base_dir) -> Graph:
     return graph
 
 
-def store_dot_graph(graph: Graph, page_dir):
+def store_dot_graph(graph: DotGraph, page_dir):
     #     out_raw = os.path.join( page_dir, "include_tree.gv.txt" )
     #     graph.writeRAW( out_raw )
     #
@@ -276,9 +521,38 @@ def store_dot_graph(graph: Graph, page_dir):
     graph.write(out_svg, file_format="svg")
 
 
-def get_graph_svg(graph: Graph):
-    with io.BytesIO() as buffer:
-        graph.write(buffer, file_format="svg")
-        contents = buffer.getvalue()
-        contents_str = contents.decode("utf-8")
-        return contents_str
+def get_graph_svg(graph: DotGraph, render_cache: RenderCache = None, layout_config=None):
+    if render_cache is not None:
+        ## layout strategy is part of key
+        dot_source = str(sorted(get_layout_config(layout_config).items())) + "\n" + graph.toString()
+        return render_cache.render(dot_source, "svg", lambda: render_graph_svg(graph, layout_config))
+    return render_graph_svg(graph, layout_config)
+
+
+## return parameters of page presenting graph -- embedded content or link to file
+def get_page_svg_params(graph: DotGraph, pages_config, page_dir) -> Dict[str, str]:
+    svg_content = get_graph_svg(graph, pages_config["render_cache"], pages_config["layout_config"])
+    svg_dir = pages_config["svg_dir"]
+    if not svg_dir:
+        return {"svg_embed_content": svg_content}
+    svg_path = write_svg_file(svg_content, svg_dir, pages_config["svg_compress"])
+    return {"svg_name": os.path.relpath(svg_path, page_dir)}
+
+
+## write SVG to file named by hash of content, so the same graphs share file, returns path to file
+def write_svg_file(svg_content: str, svg_dir, compress=False):
+    extension = "svgz" if compress else "svg"
+    svg_path = os.path.join(svg_dir, calculate_hash(svg_content) + "." + extension)
+    if os.path.isfile(svg_path):
+        return svg_path
+    svg_data = svg_content.encode("utf-8")
+    if compress:
+        ## constant mtime gives the same output for the same content
+        svg_data = gzip.compress(svg_data, mtime=0)
+    write_file_atomic(svg_path, svg_data)
+    return svg_path
+
+
+def render_graph_svg(graph: DotGraph, layout_config=None):
+    contents = render_graph(graph, "svg", layout_config)
+    return contents.decode("utf-8")
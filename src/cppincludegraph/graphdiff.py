@@ -0,0 +1,234 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Comparison of include graphs of two builds.
+##
+## Graphs are reduced to flat summaries (per node: type, size with includes and number of including
+## object files, plus set of edges) and compared by node labels, so nodes can be matched between
+## builds placed in different directories (see '--rel_names'). Summary of saved graph is read
+## directly from sections of the binary file without building the graph.
+##
+
+import os
+import logging
+import json
+import mmap
+from typing import List, Set, Dict, Tuple
+
+from cppincludegraph import texttemplate
+from cppincludegraph.includegraph import NodeData, IncludeGraph
+from cppincludegraph.graphstore import read_sections, TYPES_LIST
+
+
+_LOGGER = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class GraphSummary:
+
+    def __init__(self):
+        ## label -> (type, size with includes, number of including object files)
+        self.nodes: Dict[str, Tuple[NodeData.NodeType, int, int]] = {}
+        ## pairs (includer label, included label)
+        self.edges: Set[Tuple[str, str]] = set()
+
+    def getTotalSize(self):
+        return sum(item[1] for item in self.nodes.values() if item[0] == NodeData.NodeType.OBJ_FILE)
+
+    def getObjectsCount(self):
+        return sum(1 for item in self.nodes.values() if item[0] == NodeData.NodeType.OBJ_FILE)
+
+
+class NodeDiff:
+
+    def __init__(self, label, node_type, old_item=None, new_item=None):
+        self.label = label
+        self.type: NodeData.NodeType = node_type
+        self.old_ai_size = 0
+        self.old_objects = 0
+        self.new_ai_size = 0
+        self.new_objects = 0
+        if old_item:
+            self.old_ai_size = old_item[1]
+            self.old_objects = old_item[2]
+        if new_item:
+            self.new_ai_size = new_item[1]
+            self.new_objects = new_item[2]
+
+    def getSizeDelta(self):
+        return self.new_ai_size - self.old_ai_size
+
+    def getObjectsDelta(self):
+        return self.new_objects - self.old_objects
+
+    ## estimated cost: number of including object files multiplied by size with includes
+    def getCostDelta(self):
+        return self.new_objects * self.new_ai_size - self.old_objects * self.old_ai_size
+
+    def toDict(self):
+        return {
+            "label": self.label,
+            "type": self.type.name,
+            "old_ai_size": self.old_ai_size,
+            "new_ai_size": self.new_ai_size,
+            "ai_size_delta": self.getSizeDelta(),
+            "old_objects": self.old_objects,
+            "new_objects": self.new_objects,
+            "objects_delta": self.getObjectsDelta(),
+            "cost_delta": self.getCostDelta(),
+        }
+
+
+class GraphDiff:
+
+    def __init__(self):
+        self.old_total_size = 0
+        self.new_total_size = 0
+        self.old_objects_count = 0
+        self.new_objects_count = 0
+        self.added_nodes: List[str] = []
+        self.removed_nodes: List[str] = []
+        self.added_edges: List[Tuple[str, str]] = []
+        self.removed_edges: List[Tuple[str, str]] = []
+        ## changed nodes sorted by cost delta (biggest regression first)
+        self.nodes_diff: List[NodeDiff] = []
+
+    def getTotalSizeDelta(self):
+        return self.new_total_size - self.old_total_size
+
+    def toDict(self, limit=None):
+        return {
+            "summary": {
+                "old_total_size": self.old_total_size,
+                "new_total_size": self.new_total_size,
+                "total_size_delta": self.getTotalSizeDelta(),
+                "old_objects_count": self.old_objects_count,
+                "new_objects_count": self.new_objects_count,
+                "added_nodes": len(self.added_nodes),
+                "removed_nodes": len(self.removed_nodes),
+                "added_edges": len(self.added_edges),
+                "removed_edges": len(self.removed_edges),
+                "changed_nodes": len(self.nodes_diff),
+            },
+            "nodes": [item.toDict() for item in self.nodes_diff[:limit]],
+            "added_nodes": self.added_nodes[:limit],
+            "removed_nodes": self.removed_nodes[:limit],
+            "added_edges": [list(edge) for edge in self.added_edges[:limit]],
+            "removed_edges": [list(edge) for edge in self.removed_edges[:limit]],
+        }
+
+    def __str__(self):
+        return (
+            f"total size delta: {round(self.getTotalSizeDelta() / 1024, 2)} kB"
+            f" objects: {self.old_objects_count} -> {self.new_objects_count}"
+            f" added/removed nodes: {len(self.added_nodes)}/{len(self.removed_nodes)}"
+            f" added/removed edges: {len(self.added_edges)}/{len(self.removed_edges)}"
+            f" changed nodes: {len(self.nodes_diff)}"
+        )
+
+
+##
+def summarize_graph(build_tree: IncludeGraph) -> GraphSummary:
+    summary = GraphSummary()
+    for node in build_tree.root.data.all_children:
+        data = node.data
+        objects_count = get_objects_count(data.type, len(data.all_obj_files or []))
+        summary.nodes[data.label] = (data.type, data.ai_size, objects_count)
+        for child in node.children:
+            summary.edges.add((data.label, child.data.label))
+    return summary
+
+
+def summarize_graph_file(in_path) -> GraphSummary:
+    _LOGGER.info("reading graph summary from: %s", in_path)
+    with open(in_path, "rb") as in_file:
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            sections = read_sections(content)
+            try:
+                labels_list = sections[b"LABL"]
+                types_list = sections[b"TYPE"].tolist()
+                ai_size_list = sections[b"AISZ"].tolist()
+                obj_offsets = sections[b"OBOF"].tolist()
+                children_offsets = sections[b"CHOF"].tolist()
+                children_ids = sections[b"CHID"].tolist()
+            finally:
+                ## views have to be released before closing map
+                for section in sections.values():
+                    if isinstance(section, memoryview):
+                        section.release()
+
+    summary = GraphSummary()
+    ## node 0 is root
+    for node_id in range(1, len(labels_list)):
+        label = labels_list[node_id]
+        node_type = TYPES_LIST[types_list[node_id]]
+        objects_count = get_objects_count(node_type, obj_offsets[node_id + 1] - obj_offsets[node_id])
+        summary.nodes[label] = (node_type, ai_size_list[node_id], objects_count)
+        for pos in range(children_offsets[node_id], children_offsets[node_id + 1]):
+            summary.edges.add((label, labels_list[children_ids[pos]]))
+    return summary
+
+
+def get_objects_count(node_type, obj_files_count):
+    if node_type == NodeData.NodeType.OBJ_FILE:
+        ## object file is compiled once
+        return 1
+    return obj_files_count
+
+
+def diff_graphs(old_summary: GraphSummary, new_summary: GraphSummary) -> GraphDiff:
+    graph_diff = GraphDiff()
+    graph_diff.old_total_size = old_summary.getTotalSize()
+    graph_diff.new_total_size = new_summary.getTotalSize()
+    graph_diff.old_objects_count = old_summary.getObjectsCount()
+    graph_diff.new_objects_count = new_summary.getObjectsCount()
+
+    old_nodes = old_summary.nodes
+    new_nodes = new_summary.nodes
+    graph_diff.added_nodes = sorted(new_nodes.keys() - old_nodes.keys())
+    graph_diff.removed_nodes = sorted(old_nodes.keys() - new_nodes.keys())
+    graph_diff.added_edges = sorted(new_summary.edges - old_summary.edges)
+    graph_diff.removed_edges = sorted(old_summary.edges - new_summary.edges)
+
+    for label, new_item in new_nodes.items():
+        old_item = old_nodes.get(label)
+        if old_item is not None and old_item[1:] == new_item[1:]:
+            continue
+        graph_diff.nodes_diff.append(NodeDiff(label, new_item[0], old_item, new_item))
+    for label in graph_diff.removed_nodes:
+        old_item = old_nodes[label]
+        graph_diff.nodes_diff.append(NodeDiff(label, old_item[0], old_item, None))
+    graph_diff.nodes_diff.sort(key=lambda item: (-item.getCostDelta(), -item.getSizeDelta(), item.label))
+    return graph_diff
+
+
+def get_delta_class(value):
+    if value > 0:
+        return "regression"
+    if value < 0:
+        return "improvement"
+    return ""
+
+
+##
+def write_diff_json(graph_diff: GraphDiff, out_path, limit=None):
+    _LOGGER.info("writing diff: file://%s", out_path)
+    with open(out_path, "w", encoding="utf-8") as out_file:
+        json.dump(graph_diff.toDict(limit), out_file, indent=4)
+
+
+def generate_diff_page(graph_diff: GraphDiff, out_path, limit=None):
+    page_params = {
+        "body_color": "#bbbbbb",
+        "graph_diff": graph_diff,
+        "limit": limit,
+    }
+    template_path = os.path.join(SCRIPT_DIR, "template", "graph_diff_page.html.tmpl")
+    _LOGGER.info("writing page: file://%s", out_path)
+    texttemplate.generate(template_path, out_path, INPUT_DICT=page_params)
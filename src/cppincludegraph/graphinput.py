@@ -0,0 +1,116 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Reading of input graph of commands: graph is built from build logs or loaded from graph file.
+##
+
+import os
+import logging
+from typing import List
+import argparse
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph
+from cppincludegraph.logparser import find_build_logs, read_files_info, read_build_logs
+from cppincludegraph.dircollapse import collapse_directories
+from cppincludegraph.graphstore import load_graph
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+def build_include_graph(args, files_info_dict) -> IncludeGraph:
+    log_dir = args.log_dir
+    log_name = args.log_name
+
+    if len(log_dir) == 0:
+        log_dir = None
+    if len(log_name) == 0:
+        log_name = None
+
+    found_logs = find_build_logs(log_dir, log_name)
+    if len(args.log_files) > 0:
+        found_logs.extend(args.log_files)
+
+    build_dir = args.build_dir
+    if not os.path.isdir(build_dir):
+        _LOGGER.error("given build directory does not exist: %s", build_dir)
+        return None
+    build_dir = os.path.realpath(build_dir)
+
+    _LOGGER.info("reading build logs: %s", found_logs)
+    graph_list: List[GraphNode] = read_build_logs(
+        found_logs,
+        build_dir,
+        files_info_dict,
+        args.reduce_dirs,
+        args.build_regex,
+        args.namefromlogfile,
+        cache_dir=args.cache_dir,
+    )
+
+    if args.collapse_dirs or args.collapse_depth:
+        collapse_directories(graph_list, args.collapse_dirs, args.collapse_depth, args.rel_names)
+
+    _LOGGER.info("building include graph")
+    IncludeGraph.subdir_mode = False
+    return IncludeGraph(graph_list, args.rel_names)
+
+
+## arguments of commands working on ready graph (loaded from file or built from logs)
+def add_graph_input_arguments(parser):
+    parser.add_argument(
+        "--load_graph",
+        action="store",
+        required=False,
+        default="",
+        help="Graph file (created with '--save_graph'), alternative to '--log_files'",
+    )
+    parser.add_argument(
+        "-lf", "--log_files", nargs="+", action="store", required=False, default="", help="List of build log files"
+    )
+    parser.add_argument(
+        "--build_dir", action="store", required=False, default=".", help="Build root directory (used to reduce paths)"
+    )
+    parser.add_argument("--rel_names", action="store", required=False, default="", help="Reduce prefix of all names")
+    parser.add_argument("--files_info", action="store", required=False, default="", help="Files information")
+    parser.add_argument(
+        "--cache_dir",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for cache of parsed build logs (only new or changed logs are parsed)",
+    )
+
+
+def read_input_graph(args) -> IncludeGraph:
+    if args.load_graph:
+        try:
+            return load_graph(args.load_graph)
+        except (OSError, ValueError) as exc:
+            _LOGGER.error("unable to load graph: %s", exc)
+            return None
+    if args.log_files:
+        build_args = argparse.Namespace(
+            log_dir="",
+            log_name="",
+            log_files=args.log_files,
+            build_dir=args.build_dir,
+            reduce_dirs=[],
+            build_regex="",
+            namefromlogfile=False,
+            cache_dir=args.cache_dir,
+            rel_names=args.rel_names,
+            collapse_dirs=None,
+            collapse_depth=None,
+        )
+        return build_include_graph(build_args, read_files_info(args.files_info))
+    _LOGGER.error("missing input graph (use '--load_graph' or '--log_files')")
+    return None
@@ -0,0 +1,239 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Binary snapshot of include graph with derived data.
+##
+## File starts with magic and format version followed by sequence of sections. Every section
+## consists of 4 bytes tag, 8 bytes length and content padded to 8 bytes. Content of sections
+## is little endian array of fixed size items, so file can be memory mapped and accessed
+## without parsing. Strings are stored as NUL separated UTF-8 blobs.
+##
+## Lists of node ids (children, all children, object files, include counters) are stored in CSR
+## form: offsets array of size N+1 and values array. Node with id 0 is root of graph.
+##
+
+import sys
+import logging
+import mmap
+import struct
+import collections
+from array import array
+from typing import List, Dict, Any
+
+from cppincludegraph.includegraph import GraphNode, NodeData, IncludeGraph, CompactGraph
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+MAGIC = b"CPPIGRPH"
+VERSION = 1
+
+HEADER_FORMAT = "<8sII"
+SECTION_FORMAT = "<4sQ"
+
+## section tag -> array typecode ("s" for strings)
+SECTIONS = {
+    b"META": "s",  ## names base dir
+    b"NAME": "s",
+    b"LABL": "s",
+    b"SDIR": "s",
+    b"TYPE": "b",
+    b"FSIZ": "q",
+    b"DCSZ": "q",
+    b"AISZ": "q",
+    b"EXSZ": "q",
+    b"CHOF": "q",  ## children offsets
+    b"CHID": "i",
+    b"ACOF": "q",  ## all children offsets
+    b"ACID": "i",
+    b"OBOF": "q",  ## object files offsets
+    b"OBID": "i",
+    b"ICOF": "q",  ## include counter offsets
+    b"ICID": "i",
+    b"ICCN": "i",  ## include counter counts
+}
+
+TYPES_LIST = [None, NodeData.NodeType.PACKAGE, NodeData.NodeType.OBJ_FILE, NodeData.NodeType.HEADER]
+
+
+##
+def save_graph(build_tree: IncludeGraph, out_path):
+    _LOGGER.info("storing graph to: %s", out_path)
+    compact_graph = CompactGraph([build_tree.root] + list(build_tree.root.data.all_children))
+    nodes_list = compact_graph.nodes
+    index = compact_graph.index
+    names_index = {node.data.name: node_id for node_id, node in enumerate(nodes_list)}
+
+    sections: Dict[Any, Any] = {}
+    sections[b"META"] = [build_tree.names_base_dir or ""]
+    sections[b"NAME"] = [node.data.name or "" for node in nodes_list]
+    sections[b"LABL"] = [node.data.label or "" for node in nodes_list]
+    sections[b"SDIR"] = [node.data.subdir or "" for node in nodes_list]
+    sections[b"TYPE"] = array("b", [TYPES_LIST.index(node.data.type) for node in nodes_list])
+    sections[b"FSIZ"] = array("q", [node.data.fsize for node in nodes_list])
+    sections[b"DCSZ"] = array("q", [node.data.dc_size for node in nodes_list])
+    sections[b"AISZ"] = array("q", [node.data.ai_size for node in nodes_list])
+    sections[b"EXSZ"] = array("q", [node.data.ex_size for node in nodes_list])
+    sections[b"CHOF"], sections[b"CHID"] = to_csr(compact_graph.children)
+    sections[b"ACOF"], sections[b"ACID"] = to_csr(
+        [[index[child] for child in node.data.all_children or []] for node in nodes_list]
+    )
+    sections[b"OBOF"], sections[b"OBID"] = to_csr(
+        [[index[obj] for obj in node.data.all_obj_files or []] for node in nodes_list]
+    )
+    counters_list = [node.data.include_counter or {} for node in nodes_list]
+    sections[b"ICOF"], sections[b"ICID"] = to_csr(
+        [[names_index[name] for name in counter.keys()] for counter in counters_list]
+    )
+    sections[b"ICCN"] = to_csr([list(counter.values()) for counter in counters_list])[1]
+
+    flags = 1 if build_tree.subdir_mode else 0
+    write_sections(out_path, sections, flags)
+
+
+def load_graph(in_path) -> IncludeGraph:
+    _LOGGER.info("loading graph from: %s", in_path)
+    with open(in_path, "rb") as in_file:
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            sections = read_sections(content)
+            try:
+                return build_graph(sections)
+            finally:
+                ## views have to be released before closing map
+                for section in sections.values():
+                    if isinstance(section, memoryview):
+                        section.release()
+
+
+## 'sections_spec', 'magic' and 'version' allow to store other data in the same format
+def write_sections(out_path, sections, flags=0, sections_spec=None, magic=MAGIC, version=VERSION):
+    if sections_spec is None:
+        sections_spec = SECTIONS
+    with open(out_path, "wb") as out_file:
+        out_file.write(struct.pack(HEADER_FORMAT, magic, version, flags))
+        for tag, type_code in sections_spec.items():
+            content = sections[tag]
+            if type_code == "s":
+                data = "\0".join(content).encode("utf-8")
+            else:
+                if sys.byteorder == "big":
+                    content.byteswap()
+                data = content.tobytes()
+            out_file.write(struct.pack(SECTION_FORMAT, tag, len(data)))
+            out_file.write(data)
+            out_file.write(b"\0" * (-len(data) % 8))
+
+
+def read_sections(content, sections_spec=None, magic=MAGIC, version=VERSION) -> Dict[Any, Any]:
+    if sections_spec is None:
+        sections_spec = SECTIONS
+    header_size = struct.calcsize(HEADER_FORMAT)
+    if len(content) < header_size:
+        raise ValueError("invalid file format")
+    file_magic, file_version, flags = struct.unpack_from(HEADER_FORMAT, content, 0)
+    if file_magic != magic:
+        raise ValueError("invalid file format")
+    if file_version != version:
+        raise ValueError(f"unsupported file version: {file_version}, expected: {version}")
+
+    sections: Dict[Any, Any] = {"flags": flags}
+    section_size = struct.calcsize(SECTION_FORMAT)
+    content_view = memoryview(content)
+    position = header_size
+    while position < len(content):
+        if position + section_size > len(content):
+            raise ValueError("truncated file")
+        tag, data_size = struct.unpack_from(SECTION_FORMAT, content, position)
+        position += section_size
+        if position + data_size > len(content):
+            raise ValueError("truncated file")
+        type_code = sections_spec.get(tag)
+        data_view = content_view[position : position + data_size]
+        if type_code is None:
+            _LOGGER.warning("unknown section: %s", tag)
+        elif type_code == "s":
+            sections[tag] = bytes(data_view).decode("utf-8").split("\0")
+        elif sys.byteorder == "big":
+            items = array(type_code)
+            items.frombytes(data_view)
+            items.byteswap()
+            sections[tag] = items
+        else:
+            sections[tag] = data_view.cast(type_code)  # type: ignore
+        position += data_size + (-data_size % 8)
+    content_view.release()
+
+    missing = [tag for tag in sections_spec if tag not in sections]
+    if missing:
+        raise ValueError(f"missing sections in file: {missing}")
+    return sections
+
+
+def build_graph(sections) -> IncludeGraph:
+    build_tree = IncludeGraph()
+    build_tree.subdir_mode = (sections["flags"] & 1) == 1
+    build_tree.names_base_dir = sections[b"META"][0] or None
+
+    names_list = sections[b"NAME"]
+    nodes_list: List[GraphNode] = [build_tree.root]
+    nodes_list.extend(GraphNode() for _ in range(1, len(names_list)))
+
+    labels_list = sections[b"LABL"]
+    subdirs_list = sections[b"SDIR"]
+    types_list = sections[b"TYPE"]
+    fsize_list = sections[b"FSIZ"].tolist()
+    dc_size_list = sections[b"DCSZ"].tolist()
+    ai_size_list = sections[b"AISZ"].tolist()
+    ex_size_list = sections[b"EXSZ"].tolist()
+    children_list = from_csr(sections[b"CHOF"], sections[b"CHID"])
+    all_children_list = from_csr(sections[b"ACOF"], sections[b"ACID"])
+    obj_files_list = from_csr(sections[b"OBOF"], sections[b"OBID"])
+    counter_ids_list = from_csr(sections[b"ICOF"], sections[b"ICID"])
+    counter_values_list = from_csr(sections[b"ICOF"], sections[b"ICCN"])
+
+    for node_id, node in enumerate(nodes_list):
+        node.children = [nodes_list[child_id] for child_id in children_list[node_id]]
+        for child in node.children:
+            child.parents.add(node)
+        data = node.data
+        data.all_children = set(nodes_list[child_id] for child_id in all_children_list[node_id])
+        data.include_counter = collections.Counter(
+            dict(zip([names_list[item_id] for item_id in counter_ids_list[node_id]], counter_values_list[node_id]))
+        )
+        if node_id == 0:
+            ## root
+            continue
+        data.name = names_list[node_id]
+        data.label = labels_list[node_id]
+        data.type = TYPES_LIST[types_list[node_id]]
+        data.fsize = fsize_list[node_id]
+        data.dc_size = dc_size_list[node_id]
+        data.ai_size = ai_size_list[node_id]
+        data.ex_size = ex_size_list[node_id]
+        data.subdir = subdirs_list[node_id]
+        data.href = build_tree.calculateHref(data.subdir)
+        data.all_obj_files = set(nodes_list[obj_id] for obj_id in obj_files_list[node_id])
+        build_tree.nodes_dict[data.name] = node
+
+    return build_tree
+
+
+def to_csr(lists_list: List[List[int]]):
+    offsets = array("q", [0])
+    values = array("i")
+    for items in lists_list:
+        values.extend(items)
+        offsets.append(len(values))
+    return (offsets, values)
+
+
+def from_csr(offsets, values) -> List[List[int]]:
+    offsets = offsets.tolist()
+    values = values.tolist()
+    return [values[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
@@ -0,0 +1,257 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Change impact index: which object files are rebuilt when given files change.
+##
+## Index is inverted 'all_obj_files' relation: for every header it holds ids of object files
+## including the header directly or indirectly (CSR form). Index is stored in the same sections
+## format as graph file, so it is loaded without building graph.
+##
+## Changed files (e.g. output of 'git diff --name-only') are matched to headers and object files
+## by path suffix, so relative paths can be given. Source file is matched to object file named
+## after it (e.g. 'src/main.cpp' -> '.../src/main.cpp.o', CMake convention).
+##
+
+import os
+import json
+import mmap
+import logging
+import collections
+from array import array
+from typing import List, Set, Dict, Any
+
+from cppincludegraph.includegraph import IncludeGraph, NodeData
+from cppincludegraph.graphstore import write_sections, read_sections
+from cppincludegraph.stats import size_kb
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+MAGIC = b"CPPIMPCT"
+VERSION = 1
+
+## section tag -> array typecode ("s" for strings)
+SECTIONS = {
+    b"META": "s",  ## names base dir
+    b"PKGN": "s",  ## labels of packages
+    b"OBJN": "s",  ## names of object files
+    b"OBJL": "s",  ## labels of object files
+    b"OBPK": "i",  ## package of object file
+    b"OBSZ": "q",  ## size of object file with includes
+    b"FILN": "s",  ## names of headers
+    b"FLOF": "q",  ## object files of headers offsets
+    b"FLID": "i",
+}
+
+IMPACT_FORMATS = ["text", "json", "list"]
+
+OBJ_EXTENSIONS = [".o", ".obj"]
+
+
+class ImpactIndex:
+    """Inverted index of headers and object files including them."""
+
+    def __init__(self):
+        self.names_base_dir = None
+        self.packages_list: List[str] = []
+        self.objects_names: List[str] = []
+        self.objects_labels: List[str] = []
+        self.objects_package: List[int] = []
+        self.objects_size: List[int] = []
+        self.files_names: List[str] = []
+        ## CSR form of lists of object files of headers
+        self.files_offsets: List[int] = [0]
+        self.files_objects: List[int] = []
+        ## base name -> ids of headers / object files
+        self.files_dict: Dict[str, List[int]] = {}
+        self.sources_dict: Dict[str, List[int]] = {}
+
+    def updateNamesIndex(self):
+        self.files_dict = collections.defaultdict(list)
+        for file_id, name in enumerate(self.files_names):
+            self.files_dict[os.path.basename(name)].append(file_id)
+        self.sources_dict = collections.defaultdict(list)
+        for obj_id, name in enumerate(self.objects_names):
+            source_name = get_source_name(name)
+            self.sources_dict[os.path.basename(source_name)].append(obj_id)
+
+    def getFileObjects(self, file_id) -> List[int]:
+        return self.files_objects[self.files_offsets[file_id] : self.files_offsets[file_id + 1]]
+
+    def findFiles(self, changed_path) -> List[int]:
+        """Return ids of headers matching given path."""
+        changed_path = normalize_path(changed_path)
+        candidates = self.files_dict.get(os.path.basename(changed_path), [])
+        return [file_id for file_id in candidates if match_path(self.files_names[file_id], changed_path)]
+
+    def findSources(self, changed_path) -> List[int]:
+        """Return ids of object files compiled from given source path."""
+        changed_path = normalize_path(changed_path)
+        candidates = self.sources_dict.get(os.path.basename(changed_path), [])
+        return [
+            obj_id for obj_id in candidates if match_path(get_source_name(self.objects_names[obj_id]), changed_path)
+        ]
+
+    def getImpact(self, changed_list: List[str]) -> Dict[str, Any]:
+        affected_ids: Set[int] = set()
+        unmatched_list = []
+        for changed_path in changed_list:
+            files_ids = self.findFiles(changed_path)
+            sources_ids = self.findSources(changed_path)
+            if not files_ids and not sources_ids:
+                unmatched_list.append(changed_path)
+                continue
+            affected_ids.update(sources_ids)
+            for file_id in files_ids:
+                affected_ids.update(self.getFileObjects(file_id))
+
+        packages_ids = {self.objects_package[obj_id] for obj_id in affected_ids}
+        return {
+            "changed_files": len(changed_list),
+            "unmatched_files": unmatched_list,
+            "packages": sorted(self.packages_list[pkg_id] for pkg_id in packages_ids if pkg_id >= 0),
+            "objects": sorted(self.objects_labels[obj_id] for obj_id in affected_ids),
+            "total_size": sum(self.objects_size[obj_id] for obj_id in affected_ids),
+        }
+
+
+def get_source_name(obj_name):
+    for extension in OBJ_EXTENSIONS:
+        if obj_name.endswith(extension):
+            return obj_name[: -len(extension)]
+    return obj_name
+
+
+def normalize_path(path):
+    return os.path.normpath(path.strip()).replace(os.sep, "/")
+
+
+## path matches if it is equal to name or to its suffix consisting of whole path items
+def match_path(name, path):
+    return name == path or name.endswith("/" + path)
+
+
+## ============================================================
+
+
+def build_impact_index(build_tree: IncludeGraph) -> ImpactIndex:
+    packages_list = sorted(build_tree.getPackageNodes(), key=lambda item: item.data.name)
+    packages_index = {node: pkg_id for pkg_id, node in enumerate(packages_list)}
+    objects_list = []
+    files_list = []
+    for node in build_tree.root.data.all_children:
+        if node.data.type is NodeData.NodeType.OBJ_FILE:
+            objects_list.append(node)
+        elif node.data.type is not NodeData.NodeType.PACKAGE:
+            files_list.append(node)
+    ## sorted by name, so ids are stable
+    objects_list.sort(key=lambda item: item.data.name)
+    files_list.sort(key=lambda item: item.data.name)
+    objects_index = {node: obj_id for obj_id, node in enumerate(objects_list)}
+
+    index = ImpactIndex()
+    index.names_base_dir = build_tree.names_base_dir
+    index.packages_list = [node.data.label or node.data.name for node in packages_list]
+    index.objects_names = [node.data.name for node in objects_list]
+    index.objects_labels = [node.data.label or node.data.name for node in objects_list]
+    for node in objects_list:
+        package_ids = [packages_index[parent] for parent in node.parents if parent in packages_index]
+        index.objects_package.append(min(package_ids) if package_ids else -1)
+    index.objects_size = [node.data.ai_size for node in objects_list]
+    index.files_names = [node.data.name for node in files_list]
+    for node in files_list:
+        obj_ids = sorted(objects_index[obj] for obj in node.data.all_obj_files or [] if obj in objects_index)
+        index.files_objects.extend(obj_ids)
+        index.files_offsets.append(len(index.files_objects))
+    index.updateNamesIndex()
+    return index
+
+
+def save_impact_index(index: ImpactIndex, out_path):
+    _LOGGER.info("storing impact index to: %s", out_path)
+    sections: Dict[Any, Any] = {}
+    sections[b"META"] = [index.names_base_dir or ""]
+    sections[b"PKGN"] = index.packages_list
+    sections[b"OBJN"] = index.objects_names
+    sections[b"OBJL"] = index.objects_labels
+    sections[b"OBPK"] = array("i", index.objects_package)
+    sections[b"OBSZ"] = array("q", index.objects_size)
+    sections[b"FILN"] = index.files_names
+    sections[b"FLOF"] = array("q", index.files_offsets)
+    sections[b"FLID"] = array("i", index.files_objects)
+    write_sections(out_path, sections, sections_spec=SECTIONS, magic=MAGIC, version=VERSION)
+
+
+def load_impact_index(in_path) -> ImpactIndex:
+    _LOGGER.info("loading impact index from: %s", in_path)
+    index = ImpactIndex()
+    with open(in_path, "rb") as in_file:
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            sections = read_sections(content, sections_spec=SECTIONS, magic=MAGIC, version=VERSION)
+            try:
+                index.names_base_dir = sections[b"META"][0] or None
+                ## empty list is stored as single empty string
+                index.packages_list = get_strings(sections[b"PKGN"])
+                index.objects_names = get_strings(sections[b"OBJN"])
+                index.objects_labels = get_strings(sections[b"OBJL"])
+                index.objects_package = sections[b"OBPK"].tolist()
+                index.objects_size = sections[b"OBSZ"].tolist()
+                index.files_names = get_strings(sections[b"FILN"])
+                index.files_offsets = sections[b"FLOF"].tolist()
+                index.files_objects = sections[b"FLID"].tolist()
+            finally:
+                ## views have to be released before closing map
+                for section in sections.values():
+                    if isinstance(section, memoryview):
+                        section.release()
+    if len(index.files_offsets) != len(index.files_names) + 1:
+        raise ValueError("inconsistent impact index file")
+    index.updateNamesIndex()
+    return index
+
+
+def get_strings(strings_list: List[str]) -> List[str]:
+    if strings_list == [""]:
+        return []
+    return strings_list
+
+
+## ============================================================
+
+
+def write_impact(impact: Dict[str, Any], out_file, impact_format="text"):
+    if impact_format == "json":
+        json.dump(impact, out_file, indent=4)
+        out_file.write("\n")
+    elif impact_format == "list":
+        ## plain list of object files, e.g. for build or test tools
+        for obj_name in impact["objects"]:
+            out_file.write(f"{obj_name}\n")
+    elif impact_format == "text":
+        write_impact_text(impact, out_file)
+    else:
+        raise ValueError(f"invalid impact format: {impact_format}")
+
+
+def write_impact_text(impact: Dict[str, Any], out_file):
+    unmatched_list = impact["unmatched_files"]
+    out_file.write(f"Changed files: {impact['changed_files']} (not found in graph: {len(unmatched_list)})\n")
+    out_file.write(f"Affected packages: {len(impact['packages'])}\n")
+    out_file.write(f"Affected object files: {len(impact['objects'])}\n")
+    out_file.write(f"Size to recompile: {size_kb(impact['total_size'])} kB\n")
+    for title, items_list in [
+        ("Packages", impact["packages"]),
+        ("Object files", impact["objects"]),
+        ("Files not found in graph", unmatched_list),
+    ]:
+        if not items_list:
+            continue
+        out_file.write(f"\n{title}:\n")
+        for item in items_list:
+            out_file.write(f"    {item}\n")
@@ -10,10 +10,12 @@ import logging
 from enum import Enum, unique
 import collections
 
-from typing import List, Set, Iterable
+from typing import List, Set, Dict, Tuple, Iterable, Callable
 
 from showgraph.io import prepare_filesystem_name
 
+from cppincludegraph.dominator import aggregate_exclusive_sizes, calculate_exclusive_sizes
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +38,7 @@ class NodeData:
         self.fsize: int = 0  ## file size
         self.dc_size: int = 0  ## size of direct children
         self.ai_size: int = 0  ## size with all includes
+        self.ex_size: int = 0  ## exclusive size (size of dominated includes) summed over all object files
         self.subdir: str = None
         self.href: str = None
         self.include_counter = None
@@ -115,6 +118,22 @@ class GraphNode:
             child.printTree(indent + 2)
 
 
+##
+class GraphChange:
+    """Summary of incremental modification of include graph."""
+
+    def __init__(self):
+        ## nodes with recalculated includes ('all_children', 'ai_size', 'include_counter')
+        self.ancestors: Set[GraphNode] = set()
+        ## nodes with recalculated object files ('all_obj_files')
+        self.descendants: Set[GraphNode] = set()
+        ## values of 'ai_size' before modification
+        self.old_ai_size: Dict[GraphNode, int] = {}
+        ## nodes added to and removed from graph
+        self.added_nodes: Set[GraphNode] = set()
+        self.removed_nodes: Set[GraphNode] = set()
+
+
 ##
 class IncludeGraph:
 
@@ -128,26 +147,19 @@ class IncludeGraph:
         self.root.addChildren(packages_list)
 
         self.nodes_dict = {}
+        self.names_base_dir = names_base_dir
+        self.root_dir = ""
 
         all_nodes = self.getFlatList()
-        if names_base_dir:
-            names_base_dir_len = len(names_base_dir)
-            for node in all_nodes:
-                if node.data.name.startswith(names_base_dir):
-                    node.data.label = node.data.name[names_base_dir_len:]
-                    if node.data.label[0] == "/":
-                        node.data.label = node.data.label[1:]
-                else:
-                    node.data.label = node.data.name
-        else:
-            for node in all_nodes:
-                node.data.label = node.data.name
+        for node in all_nodes:
+            self._calculateLabel(node)
 
         #         self._updateNames()
         self._calculateDirs()
         self._calculateChildren()
         self._calculateObjFiles()
         self._countIncludes()
+        self._calculateExclusiveSizes()
 
         for child in self.root.data.all_children:
             self.nodes_dict[child.data.name] = child
@@ -160,30 +172,43 @@ class IncludeGraph:
     #             for child in package.children:
     #                 child.data.name = package_name + "/" + child.data.name
 
+    def _calculateLabel(self, node: GraphNode):
+        names_base_dir = self.names_base_dir
+        if names_base_dir and node.data.name.startswith(names_base_dir):
+            node.data.label = node.data.name[len(names_base_dir) :]
+            if node.data.label[0] == "/":
+                node.data.label = node.data.label[1:]
+        else:
+            node.data.label = node.data.name
+
     def _calculateDirs(self):
         for package in self.root.children:
-            pkg_subdir = prepare_filesystem_name(package.data.label)
-            package.data.subdir = pkg_subdir
+            pkg_subdir = self._calculatePackageDir(package)
+            all_children = package.getFlatList(False)
+            for child in all_children:
+                self._calculateNodeDir(child, pkg_subdir)
+
+    def _calculatePackageDir(self, package: GraphNode):
+        pkg_subdir = prepare_filesystem_name(package.data.label)
+        package.data.subdir = pkg_subdir
+        package.data.href = self.calculateHref(pkg_subdir)
+        return pkg_subdir
+
+    def _calculateNodeDir(self, node: GraphNode, pkg_subdir):
+        node_subdir = prepare_filesystem_name(node.data.label)
+        if not node.data.name.startswith("/"):
             if self.subdir_mode:
-                package.data.href = os.path.join(pkg_subdir, "index.html")
+                node_subdir = os.path.join(pkg_subdir, node_subdir)
             else:
-                package.data.href = pkg_subdir + ".html"
+                node_subdir = pkg_subdir
+        node.data.subdir = node_subdir
+        node.data.href = self.calculateHref(node_subdir)
 
-            all_children = package.getFlatList(False)
-            for child in all_children:
-                child_subdir = prepare_filesystem_name(child.data.label)
-                if not child.data.name.startswith("/"):
-                    if self.subdir_mode:
-                        child_subdir = os.path.join(pkg_subdir, child_subdir)
-                    else:
-                        child_subdir = pkg_subdir
-                else:
-                    pass
-                child.data.subdir = child_subdir
-                if self.subdir_mode:
-                    child.data.href = os.path.join(child_subdir, "index.html")
-                else:
-                    child.data.href = child_subdir + ".html"
+    def calculateHref(self, subdir):
+        ## page path relative to root directory
+        if self.subdir_mode:
+            return os.path.join(subdir, "index.html")
+        return subdir + ".html"
 
     def _calculateChildren(self):
         calculate_all_children(self.root)
@@ -208,10 +233,234 @@ class IncludeGraph:
             node.data.include_counter = counted_items
         self.root.data.include_counter = count_includes(self.root.children)
 
+    def _calculateExclusiveSizes(self):
+        compact_graph = CompactGraph(self.root.data.all_children)
+        objects_list = compact_graph.getNodeIds(NodeData.NodeType.OBJ_FILE)
+        ex_sizes = aggregate_exclusive_sizes(compact_graph.children, compact_graph.fsize, objects_list)
+        for node, ex_size in zip(compact_graph.nodes, ex_sizes):
+            node.data.ex_size = ex_size
+
+    def updateEdges(
+        self,
+        added_edges: List[Tuple[GraphNode, GraphNode]] = None,
+        removed_edges: List[Tuple[GraphNode, GraphNode]] = None,
+        removed_nodes: Set[GraphNode] = None,
+    ) -> GraphChange:
+        """Add and remove (parent, child) edges and update derived data of affected nodes only.
+
+        'removed_nodes' are nodes becoming unreachable after the change, they are skipped during update.
+        """
+        if added_edges is None:
+            added_edges = []
+        if removed_edges is None:
+            removed_edges = []
+        if removed_nodes is None:
+            removed_nodes = set()
+        ## edges are removed before adding
+        removed_edges = [edge for edge in dict.fromkeys(removed_edges) if edge[1] in edge[0].children]
+        added_edges = [
+            edge for edge in dict.fromkeys(added_edges) if edge[1] not in edge[0].children or edge in removed_edges
+        ]
+
+        changed_parents = set(edge[0] for edge in added_edges + removed_edges)
+        changed_children = set(edge[1] for edge in added_edges + removed_edges)
+
+        graph_change = GraphChange()
+        ancestors = self._getAncestors(changed_parents)
+        old_children = {node: node.data.all_children for node in ancestors}
+        old_root_children = set(self.root.children)
+        graph_change.old_ai_size = {node: node.data.ai_size for node in ancestors}
+        old_objects = [node for node in ancestors if node.data.type is NodeData.NodeType.OBJ_FILE]
+        for obj_node in old_objects:
+            for node, ex_size in calculate_object_exclusive_sizes(obj_node).items():
+                node.data.ex_size -= ex_size
+
+        for parent, child in removed_edges:
+            parent.removeChild(child)
+            child.removeParent(parent)
+        for parent, child in added_edges:
+            parent.addChild(child)
+
+        ## added edges can connect new ancestors
+        ancestors.update(self._getAncestors(changed_parents))
+        ancestors -= removed_nodes
+        self._updateIncludes(ancestors, old_children, old_root_children)
+        for node in changed_parents - removed_nodes:
+            node.data.dc_size = sum(child.data.fsize for child in node.children)
+
+        descendants = get_descendants_set(changed_children)
+        descendants -= removed_nodes
+        update_obj_files(descendants)
+
+        new_objects = [node for node in ancestors if node.data.type is NodeData.NodeType.OBJ_FILE]
+        for obj_node in new_objects:
+            for node, ex_size in calculate_object_exclusive_sizes(obj_node).items():
+                node.data.ex_size += ex_size
+
+        graph_change.ancestors = ancestors
+        graph_change.descendants = descendants
+        graph_change.removed_nodes = removed_nodes
+        return graph_change
+
+    def addPackage(self, package_node: GraphNode) -> GraphChange:
+        """Add package tree (e.g. built by separate 'GraphBuilder') to graph.
+
+        Nodes of the tree are merged with graph nodes of the same name.
+        """
+        if package_node.data.name in self.nodes_dict:
+            raise ValueError(f"package already exists: {package_node.data.name}")
+        return self._mergeTree(self.root, package_node, None)
+
+    def removePackage(self, package_name) -> GraphChange:
+        package_node = self.nodes_dict.get(package_name, None)
+        if package_node is None or package_node not in self.root.children:
+            raise ValueError(f"unable to find package: {package_name}")
+        return self._removeTree(package_node)
+
+    def replacePackage(self, package_node: GraphNode) -> GraphChange:
+        graph_change = GraphChange()
+        if package_node.data.name in self.nodes_dict:
+            graph_change = self.removePackage(package_node.data.name)
+        add_change = self.addPackage(package_node)
+        return merge_changes(graph_change, add_change)
+
+    def addObject(self, package_name, obj_node: GraphNode) -> GraphChange:
+        """Add object file tree to existing package."""
+        package_node = self.nodes_dict.get(package_name, None)
+        if package_node is None or package_node not in self.root.children:
+            raise ValueError(f"unable to find package: {package_name}")
+        if obj_node.data.name in self.nodes_dict:
+            raise ValueError(f"object file already exists: {obj_node.data.name}")
+        return self._mergeTree(package_node, obj_node, package_node.data.subdir)
+
+    def removeObject(self, obj_name) -> GraphChange:
+        obj_node = self.nodes_dict.get(obj_name, None)
+        if obj_node is None or obj_node.data.type is not NodeData.NodeType.OBJ_FILE:
+            raise ValueError(f"unable to find object file: {obj_name}")
+        return self._removeTree(obj_node)
+
+    def replaceObject(self, package_name, obj_node: GraphNode) -> GraphChange:
+        graph_change = GraphChange()
+        if obj_node.data.name in self.nodes_dict:
+            graph_change = self.removeObject(obj_node.data.name)
+        add_change = self.addObject(package_name, obj_node)
+        return merge_changes(graph_change, add_change)
+
+    def _mergeTree(self, parent_node: GraphNode, tree_root: GraphNode, pkg_subdir) -> GraphChange:
+        added_nodes: Set[GraphNode] = set()
+        merged_dict: Dict[GraphNode, GraphNode] = {}
+
+        def get_merged(node: GraphNode) -> GraphNode:
+            merged_node = merged_dict.get(node, None)
+            if merged_node is not None:
+                return merged_node
+            merged_node = self.nodes_dict.get(node.data.name, None)
+            if merged_node is None:
+                merged_node = GraphNode()
+                merged_data = merged_node.data
+                merged_data.name = node.data.name
+                merged_data.type = node.data.type
+                merged_data.fsize = node.data.fsize
+                merged_data.ai_size = merged_data.fsize
+                merged_data.all_children = set()
+                merged_data.all_obj_files = set()
+                merged_data.include_counter = collections.Counter()
+                added_nodes.add(merged_node)
+            merged_dict[node] = merged_node
+            return merged_node
+
+        added_edges = [(parent_node, get_merged(tree_root))]
+        for node in get_descendants_set([tree_root]):
+            merged_node = get_merged(node)
+            for child in node.children:
+                added_edges.append((merged_node, get_merged(child)))
+
+        new_root = merged_dict[tree_root]
+        if pkg_subdir is None:
+            ## new package
+            self._calculateLabel(new_root)
+            pkg_subdir = self._calculatePackageDir(new_root)
+            new_root.data.href = os.path.join(self.root_dir, new_root.data.href)
+        for node in added_nodes:
+            if node is new_root and parent_node is self.root:
+                continue
+            self._calculateLabel(node)
+            self._calculateNodeDir(node, pkg_subdir)
+            node.data.href = os.path.join(self.root_dir, node.data.href)
+            self.nodes_dict[node.data.name] = node
+        self.nodes_dict[new_root.data.name] = new_root
+
+        graph_change = self.updateEdges(added_edges=added_edges)
+        graph_change.added_nodes = added_nodes
+        return graph_change
+
+    def _removeTree(self, tree_root: GraphNode) -> GraphChange:
+        ## nodes of subtree still reachable from other parts of graph are preserved
+        candidates = get_descendants_set([tree_root])
+        seeds = []
+        for node in candidates:
+            if node is tree_root:
+                continue
+            for parent in node.parents:
+                if parent not in candidates:
+                    seeds.append(node)
+                    break
+        alive_nodes = get_descendants_set(seeds)
+        removed_nodes = candidates - alive_nodes
+
+        removed_edges = [(parent, tree_root) for parent in tree_root.parents]
+        for node in removed_nodes:
+            for child in node.children:
+                if child in alive_nodes:
+                    removed_edges.append((node, child))
+
+        graph_change = self.updateEdges(removed_edges=removed_edges, removed_nodes=removed_nodes)
+        for node in removed_nodes:
+            self.nodes_dict.pop(node.data.name, None)
+        return graph_change
+
+    def _getAncestors(self, nodes_list: Iterable[GraphNode]) -> Set[GraphNode]:
+        ## chopped nodes remain in 'parents' of their children, so only nodes of graph are visited
+        def is_graph_node(node: GraphNode):
+            return node is self.root or self.nodes_dict.get(node.data.name) is node
+
+        return get_ancestors_set(nodes_list, is_graph_node)
+
+    def _updateIncludes(self, region: Set[GraphNode], old_children, old_root_children):
+        for node in region:
+            node.data.all_children = None
+        for node in region:
+            if node.data.all_children is None:
+                calculate_region_children(node)
+
+        ## nodes with changed 'all_children'
+        changed_region = set(node for node in region if node.data.all_children != old_children.get(node))
+
+        for node in region:
+            if node is self.root:
+                continue
+            old_set = old_children.get(node)
+            new_set = node.data.all_children
+            if old_set is None:
+                ## new node
+                node.data.ai_size = node.data.calculateIncludeSize()
+                node.data.include_counter = count_includes(new_set)
+                continue
+            node.data.ai_size += sum(child.data.fsize for child in new_set - old_set)
+            node.data.ai_size -= sum(child.data.fsize for child in old_set - new_set)
+            counter_delta = count_includes_delta(old_set, new_set, changed_region, old_children)
+            update_counter(node.data.include_counter, counter_delta)
+
+        if self.root in region:
+            new_set = set(self.root.children)
+            counter_delta = count_includes_delta(old_root_children, new_set, changed_region, old_children)
+            update_counter(self.root.data.include_counter, counter_delta)
+
     #     def getState(self) -> IncludeGraphState:
     #         return IncludeGraphState( self.root.children )
 
     def setRootDir(self, root_dir):
+        self.root_dir = root_dir
         nodes = self.getFlatList()
         for node in nodes:
             node.data.href = os.path.join(root_dir, node.data.href)
@@ -222,6 +471,20 @@ class IncludeGraph:
             _LOGGER.warning("missing node: %s", name)
         return node
 
+    def findNode(self, name) -> GraphNode:
+        """Find node by name, label or name suffix."""
+        node = self.nodes_dict.get(name, None)
+        if node is not None:
+            return node
+        for node in self.nodes_dict.values():
+            if node.data.label == name:
+                return node
+        suffix = "/" + name
+        for node in self.nodes_dict.values():
+            if node.data.name.endswith(suffix):
+                return node
+        return None
+
     def getNodes(self, names_list: List[str]):
         ret_list = []
         for node in self.root.data.all_children:
@@ -251,6 +514,64 @@ class IncludeGraph:
             ret_list.remove(self.root)
         return ret_list
 
+    def getConnectedNodesBounded(
+        self, nodes_list: List[GraphNode], radius=None, max_nodes=None
+    ) -> Tuple[Set[GraphNode], Dict[GraphNode, Tuple[int, int]]]:
+        """Return connected nodes limited by distance from given nodes and by number of nodes.
+
+        Second item of returned pair contains numbers of hidden includers and hidden includes
+        of border nodes. Nodes closer to given nodes and bigger nodes are taken first.
+        """
+        ret_set: Set[GraphNode] = set(nodes_list)
+        ## nodes expanded towards includers and towards includes
+        parents_side: Set[GraphNode] = set(nodes_list)
+        children_side: Set[GraphNode] = set(nodes_list)
+        parents_front = list(nodes_list)
+        children_front = list(nodes_list)
+        level = 0
+        while parents_front or children_front:
+            if radius is not None and level >= radius:
+                break
+            level += 1
+            candidates: Dict[GraphNode, bool] = {}  ## node -> is includer
+            for node in parents_front:
+                for parent in node.parents:
+                    if parent is not self.root and parent not in parents_side:
+                        candidates.setdefault(parent, True)
+            for node in children_front:
+                for child in node.children:
+                    if child not in children_side:
+                        candidates.setdefault(child, False)
+            parents_front = []
+            children_front = []
+            budget_exceeded = False
+            for node in sorted(candidates, key=lambda item: (-item.data.ai_size, item.data.label)):
+                if node not in ret_set:
+                    if max_nodes is not None and len(ret_set) >= max_nodes:
+                        budget_exceeded = True
+                        break
+                    ret_set.add(node)
+                if candidates[node]:
+                    parents_side.add(node)
+                    parents_front.append(node)
+                else:
+                    children_side.add(node)
+                    children_front.append(node)
+            if budget_exceeded:
+                break
+
+        hidden_dict: Dict[GraphNode, Tuple[int, int]] = {}
+        for node in ret_set:
+            hidden_parents = 0
+            hidden_children = 0
+            if node in parents_side:
+                hidden_parents = sum(1 for parent in node.parents if parent not in ret_set and parent is not self.root)
+            if node in children_side:
+                hidden_children = sum(1 for child in node.children if child not in ret_set)
+            if hidden_parents > 0 or hidden_children > 0:
+                hidden_dict[node] = (hidden_parents, hidden_children)
+        return (ret_set, hidden_dict)
+
     def findMaxIncludeNodes(self, start_nodes_list: List[GraphNode]) -> Set[GraphNode]:
         ret_list = set()
         ret_list.update(self.findMaxIncludeChildrenPath(start_nodes_list))
@@ -307,6 +628,26 @@ class IncludeGraph:
 #         return None
 
 
+##
+class CompactGraph:
+    """Integer indexed representation of nodes and edges of include graph."""
+
+    def __init__(self, nodes_list: Iterable[GraphNode]):
+        self.nodes: List[GraphNode] = list(nodes_list)
+        self.index: Dict[GraphNode, int] = {node: node_id for node_id, node in enumerate(self.nodes)}
+        self.fsize: List[int] = [node.data.fsize for node in self.nodes]
+        self.children: List[List[int]] = []
+        self.parents: List[List[int]] = [[] for _ in self.nodes]
+        for node_id, node in enumerate(self.nodes):
+            children_ids = [self.index[child] for child in node.children if child in self.index]
+            self.children.append(children_ids)
+            for child_id in children_ids:
+                self.parents[child_id].append(node_id)
+
+    def getNodeIds(self, node_type: NodeData.NodeType) -> List[int]:
+        return [node_id for node_id, node in enumerate(self.nodes) if node.data.type is node_type]
+
+
 def get_parent_obj_files(node: GraphNode):
     if node.data.all_obj_files:
         return node.data.all_obj_files
@@ -352,6 +693,8 @@ def get_flat_list_breadth(
 
     ret_list = []
     ret_list.extend(nodes_list)
+    ## checking items of list is too slow for big graphs
+    added_set = set(ret_list)
     i = 0
     while i < len(ret_list):
         node = ret_list[i]
@@ -365,20 +708,22 @@ def get_flat_list_breadth(
 
         if ignore_nodes:
             for child in node.children:
-                if child in ret_list:
+                if child in added_set:
                     ## child node already added, so continue
                     continue
                 child_name = child.data.name
                 if starts_with(child_name, ignore_nodes):
                     ## skip node
                     continue
+                added_set.add(child)
                 ret_list.append(child)
 
         else:
             for child in node.children:
-                if child in ret_list:
+                if child in added_set:
                     ## child node already added, so continue
                     continue
+                added_set.add(child)
                 ret_list.append(child)
 
     return ret_list
@@ -445,7 +790,114 @@ def calculate_all_children(node: GraphNode):
     node.data.all_children = ret_list
 
 
-def count_includes(children_list: List[GraphNode]):
+def merge_changes(first_change: GraphChange, second_change: GraphChange) -> GraphChange:
+    ret_change = GraphChange()
+    ret_change.ancestors = (first_change.ancestors | second_change.ancestors) - second_change.removed_nodes
+    ret_change.descendants = (first_change.descendants | second_change.descendants) - second_change.removed_nodes
+    ret_change.old_ai_size = dict(second_change.old_ai_size)
+    ret_change.old_ai_size.update(first_change.old_ai_size)
+    ret_change.added_nodes = second_change.added_nodes | (first_change.added_nodes - second_change.removed_nodes)
+    ret_change.removed_nodes = first_change.removed_nodes | second_change.removed_nodes
+    return ret_change
+
+
+def get_ancestors_set(nodes_list: Iterable[GraphNode], parent_filter: Callable = None) -> Set[GraphNode]:
+    ## returns given nodes and all their parents, parents not accepted by 'parent_filter' are skipped
+    ret_set: Set[GraphNode] = set(nodes_list)
+    watch_list: List[GraphNode] = list(ret_set)
+    while watch_list:
+        node = watch_list.pop()
+        for parent in node.parents:
+            if parent_filter is not None and not parent_filter(parent):
+                continue
+            if parent not in ret_set:
+                ret_set.add(parent)
+                watch_list.append(parent)
+    return ret_set
+
+
+def get_descendants_set(nodes_list: Iterable[GraphNode]) -> Set[GraphNode]:
+    ## returns given nodes and all their children
+    ret_set: Set[GraphNode] = set(nodes_list)
+    watch_list: List[GraphNode] = list(ret_set)
+    while watch_list:
+        node = watch_list.pop()
+        for child in node.children:
+            if child not in ret_set:
+                ret_set.add(child)
+                watch_list.append(child)
+    return ret_set
+
+
+def calculate_region_children(node: GraphNode):
+    ## calculate 'all_children' of node reusing values of nodes outside of region
+    ## and nodes of region that are already calculated ('all_children' of region are reset to None)
+    ret_set: Set[GraphNode] = set()
+    watch_list: List[GraphNode] = list(node.children)
+    i = 0
+    while i < len(watch_list):
+        child = watch_list[i]
+        i += 1
+        if child in ret_set:
+            continue
+        ret_set.add(child)
+        if child.data.all_children is not None:
+            ret_set.update(child.data.all_children)
+            continue
+        watch_list.extend(child.children)
+    node.data.all_children = ret_set
+
+
+def update_obj_files(region: Set[GraphNode]):
+    ## recalculate 'all_obj_files' of nodes in region in topological order
+    in_degree = {node: sum(1 for parent in node.parents if parent in region) for node in region}
+    ordered_list = [node for node, degree in in_degree.items() if degree == 0]
+    i = 0
+    while i < len(ordered_list):
+        node = ordered_list[i]
+        i += 1
+        for child in node.children:
+            if child not in in_degree:
+                continue
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                ordered_list.append(child)
+    for node in ordered_list:
+        node.data.all_obj_files = calculate_direct_obj_files(node)
+
+    ## nodes in cycles (and below) -- iterate until stable
+    cycle_list = [node for node, degree in in_degree.items() if degree > 0]
+    for node in cycle_list:
+        node.data.all_obj_files = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in cycle_list:
+            obj_files = calculate_direct_obj_files(node)
+            if obj_files != node.data.all_obj_files:
+                node.data.all_obj_files = obj_files
+                changed = True
+
+
+def calculate_direct_obj_files(node: GraphNode) -> Set[GraphNode]:
+    ## calculate object files based on object files of parents
+    ret_set: Set[GraphNode] = set()
+    for parent in node.parents:
+        if parent.data.type is NodeData.NodeType.OBJ_FILE:
+            ret_set.add(parent)
+        elif parent.data.all_obj_files:
+            ret_set.update(parent.data.all_obj_files)
+    return ret_set
+
+
+def calculate_object_exclusive_sizes(obj_node: GraphNode) -> Dict[GraphNode, int]:
+    ## exclusive sizes of includes of single object file
+    compact_graph = CompactGraph([obj_node] + list(obj_node.data.all_children))
+    order, exclusive = calculate_exclusive_sizes(compact_graph.children, compact_graph.fsize, 0)
+    return {compact_graph.nodes[order[pos]]: exclusive[pos] for pos in range(1, len(order))}
+
+
+def count_includes(children_list: Iterable[GraphNode]):
     ## depth first order
     ret_count: collections.Counter = collections.Counter()
     for child in children_list:
@@ -455,6 +907,39 @@ def count_includes(children_list: List[GraphNode]):
     return ret_count
 
 
+def count_includes_delta(old_set: Set[GraphNode], new_set: Set[GraphNode], changed_region, old_children_dict):
+    ## difference between 'count_includes(new_set)' and 'count_includes(old_set)'
+    ## 'old_children_dict' contains values of 'all_children' before change of nodes in 'changed_region'
+    ret_count: collections.Counter = collections.Counter()
+    for child in new_set - old_set:
+        ret_count.update(get_names(child.data.all_children))
+        ret_count[child.data.name] += 1
+    for child in old_set - new_set:
+        child_all = child.data.all_children
+        if child in changed_region:
+            child_all = old_children_dict[child]
+        ret_count.subtract(get_names(child_all))
+        ret_count[child.data.name] -= 1
+    for child in changed_region & old_set & new_set:
+        old_all = old_children_dict[child]
+        new_all = child.data.all_children
+        ret_count.update(get_names(new_all - old_all))
+        ret_count.subtract(get_names(old_all - new_all))
+    return ret_count
+
+
+def update_counter(counter: collections.Counter, counter_delta: collections.Counter):
+    ## apply delta and remove items with non-positive values
+    for key, value in counter_delta.items():
+        if value == 0:
+            continue
+        new_value = counter[key] + value
+        if new_value > 0:
+            counter[key] = new_value
+        else:
+            counter.pop(key, None)
+
+
 def print_graph(nodes_list: List[GraphNode], indent=0):
     progres_list = []
     ## item: GraphNode
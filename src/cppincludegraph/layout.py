@@ -0,0 +1,152 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Selection of layout strategy for rendered graphs.
+##
+## Small graphs are laid out by 'dot'. Graphs above size threshold are laid out by cheaper
+## engine (e.g. 'sfdp' or 'neato'). If layout exceeds time limit then positions of nodes
+## are calculated by simple layered layout implemented below and graph is only drawn
+## by Graphviz ('neato -n2' does not calculate layout).
+##
+
+import logging
+import subprocess  # nosec
+from typing import List, Set, Dict, Tuple, Any
+
+from cppincludegraph.dotwriter import DotGraph, render_dot
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_LAYOUT_CONFIG: Dict[str, Any] = {
+    "threshold": 1000,  ## number of nodes above which 'engine' is used instead of 'dot'
+    "engine": "sfdp",
+    "timeout": 300,  ## seconds, None means no limit
+}
+
+CHAR_WIDTH = 7  ## approximate width of character of label in points
+NODE_HEIGHT = 36
+LAYER_GAP = 60
+
+
+##
+def get_layout_config(layout_config=None) -> Dict[str, Any]:
+    ret_config = DEFAULT_LAYOUT_CONFIG.copy()
+    if layout_config:
+        ret_config.update({key: value for key, value in layout_config.items() if value is not None})
+    if ret_config["timeout"] is not None and ret_config["timeout"] <= 0:
+        ret_config["timeout"] = None
+    return ret_config
+
+
+def select_engine(graph: DotGraph, layout_config) -> str:
+    threshold = layout_config["threshold"]
+    if threshold is not None and 0 < threshold < len(graph.nodes):
+        return layout_config["engine"]
+    return "dot"
+
+
+def render_graph(graph: DotGraph, file_format="svg", layout_config=None) -> bytes:
+    layout_config = get_layout_config(layout_config)
+    engine = select_engine(graph, layout_config)
+    timeout = layout_config["timeout"]
+    try:
+        return render_dot(graph.toString(), file_format, engine, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _LOGGER.warning(
+            "layout of graph with %s nodes by '%s' exceeded %s seconds, using layered layout",
+            len(graph.nodes),
+            engine,
+            timeout,
+        )
+    positioned_graph = make_layered_graph(graph)
+    return render_dot(positioned_graph.toString(), file_format, "neato", extra_args=["-n2"])
+
+
+## return copy of graph with positions of nodes calculated by layered layout
+def make_layered_graph(graph: DotGraph) -> DotGraph:
+    positions = calculate_layered_layout(graph)
+    ret_graph = graph.copy()
+    ret_graph.set("splines", "line")
+    for name, (pos_x, pos_y) in positions.items():
+        ret_graph.getNode(name).set("pos", f"{pos_x},{pos_y}!")
+    return ret_graph
+
+
+def calculate_layered_layout(graph: DotGraph) -> Dict[str, Tuple[int, int]]:
+    """Calculate positions of nodes (in points) placing nodes in layers from left to right.
+
+    Layer of node is length of longest path from top nodes (cycles are broken arbitrarily),
+    order of nodes in layers is improved by barycenter heuristic.
+    """
+    names_list = list(graph.nodes.keys())
+    children: Dict[str, List[str]] = {name: [] for name in names_list}
+    parents: Dict[str, List[str]] = {name: [] for name in names_list}
+    for from_name, to_name in graph.edges:
+        if from_name == to_name or from_name not in children or to_name not in parents:
+            continue
+        children[from_name].append(to_name)
+        parents[to_name].append(from_name)
+
+    ## longest path layering
+    layer_dict = {name: 0 for name in names_list}
+    in_degree = {name: len(parents[name]) for name in names_list}
+    queue = [name for name in reversed(names_list) if in_degree[name] == 0]
+    processed: Set[str] = set()
+    while len(processed) < len(names_list):
+        if not queue:
+            ## cycle -- release node with lowest number of unprocessed parents
+            next_node = min((name for name in names_list if name not in processed), key=lambda item: in_degree[item])
+            queue.append(next_node)
+        node = queue.pop()
+        if node in processed:
+            continue
+        processed.add(node)
+        for child in children[node]:
+            if child in processed:
+                continue
+            layer_dict[child] = max(layer_dict[child], layer_dict[node] + 1)
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
+
+    layers: List[List[str]] = [[] for _ in range(max(layer_dict.values(), default=-1) + 1)]
+    for name in names_list:
+        layers[layer_dict[name]].append(name)
+
+    ## barycenter ordering
+    order_dict: Dict[str, int] = {}
+    for layer in layers:
+        for index, name in enumerate(layer):
+            order_dict[name] = index
+    for _ in range(2):
+        for layer in layers[1:]:
+            barycenter = {}
+            for name in layer:
+                parents_pos = [order_dict[parent] for parent in parents[name] if layer_dict[parent] < layer_dict[name]]
+                barycenter[name] = sum(parents_pos) / len(parents_pos) if parents_pos else order_dict[name]
+            layer.sort(key=barycenter.__getitem__)
+            for index, name in enumerate(layer):
+                order_dict[name] = index
+
+    ## coordinates
+    positions: Dict[str, Tuple[int, int]] = {}
+    pos_x = 0
+    for layer in layers:
+        layer_width = max(get_node_width(graph, name) for name in layer)
+        center_x = pos_x + layer_width // 2
+        for index, name in enumerate(layer):
+            positions[name] = (center_x, -index * (NODE_HEIGHT + NODE_HEIGHT // 2))
+        pos_x += layer_width + LAYER_GAP
+    return positions
+
+
+def get_node_width(graph: DotGraph, name) -> int:
+    label = graph.getNode(name).get("label") or name
+    return len(str(label)) * CHAR_WIDTH + 24
@@ -0,0 +1,140 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Cache of parsed build logs.
+##
+## Every log file has its own cache file (JSON) containing include trees of object files
+## and key of log: path, size, modification time and content hash. Trees are stored in flat
+## form: list of pairs (depth, name index) in preorder, names are kept in separate table.
+##
+
+import os
+import logging
+import json
+import hashlib
+from typing import List, Dict, Tuple, Any
+
+from cppincludegraph.includegraph import GraphNode, NodeData
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+CACHE_VERSION = 1
+
+
+class LogCache:
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def getCachePath(self, log_path):
+        real_path = os.path.realpath(log_path)
+        path_hash = hashlib.sha256(real_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, path_hash + ".json")
+
+    def load(self, log_path, build_dir, build_regex) -> Tuple[bool, List[GraphNode]]:
+        """Return pair (is cache valid, cached object files trees)."""
+        cache_path = self.getCachePath(log_path)
+        if not os.path.isfile(cache_path):
+            return (False, None)
+        try:
+            with open(cache_path, "r", encoding="utf-8") as cache_file:
+                cache_data = json.load(cache_file)
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("unable to read cache file %s: %s", cache_path, exc)
+            return (False, None)
+
+        cache_key = cache_data.get("key", {})
+        log_key = get_log_key(log_path, build_dir, build_regex)
+        if cache_data.get("version") != CACHE_VERSION:
+            return (False, None)
+        for key_item in ["path", "build_dir", "build_regex", "size"]:
+            if cache_key.get(key_item) != log_key[key_item]:
+                return (False, None)
+        if cache_key.get("mtime") != log_key["mtime"]:
+            ## file touched -- compare content
+            log_key["hash"] = calculate_file_hash(log_path)
+            if cache_key.get("hash") != log_key["hash"]:
+                return (False, None)
+            cache_data["key"] = log_key
+            self._write(cache_path, cache_data)
+
+        objects_list = cache_data.get("objects")
+        if objects_list is None:
+            ## log could not be parsed
+            return (True, None)
+        names_list = cache_data["names"]
+        return (True, [list_to_tree(names_list, obj_data) for obj_data in objects_list])
+
+    def store(self, log_path, build_dir, build_regex, objects_list: List[GraphNode]):
+        log_key = get_log_key(log_path, build_dir, build_regex)
+        log_key["hash"] = calculate_file_hash(log_path)
+        cache_data: Dict[str, Any] = {"version": CACHE_VERSION, "key": log_key}
+        if objects_list is None:
+            cache_data["objects"] = None
+        else:
+            names_dict: Dict[str, int] = {}
+            cache_data["objects"] = [tree_to_list(names_dict, obj_node) for obj_node in objects_list]
+            cache_data["names"] = list(names_dict.keys())
+        self._write(self.getCachePath(log_path), cache_data)
+
+    def _write(self, cache_path, cache_data):
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache_data, cache_file, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+
+
+def get_log_key(log_path, build_dir, build_regex):
+    file_stats = os.stat(log_path)
+    return {
+        "path": os.path.realpath(log_path),
+        "build_dir": build_dir,
+        "build_regex": build_regex or "",
+        "size": file_stats.st_size,
+        "mtime": file_stats.st_mtime_ns,
+    }
+
+
+def calculate_file_hash(file_path):
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as in_file:
+        for chunk in iter(lambda: in_file.read(1048576), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def tree_to_list(names_dict: Dict[str, int], obj_node: GraphNode) -> List[int]:
+    ## preorder list of pairs (depth, name index), object file has depth 0
+    ret_list: List[int] = []
+    stack = [(obj_node, 0)]
+    while stack:
+        node, depth = stack.pop()
+        name_index = names_dict.setdefault(node.data.name, len(names_dict))
+        ret_list.append(depth)
+        ret_list.append(name_index)
+        for child in reversed(node.children):
+            stack.append((child, depth + 1))
+    return ret_list
+
+
+def list_to_tree(names_list: List[str], items_list: List[int]) -> GraphNode:
+    obj_node = GraphNode()
+    obj_node.data.name = names_list[items_list[1]]
+    obj_node.data.type = NodeData.NodeType.OBJ_FILE
+    level_node_dict = {0: obj_node}
+    for i in range(2, len(items_list), 2):
+        depth = items_list[i]
+        graph_node = GraphNode()
+        graph_node.data.name = names_list[items_list[i + 1]]
+        graph_node.data.type = NodeData.NodeType.HEADER
+        level_node_dict[depth - 1].addChild(graph_node)
+        level_node_dict[depth] = graph_node
+    return obj_node
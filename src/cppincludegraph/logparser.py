@@ -9,11 +9,12 @@ import os
 import logging
 import re
 
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Iterator
 
-from showgraph.io import read_file, read_list
+from showgraph.io import read_list
 
 from cppincludegraph.includegraph import GraphNode, NodeData, get_flat_list_breadth
+from cppincludegraph.logcache import LogCache
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -126,11 +127,21 @@ def find_build_logs(log_dir, log_name):
 
 
 def read_build_logs(
-    log_files_list, build_dir, files_info_dict=None, reduce_dirs=None, build_regex=None, name_from_log_file=False
+    log_files_list,
+    build_dir,
+    files_info_dict=None,
+    reduce_dirs=None,
+    build_regex=None,
+    name_from_log_file=False,
+    cache_dir=None,
 ) -> List[GraphNode]:
     if files_info_dict is None:
         files_info_dict = {}
 
+    log_cache = None
+    if cache_dir:
+        log_cache = LogCache(cache_dir)
+
     #     raw_tree: List[ GraphNode ] = []
     graph_builder = GraphBuilder(files_info_dict)
 
@@ -138,8 +149,17 @@ def read_build_logs(
     read_size = len(log_files_list)
     for log_path in log_files_list:
         read_counter += 1
-        _LOGGER.info("%s/%s: reading log file: %s", read_counter, read_size, log_path)
-        module_tree_list = read_build_log_file(log_path, build_dir, build_regex)
+        module_tree_list = None
+        cache_valid = False
+        if log_cache:
+            cache_valid, module_tree_list = log_cache.load(log_path, build_dir, build_regex)
+        if cache_valid:
+            _LOGGER.info("%s/%s: loaded log file from cache: %s", read_counter, read_size, log_path)
+        else:
+            _LOGGER.info("%s/%s: reading log file: %s", read_counter, read_size, log_path)
+            module_tree_list = read_build_log_file(log_path, build_dir, build_regex)
+            if log_cache:
+                log_cache.store(log_path, build_dir, build_regex, module_tree_list)
         if not module_tree_list:
             continue
         package_node = GraphNode()
@@ -163,96 +183,98 @@ def read_build_logs(
 
 
 def read_build_log_file(log_path, build_dir, build_regex=None) -> List[GraphNode]:
-    content = read_file(log_path)
-    if not content:
+    if not os.path.isfile(log_path) or os.path.getsize(log_path) < 1:
         _LOGGER.warning("unable to read file: %s", log_path)
         return None
+    try:
+        return list(iterate_build_log_file(log_path, build_dir, build_regex))
+    except ValueError:
+        ## error already logged
+        return None
+
+
+def iterate_build_log_file(log_path, build_dir, build_regex=None) -> Iterator[GraphNode]:
+    """Yield include trees of object files as soon as they are read from log.
 
+    Log is read line by line, so only currently parsed tree is kept in memory.
+    Raise ValueError in case of invalid (interweaved) log.
+    """
     if not build_regex:
         ## defaulting to make output
         build_regex = r".*Building \S* object (.*)$"
 
-    cxx_object_node_list = []
     level_node_dict: Dict[int, GraphNode] = None
 
-    line_num = 0
-    for line in content.splitlines():
-        line_num += 1
-        line = line.strip()
-        line = escape_ansi(line)
-
-        ## print( "line:", line )
-
-        recent_obj_file = None
-        found_obj_file = re.findall(build_regex, line)
-        if len(found_obj_file) == 1:
-            recent_obj_file = found_obj_file[0]
-
-        if recent_obj_file:
-            ## new object file -- expecting include tree
-            ## print( f"xxx: >{recent_obj_file}<" )
-
-            # recent_obj_file = os.path.realpath( recent_obj_file )
-            item_node = GraphNode()
-            item_node.data.name = os.path.join(build_dir, recent_obj_file)
-            item_node.data.type = NodeData.NodeType.OBJ_FILE
-            level_node_dict = {}
-            level_node_dict[0] = item_node
-            continue
-
-        if line.startswith("."):
-            ## content of include tree
-            if level_node_dict is None:
-                ## invalid case -- happens in case of interweaved logs
-                _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
-                return None
-                # raise Exception( f"invalid (interweaved) file {log_path}:{line_num}" )
-
-            space_pos = line.find(" ")
-            if space_pos < 0:
-                ## invalid case -- happens in case of interweaved logs
-                level_node_dict = None
-                _LOGGER.error("invalid case - no space found: %s in %s", line, log_path)
-                _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
-                return None
-                # raise Exception( f"invalid (interweaved) file {log_path}:{line_num}" )
-
-            parent_index = space_pos - 1
-            if parent_index not in level_node_dict:
-                ## invalid case -- happens in case of interweaved logs
-                level_node_dict = None
-                _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
-                return None
-                # raise Exception( f"invalid (interweaved) file {log_path}:{line_num}" )
-
-            dots_text = line[:space_pos]
-            dots_set = set(dots_text)
-            if len(dots_set) > 1:
-                ## invalid case -- happens in case of interweaved logs
-                level_node_dict = None
-                _LOGGER.error("invalid case - invalid chars found: >%s< %s in %s", dots_text, space_pos, log_path)
-                _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
-                return None
-                # raise Exception( f"invalid (interweaved) file {log_path}:{line_num}" )
-
-            ## adding header node
-            item = line[space_pos + 1 :]
-            item = os.path.realpath(item)
-            graph_node = GraphNode()
-            graph_node.data.name = item
-            graph_node.data.type = NodeData.NodeType.HEADER
-            parent_node = level_node_dict[parent_index]
-            parent_node.addChild(graph_node)
-            level_node_dict[space_pos] = graph_node
-            continue
+    with open(log_path, "r", encoding="utf-8") as log_file:
+        line_num = 0
+        for line in log_file:
+            line_num += 1
+            line = line.strip()
+            line = escape_ansi(line)
+
+            ## print( "line:", line )
+
+            recent_obj_file = None
+            found_obj_file = re.findall(build_regex, line)
+            if len(found_obj_file) == 1:
+                recent_obj_file = found_obj_file[0]
+
+            if recent_obj_file:
+                ## new object file -- expecting include tree
+                ## print( f"xxx: >{recent_obj_file}<" )
+
+                # recent_obj_file = os.path.realpath( recent_obj_file )
+                item_node = GraphNode()
+                item_node.data.name = os.path.join(build_dir, recent_obj_file)
+                item_node.data.type = NodeData.NodeType.OBJ_FILE
+                level_node_dict = {}
+                level_node_dict[0] = item_node
+                continue
 
-        ## other case
-        if level_node_dict is not None:
-            root_node = level_node_dict[0]
-            cxx_object_node_list.append(root_node)
-        level_node_dict = None
+            if line.startswith("."):
+                ## content of include tree
+                if level_node_dict is None:
+                    ## invalid case -- happens in case of interweaved logs
+                    _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
+                    raise ValueError(f"invalid (interweaved) file {log_path}:{line_num}")
+
+                space_pos = line.find(" ")
+                if space_pos < 0:
+                    ## invalid case -- happens in case of interweaved logs
+                    _LOGGER.error("invalid case - no space found: %s in %s", line, log_path)
+                    _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
+                    raise ValueError(f"invalid (interweaved) file {log_path}:{line_num}")
+
+                parent_index = space_pos - 1
+                if parent_index not in level_node_dict:
+                    ## invalid case -- happens in case of interweaved logs
+                    _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
+                    raise ValueError(f"invalid (interweaved) file {log_path}:{line_num}")
+
+                dots_text = line[:space_pos]
+                dots_set = set(dots_text)
+                if len(dots_set) > 1:
+                    ## invalid case -- happens in case of interweaved logs
+                    _LOGGER.error("invalid case - invalid chars found: >%s< %s in %s", dots_text, space_pos, log_path)
+                    _LOGGER.error("invalid (interweaved) file %s:%s", log_path, line_num)
+                    raise ValueError(f"invalid (interweaved) file {log_path}:{line_num}")
+
+                ## adding header node
+                item = line[space_pos + 1 :]
+                item = os.path.realpath(item)
+                graph_node = GraphNode()
+                graph_node.data.name = item
+                graph_node.data.type = NodeData.NodeType.HEADER
+                parent_node = level_node_dict[parent_index]
+                parent_node.addChild(graph_node)
+                level_node_dict[space_pos] = graph_node
+                continue
 
-    return cxx_object_node_list
+            ## other case
+            if level_node_dict is not None:
+                root_node = level_node_dict[0]
+                yield root_node
+            level_node_dict = None
 
 
 # def get_after( content, start ):
@@ -6,14 +6,23 @@
 #
 
 import os
+import sys
 import logging
-from typing import List
 import argparse
 
 from cppincludegraph import logger
-from cppincludegraph.includegraph import GraphNode, IncludeGraph
-from cppincludegraph.logparser import find_build_logs, read_files_info, read_build_logs
-from cppincludegraph.generator import generate_pages
+from cppincludegraph.includegraph import IncludeGraph
+from cppincludegraph.logparser import read_files_info
+from cppincludegraph.graphinput import build_include_graph, add_graph_input_arguments, read_input_graph
+from cppincludegraph.generator import generate_pages, get_graph_config, get_pages_config, SVG_MODES
+from cppincludegraph.viewer import generate_viewer
+from cppincludegraph.focus import select_focus_nodes, FOCUS_ORDERS
+from cppincludegraph.stats import calculate_stats, write_stats, STATS_FORMATS, DEFAULT_STATS_LIMIT
+from cppincludegraph.server import PageRenderer, serve_pages, SERVER_ROOT
+from cppincludegraph.whatif import simulate_include_changes
+from cppincludegraph.graphstore import save_graph, load_graph
+from cppincludegraph.sqlexport import export_sqlite
+from cppincludegraph.commands import main_diff, main_parse, main_why, main_includers, main_query, main_impact
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,7 +34,13 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 def main():
-    parser = argparse.ArgumentParser(description="generate headers include graph based on compiler output")
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
+    parser = argparse.ArgumentParser(
+        description="generate headers include graph based on compiler output",
+        epilog="Other commands: " + ", ".join(COMMANDS.keys()) + " (call '<command> --help' for details)",
+    )
     parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
 
     ## =================================================
@@ -69,6 +84,23 @@ def main():
         help="List of headers directories to reduce",
     )
     parser.add_argument("--rel_names", action="store", required=False, default="", help="Reduce prefix of all names")
+    parser.add_argument(
+        "--collapse_dirs",
+        nargs="+",
+        action="store",
+        required=False,
+        default=None,
+        help="List of headers directories to collapse into single directory nodes",
+    )
+    parser.add_argument(
+        "--collapse_depth",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Collapse headers into directory nodes of given path depth"
+        " (depth is counted from '--rel_names' directory if header is inside it)",
+    )
     parser.add_argument(
         "--files_info",
         action="store",
@@ -89,42 +121,224 @@ def main():
         default=False,
         help="Should use package name from log file name?",
     )
+    parser.add_argument(
+        "--cache_dir",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for cache of parsed build logs (only new or changed logs are parsed)",
+    )
+    parser.add_argument(
+        "--save_graph",
+        "--save-graph",
+        action="store",
+        required=False,
+        default="",
+        help="Store built graph with calculated data to binary file",
+    )
+    parser.add_argument(
+        "--export_sqlite",
+        action="store",
+        required=False,
+        default="",
+        help="Export graph (nodes, edges and headers of object files) to SQLite database file",
+    )
+    parser.add_argument(
+        "--load_graph",
+        "--load-graph",
+        action="store",
+        required=False,
+        default="",
+        help="Load graph from binary file (created with '--save_graph') instead of reading build logs",
+    )
+    parser.add_argument(
+        "--whatif_remove",
+        nargs=2,
+        action="append",
+        required=False,
+        default=None,
+        metavar=("INCLUDER", "INCLUDED"),
+        help="Simulate removal of include (can be passed multiple times)",
+    )
+    parser.add_argument(
+        "--whatif_add",
+        nargs=2,
+        action="append",
+        required=False,
+        default=None,
+        metavar=("INCLUDER", "INCLUDED"),
+        help="Simulate addition of include (can be passed multiple times)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        action="store",
+        required=False,
+        default=1,
+        help="Number of processes generating pages",
+    )
+    parser.add_argument(
+        "--render_cache",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for cache of rendered graphs (unchanged graphs are not rendered again)",
+    )
+    parser.add_argument(
+        "--graph_radius",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum depth of includers and includes presented on graph of page",
+    )
+    parser.add_argument(
+        "--graph_max_nodes",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum number of nodes presented on graph of page (remaining nodes are summarized)",
+    )
+    parser.add_argument(
+        "--layout_threshold",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Number of graph nodes above which '--layout_engine' is used instead of 'dot' (default: 1000, 0 disables)",
+    )
+    parser.add_argument(
+        "--layout_engine",
+        action="store",
+        required=False,
+        default=None,
+        help="Graphviz layout engine for big graphs, e.g. 'sfdp' or 'neato' (default: sfdp)",
+    )
+    parser.add_argument(
+        "--layout_timeout",
+        type=float,
+        action="store",
+        required=False,
+        default=None,
+        help="Time limit of layout of single graph in seconds, after that simple layered layout is used"
+        " (default: 300, 0 disables)",
+    )
+    parser.add_argument(
+        "--table_limit",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum number of rows of tables presented on pages (full tables are split into listing files)",
+    )
+    parser.add_argument(
+        "--listing_page_size",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Number of rows of single listing file of table (default: 1000, 0 disables listing files)",
+    )
+    parser.add_argument(
+        "--svg_mode",
+        choices=SVG_MODES,
+        action="store",
+        required=False,
+        default="embed",
+        help="Storing of graphs: embedded into pages, separate SVG files or separate compressed SVG files"
+        " (files are shared by pages with the same graph)",
+    )
+    add_stats_arguments(parser)
+    parser.add_argument(
+        "--focus",
+        nargs="+",
+        action="store",
+        required=False,
+        default=None,
+        help="Generate pages only for nodes matching given glob patterns (e.g. '*/boost/*')",
+    )
+    parser.add_argument(
+        "--focus_regex",
+        action="store",
+        required=False,
+        default=None,
+        help="Generate pages only for nodes matching given regular expression",
+    )
+    parser.add_argument(
+        "--focus_top",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Generate pages only for given number of biggest headers",
+    )
+    parser.add_argument(
+        "--focus_top_order",
+        choices=FOCUS_ORDERS,
+        action="store",
+        required=False,
+        default="ai_size",
+        help="Order of biggest headers: size with includes or number of including object files",
+    )
+    parser.add_argument(
+        "--focus_packages",
+        nargs="+",
+        action="store",
+        required=False,
+        default=None,
+        help="Generate pages only for given packages and their object files",
+    )
+    parser.add_argument(
+        "--focus_hops",
+        type=int,
+        action="store",
+        required=False,
+        default=0,
+        help="Extend focused nodes by includers and includes within given distance",
+    )
+    parser.add_argument(
+        "--viewer",
+        action="store_true",
+        help="Generate client side viewer (single graph data file browsed interactively) instead of pages",
+    )
     parser.add_argument("--outdir", action="store", required=False, default="", help="Output directory")
 
     args = parser.parse_args()
 
-    if args.logall is True:
-        logger.configure(logLevel=logging.DEBUG)
-    else:
-        logger.configure(logLevel=logging.INFO)
+    configure_logger(args)
 
-    log_dir = args.log_dir
-    log_name = args.log_name
+    files_info_dict = read_files_info(args.files_info)
 
-    if len(log_dir) == 0:
-        log_dir = None
-    if len(log_name) == 0:
-        log_name = None
+    if args.load_graph:
+        try:
+            build_tree: IncludeGraph = load_graph(args.load_graph)
+        except (OSError, ValueError) as exc:
+            _LOGGER.error("unable to load graph: %s", exc)
+            return 1
+    else:
+        build_tree = build_include_graph(args, files_info_dict)
+        if build_tree is None:
+            return 1
 
-    found_logs = find_build_logs(log_dir, log_name)
-    if len(args.log_files) > 0:
-        found_logs.extend(args.log_files)
+    if args.save_graph:
+        save_graph(build_tree, args.save_graph)
+    if args.export_sqlite:
+        export_sqlite(build_tree, args.export_sqlite)
 
-    build_dir = args.build_dir
-    if not os.path.isdir(build_dir):
-        _LOGGER.error("given build directory does not exist: %s", build_dir)
-        return 1
-    build_dir = os.path.realpath(build_dir)
+    if args.whatif_remove or args.whatif_add:
+        _LOGGER.info("simulating include changes")
+        try:
+            result = simulate_include_changes(build_tree, args.whatif_remove, args.whatif_add)
+        except ValueError as exc:
+            _LOGGER.error("unable to simulate changes: %s", exc)
+            return 1
+        _LOGGER.info("simulation result: %s", result)
 
-    _LOGGER.info("reading build logs: %s", found_logs)
-    files_info_dict = read_files_info(args.files_info)
-    graph_list: List[GraphNode] = read_build_logs(
-        found_logs, build_dir, files_info_dict, args.reduce_dirs, args.build_regex, args.namefromlogfile
-    )
+    if args.stats:
+        return run_stats_mode(build_tree, args)
 
-    _LOGGER.info("building include graph")
-    IncludeGraph.subdir_mode = False
-    build_tree: IncludeGraph = IncludeGraph(graph_list, args.rel_names)
     build_tree.setRootDir(args.outdir)
 
     #     ## pprint.pprint( build_tree )
@@ -136,11 +350,190 @@ def main():
     ##
     ## generate HTML data
     ##
-    if len(args.outdir) > 0:
+    if len(args.outdir) > 0 and args.viewer:
+        _LOGGER.info("generating viewer")
+        generate_viewer(build_tree, args.outdir)
+    elif len(args.outdir) > 0:
         _LOGGER.info("generating HTML graph")
         generate_pages(
-            build_tree, args.outdir, files_info_dict, no_highlight=args.nohighlight, mark_hotpath=args.markhotpath
+            build_tree,
+            args.outdir,
+            files_info_dict,
+            no_highlight=args.nohighlight,
+            mark_hotpath=args.markhotpath,
+            pages_options=get_generator_options(args, build_tree),
         )
 
     _LOGGER.info("--- completed ---")
     return 0
+
+
+def configure_logger(args):
+    if args.logall is True:
+        logger.configure(logLevel=logging.DEBUG)
+    elif args.stats and not args.stats_out:
+        ## keep printed statistics parsable
+        logger.configure(logLevel=logging.WARNING)
+    else:
+        logger.configure(logLevel=logging.INFO)
+
+
+## arguments of statistics only mode
+def add_stats_arguments(parser):
+    parser.add_argument(
+        "--stats",
+        choices=STATS_FORMATS,
+        action="store",
+        required=False,
+        default=None,
+        help="Write statistics (lists of biggest headers) in given format instead of generating pages",
+    )
+    parser.add_argument(
+        "--stats_out",
+        action="store",
+        required=False,
+        default="",
+        help="Output file of statistics (if not given, then statistics are printed to standard output)",
+    )
+    parser.add_argument(
+        "--stats_limit",
+        type=int,
+        action="store",
+        required=False,
+        default=DEFAULT_STATS_LIMIT,
+        help=f"Number of items of lists of statistics (default: {DEFAULT_STATS_LIMIT})",
+    )
+
+
+## statistics only mode -- statistics are written instead of generating pages
+def run_stats_mode(build_tree: IncludeGraph, args):
+    stats = calculate_stats(build_tree, args.stats_limit)
+    if not args.stats_out:
+        write_stats(stats, sys.stdout, args.stats)
+    else:
+        _LOGGER.info("writing statistics: %s", args.stats_out)
+        with open(args.stats_out, "w", encoding="utf-8", newline="") as out_file:
+            write_stats(stats, out_file, args.stats)
+
+    _LOGGER.info("--- completed ---")
+    return 0
+
+
+## options of 'generate_pages'
+def get_generator_options(args, build_tree: IncludeGraph):
+    return {
+        "jobs": args.jobs,
+        "render_cache_dir": args.render_cache,
+        "graph_radius": args.graph_radius,
+        "graph_max_nodes": args.graph_max_nodes,
+        "layout_config": {
+            "threshold": args.layout_threshold,
+            "engine": args.layout_engine,
+            "timeout": args.layout_timeout,
+        },
+        "table_limit": args.table_limit,
+        "listing_page_size": args.listing_page_size,
+        "svg_mode": args.svg_mode,
+        "focus_nodes": select_focus_nodes(build_tree, get_focus_config(args)),
+    }
+
+
+def get_focus_config(args):
+    return {
+        "names": args.focus,
+        "regex": args.focus_regex,
+        "top": args.focus_top,
+        "top_order": args.focus_top_order,
+        "packages": args.focus_packages,
+        "hops": args.focus_hops,
+    }
+
+
+## ===================================================================
+
+
+def main_serve(args_list=None):
+    parser = argparse.ArgumentParser(
+        prog="cppincludegraphgen serve", description="serve pages of include graph rendered on demand"
+    )
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    add_graph_input_arguments(parser)
+    parser.add_argument("--host", action="store", required=False, default="127.0.0.1", help="Server address")
+    parser.add_argument("--port", type=int, action="store", required=False, default=8000, help="Server port")
+    parser.add_argument(
+        "--page_cache_size",
+        type=int,
+        action="store",
+        required=False,
+        default=256,
+        help="Memory limit of cache of rendered pages [MB] (least recently used pages are dropped)",
+    )
+    parser.add_argument(
+        "--nohighlight", action="store_true", required=False, default=False, help="Should node highlight be disabled?"
+    )
+    parser.add_argument(
+        "--markhotpath", action="store_true", required=False, default=False, help="Should hot path be painted?"
+    )
+    parser.add_argument(
+        "--render_cache",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for cache of rendered graphs (unchanged graphs are not rendered again)",
+    )
+    parser.add_argument(
+        "--graph_radius",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum depth of includers and includes presented on graph of page",
+    )
+    parser.add_argument(
+        "--graph_max_nodes",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum number of nodes presented on graph of page (remaining nodes are summarized)",
+    )
+    parser.add_argument(
+        "--table_limit",
+        type=int,
+        action="store",
+        required=False,
+        default=None,
+        help="Maximum number of rows of tables presented on pages",
+    )
+
+    args = parser.parse_args(args_list)
+
+    if args.logall is True:
+        logger.configure(logLevel=logging.DEBUG)
+    else:
+        logger.configure(logLevel=logging.INFO)
+
+    build_tree = read_input_graph(args)
+    if build_tree is None:
+        return 1
+
+    graph_config = get_graph_config(args.nohighlight, args.markhotpath, args.graph_radius, args.graph_max_nodes)
+    ## listings are not split into separate files
+    pages_options = {"render_cache_dir": args.render_cache, "table_limit": args.table_limit, "listing_page_size": 0}
+    pages_config = get_pages_config(build_tree, {}, graph_config, SERVER_ROOT, pages_options)
+    renderer = PageRenderer(build_tree, pages_config, args.page_cache_size * 1024 * 1024)
+    serve_pages(renderer, args.host, args.port)
+
+    _LOGGER.info("--- completed ---")
+    return 0
+
+
+COMMANDS = {
+    "diff": main_diff,
+    "serve": main_serve,
+    "parse": main_parse,
+    "why": main_why,
+    "includers": main_includers,
+    "query": main_query,
+    "impact": main_impact,
+}
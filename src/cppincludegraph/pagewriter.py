@@ -0,0 +1,356 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Streaming writer of tables of node pages.
+##
+## Rows are written directly to output file instead of being concatenated into page string.
+## Relative links and sort orders of nodes are calculated once per graph ('PageIndex')
+## and shared by all pages.
+##
+
+import os
+import logging
+import heapq
+import functools
+from typing import List, Set, Dict, Iterable, Tuple, Callable, Any
+
+from cppincludegraph import texttemplate
+from cppincludegraph.includegraph import GraphNode, IncludeGraph
+from cppincludegraph.rendercache import replace_file_if_changed
+
+
+_LOGGER = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PAGE_TEMPLATE_PATH = os.path.join(SCRIPT_DIR, "template", "include_tree_page.html.tmpl")
+
+BODY_COLOR = "#bbbbbb"
+
+## number of rows of single file of full listing of table
+DEFAULT_LISTING_PAGE_SIZE = 1000
+
+## parameters of table written by 'PageWriter.writeTable'
+DEFAULT_TABLE_CONFIG: Dict[str, Any] = {
+    "id": None,  ## identifier of table in names of listing files
+    "title": "",
+    "columns": [],
+    "items_count": None,  ## number of all items of table, if not given then length of items list is used
+    "summary": None,
+}
+
+OBJECT_FILES_COLUMNS = ["File:", "File size [kB]:"]
+PACKAGES_COLUMNS = ["File:", "Object files size [kB]:"]
+INCLUDES_COLUMNS = ["File:", "File size [kB]:", "Size with includes [kB]:"]
+INCLUDED_COLUMNS = [
+    "File:",
+    "Object files:",
+    "File size [kB]:",
+    "Size with includes [kB]:",
+    "Exclusive size [kB]:",
+    "Total size [kB]:",
+]
+
+
+class PageIndex:
+    """Data of nodes shared by all pages of graph."""
+
+    def __init__(self, build_tree: IncludeGraph, root_dir, linked_names: Set[str] = None):
+        self.root_dir = os.path.normpath(root_dir)
+        all_nodes = set(build_tree.root.data.all_children)
+        all_nodes.discard(build_tree.root)
+
+        ## links relative to root directory (href is derived from 'subdir', so it is known upfront)
+        ## if 'linked_names' is given, then only nodes of given names have pages
+        self.links: Dict[GraphNode, str] = {
+            node: os.path.relpath(node.data.href, self.root_dir)
+            for node in all_nodes
+            if node.data.href and (linked_names is None or node.data.name in linked_names)
+        }
+
+        ## ranks of nodes in orders used on pages -- sorting by rank replaces comparison of names
+        names_order = sorted(all_nodes, key=lambda item: item.data.name)
+        self.name_rank: Dict[GraphNode, int] = {node: rank for rank, node in enumerate(names_order)}
+        fsize_order = sorted(names_order, key=lambda item: item.data.fsize, reverse=True)
+        self.fsize_rank: Dict[GraphNode, int] = {node: rank for rank, node in enumerate(fsize_order)}
+        ai_size_order = sorted(names_order, key=lambda item: item.data.ai_size, reverse=True)
+        self.ai_size_rank: Dict[GraphNode, int] = {node: rank for rank, node in enumerate(ai_size_order)}
+
+    ## return prefix of links of page placed in given directory
+    def getLinkPrefix(self, page_dir) -> str:
+        prefix = os.path.relpath(self.root_dir, os.path.normpath(page_dir))
+        if prefix == os.curdir:
+            return ""
+        return prefix + "/"
+
+    def sortByName(self, nodes_list: Iterable[GraphNode], limit=None) -> List[GraphNode]:
+        return sort_items(nodes_list, self.name_rank.__getitem__, limit=limit)
+
+    ## sort by file size, equal items are sorted by name
+    def sortByFileSize(self, nodes_list: Iterable[GraphNode], limit=None) -> List[GraphNode]:
+        return sort_items(nodes_list, self.fsize_rank.__getitem__, limit=limit)
+
+    ## sort by size with includes, equal items are sorted by name
+    def sortByIncludeSize(self, nodes_list: Iterable[GraphNode], limit=None) -> List[GraphNode]:
+        return sort_items(nodes_list, self.ai_size_rank.__getitem__, limit=limit)
+
+
+class PageWriter:
+    """Write tables of page to file object.
+
+    If 'limit' of tables config is set, then tables present only top rows and full content
+    of tables is split into listing files placed next to the page ('listing_base' is path of
+    page without extension).
+    """
+
+    def __init__(self, out_file, page_index: PageIndex, page_dir, listing_base=None, tables_config=None):
+        self.out_file = out_file
+        self.page_index = page_index
+        self.page_dir = page_dir
+        self.link_prefix = page_index.getLinkPrefix(page_dir)
+        if tables_config is None:
+            tables_config = {}
+        self.table_limit = tables_config.get("limit") or None
+        listing_page_size = tables_config.get("page_size")
+        if listing_page_size is None:
+            listing_page_size = DEFAULT_LISTING_PAGE_SIZE
+        self.listing_base = listing_base
+        self.listing_page_size = listing_page_size if listing_base else 0
+
+    def write(self, content):
+        self.out_file.write(content)
+
+    def getLink(self, node: GraphNode) -> str:
+        return self.link_prefix + self.page_index.links[node]
+
+    def getFileCell(self, node: GraphNode) -> str:
+        if node not in self.page_index.links:
+            ## node without page
+            return f"                <td><code>{node.data.label}</code></td>\n"
+        return f'                <td><code><a href="{self.getLink(node)}">{node.data.label}</a></code></td>\n'
+
+    ## number of items to sort -- without listing files only presented items are needed
+    def getSortLimit(self):
+        if self.listing_page_size > 0:
+            return None
+        return self.table_limit
+
+    def writeObjectFilesTables(self, objects_list: Iterable[GraphNode]):
+        objects_list = list(objects_list)
+        ## rows are the same in both tables, so each row is formatted once
+        row_func = functools.lru_cache(maxsize=None)(self.getObjectFileRow)
+        table_config = {"columns": OBJECT_FILES_COLUMNS, "items_count": len(objects_list)}
+        sort_limit = self.getSortLimit()
+        by_name = self.page_index.sortByName(objects_list, sort_limit)
+        table_config.update({"id": "objects_name", "title": "Object files (sorted by name):"})
+        self.writeTable(table_config, by_name, row_func)
+        by_size = self.page_index.sortByFileSize(objects_list, sort_limit)
+        table_config.update({"id": "objects_size", "title": "Object files (sorted by size):"})
+        self.writeTable(table_config, by_size, row_func)
+
+    def writeChildrenTables(self, item_type, children_list: Iterable[GraphNode]):
+        if item_type == "PACKAGE":
+            title = "Object files"
+            columns = OBJECT_FILES_COLUMNS
+            row_func = self.getObjectFileRow
+        elif item_type == "ROOT":
+            title = "Packages"
+            columns = PACKAGES_COLUMNS
+            row_func = self.getPackageRow
+        elif item_type in ("OBJ_FILE", "HEADER"):
+            title = "Direct includes"
+            columns = INCLUDES_COLUMNS
+            row_func = self.getIncludeRow
+        else:
+            return
+        children_list = list(children_list)
+        row_func = functools.lru_cache(maxsize=None)(row_func)
+        table_config = {"columns": columns, "items_count": len(children_list)}
+        sort_limit = self.getSortLimit()
+        by_name = self.page_index.sortByName(children_list, sort_limit)
+        table_config.update({"id": "children_name", "title": f"{title} (sorted by name):"})
+        self.writeTable(table_config, by_name, row_func)
+        by_size = self.page_index.sortByIncludeSize(children_list, sort_limit)
+        table_config.update({"id": "children_size", "title": f"{title} (sorted by size):"})
+        self.writeTable(table_config, by_size, row_func)
+
+    ## items of list are tuples (node, number of including object files, total size in kB)
+    def writeIncludeTables(self, included_list: List[Tuple[GraphNode, int, float]]):
+        if not included_list:
+            return
+        name_rank = self.page_index.name_rank
+        ## rows are the same in all tables, so each row is formatted once
+        row_func = functools.lru_cache(maxsize=None)(self.getIncludedRow)
+        total_inclusions = sum(item[1] for item in included_list)
+        table_config = {
+            "columns": INCLUDED_COLUMNS,
+            "items_count": len(included_list),
+            "summary": f"Total inclusions: {total_inclusions}",
+        }
+        sort_limit = self.getSortLimit()
+
+        sorted_list = sort_items(included_list, lambda item: name_rank[item[0]], True, sort_limit)
+        table_config.update({"id": "included_name", "title": "All included headers (sorted by name):"})
+        self.writeTable(table_config, sorted_list, row_func)
+        sorted_list = sort_items(included_list, lambda item: (item[1], name_rank[item[0]]), True, sort_limit)
+        title = "All included headers (sorted by number of object files):"
+        table_config.update({"id": "included_count", "title": title})
+        self.writeTable(table_config, sorted_list, row_func)
+        sorted_list = sort_items(included_list, lambda item: (item[2], name_rank[item[0]]), True, sort_limit)
+        table_config.update({"id": "included_size", "title": "All included headers (sorted by total size):"})
+        self.writeTable(table_config, sorted_list, row_func)
+
+    def getObjectFileRow(self, node: GraphNode) -> str:
+        return "".join(
+            [
+                "            <tr>\n",
+                self.getFileCell(node),
+                f"                <td>{size_kb(node.data.fsize)}</td>\n",
+                "            </tr>\n",
+            ]
+        )
+
+    def getPackageRow(self, node: GraphNode) -> str:
+        return "".join(
+            [
+                "            <tr>\n",
+                self.getFileCell(node),
+                f"                <td>{size_kb(node.data.dc_size)}</td>\n",
+                "            </tr>\n",
+            ]
+        )
+
+    def getIncludeRow(self, node: GraphNode) -> str:
+        return "".join(
+            [
+                "            <tr>\n",
+                self.getFileCell(node),
+                f"                <td>{size_kb(node.data.fsize)}</td>\n",
+                f"                <td>{size_kb(node.data.ai_size)}</td>\n",
+                "            </tr>\n",
+            ]
+        )
+
+    def getIncludedRow(self, item: Tuple[GraphNode, int, float]) -> str:
+        node_data = item[0].data
+        return "".join(
+            [
+                "            <tr>\n",
+                self.getFileCell(item[0]),
+                f"                <td>{item[1]}</td>\n",
+                f"                <td>{size_kb(node_data.fsize)}</td>\n",
+                f"                <td>{size_kb(node_data.ai_size)}</td>\n",
+                f"                <td>{size_kb(node_data.ex_size)}</td>\n",
+                f"                <td>{item[2]}</td>\n",
+                "            </tr>\n",
+            ]
+        )
+
+    ## 'table_config' -- see 'DEFAULT_TABLE_CONFIG'
+    def writeTable(self, table_config, items: List, row_func: Callable):
+        """Write table of sorted items. Items above limit are presented in listing files only."""
+        table_config = get_table_config(table_config)
+        items_count = table_config["items_count"]
+        if items_count is None:
+            items_count = len(items)
+        presented_items = items
+        if self.table_limit and items_count > self.table_limit:
+            presented_items = items[: self.table_limit]
+
+        self.writeTableBegin(table_config["title"], table_config["columns"])
+        for item in presented_items:
+            self.write(row_func(item))
+        self.write("        </table>\n")
+        if len(presented_items) < items_count:
+            presented_info = f"Presented {len(presented_items)} of {items_count} items."
+            if self.listing_page_size > 0:
+                listing_names = self.writeListing(table_config, items, row_func)
+                presented_info += " Full list: " + get_listing_links(listing_names)
+            self.write(f"        {presented_info}\n")
+            self.write("        <br />\n")
+        summary = table_config["summary"]
+        if summary:
+            self.write(f"        {summary}\n")
+        self.write("    </div>\n")
+        self.write("\n")
+
+    ## write full content of table split into files, returns names of files
+    def writeListing(self, table_config, items: List, row_func: Callable) -> List[str]:
+        page_size = self.listing_page_size
+        items_count = len(items)
+        files_count = (items_count + page_size - 1) // page_size
+        base_name = os.path.basename(self.listing_base)
+        table_id = table_config["id"]
+        title = table_config["title"]
+        listing_names = [f"{base_name}.{table_id}.{index}.html" for index in range(1, files_count + 1)]
+        template_module = texttemplate.get_module(PAGE_TEMPLATE_PATH)
+        listing_params = {"body_color": BODY_COLOR, "page_link": base_name + ".html", "page_title": "page"}
+
+        for file_index, listing_name in enumerate(listing_names):
+            first_item = file_index * page_size
+            last_item = min(first_item + page_size, items_count)
+            out_path = os.path.join(self.page_dir, listing_name)
+            tmp_path = f"{out_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as out_file:
+                out_file.write(template_module.listing_begin(INPUT_DICT=listing_params))
+                listing_writer = PageWriter(out_file, self.page_index, self.page_dir)
+                navigation = get_listing_links(listing_names, file_index)
+                listing_writer.write(f'    <div class="info_content">Pages: {navigation}</div>\n')
+                listing_title = f"{title.rstrip(':')} - items {first_item + 1}-{last_item} of {items_count}:"
+                listing_writer.writeTableBegin(listing_title, table_config["columns"])
+                for item in items[first_item:last_item]:
+                    listing_writer.write(row_func(item))
+                listing_writer.writeTableEnd()
+                listing_writer.write(f'    <div class="info_content">Pages: {navigation}</div>\n')
+                out_file.write(template_module.page_end())
+            replace_file_if_changed(tmp_path, out_path)
+        return listing_names
+
+    def writeTableBegin(self, title, columns: List[str]):
+        self.write('    <div class="info_content">\n')
+        self.write(f'        <span style="font-weight: bold;">{title}</span>\n')
+        self.write('        <table class="alternate">\n')
+        self.write("            <tr>\n")
+        for column in columns:
+            self.write(f"                <th>{column}</th>\n")
+        self.write("            </tr>\n")
+
+    def writeTableEnd(self):
+        self.write("        </table>\n")
+        self.write("    </div>\n")
+        self.write("\n")
+
+
+def get_table_config(table_config=None) -> Dict[str, Any]:
+    ret_config = DEFAULT_TABLE_CONFIG.copy()
+    if table_config:
+        ret_config.update(table_config)
+    return ret_config
+
+
+## sort items, if limit is given then only first items are returned
+def sort_items(items: Iterable, key: Callable, reverse=False, limit=None) -> List:
+    if limit:
+        if reverse:
+            return heapq.nlargest(limit, items, key=key)
+        return heapq.nsmallest(limit, items, key=key)
+    return sorted(items, key=key, reverse=reverse)
+
+
+def get_listing_links(listing_names: List[str], current_index=None) -> str:
+    links_list = []
+    for index, listing_name in enumerate(listing_names):
+        if index == current_index:
+            links_list.append(f"<b>{index + 1}</b>")
+        else:
+            links_list.append(f'<a href="{listing_name}">{index + 1}</a>')
+    return " ".join(links_list)
+
+
+def size_kb(f_size):
+    return round(f_size / 1024, 2)
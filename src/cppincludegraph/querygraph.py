@@ -0,0 +1,163 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Queries of include chains ("why is header included").
+##
+## Graph is converted once to integer adjacency lists. Breadth first search from given node
+## stores predecessor of every reached node, so shortest chain to any target is read by walking
+## predecessors back. Predecessors and ancestor sets are cached per node, so subsequent queries
+## from the same object file (or to the same header) do not traverse graph again.
+##
+
+import collections
+from typing import List, Set, Dict
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph, CompactGraph
+
+
+## maximum number of cached search results per kind
+CACHE_SIZE = 256
+
+## default maximum number of searched chains
+DEFAULT_CHAINS_LIMIT = 20
+
+
+class IncludeQuery:
+    """Answer queries about include chains of graph."""
+
+    def __init__(self, build_tree: IncludeGraph):
+        nodes_list = sorted(build_tree.root.data.all_children, key=lambda item: item.data.name)
+        self.graph = CompactGraph(nodes_list)
+        self.names_index: Dict[str, int] = {}
+        for node_id, node in enumerate(nodes_list):
+            if node.data.label:
+                self.names_index.setdefault(node.data.label, node_id)
+            self.names_index[node.data.name] = node_id
+        ## node id -> list of predecessors (-1: not reached, source points to itself)
+        self.predecessors_cache: collections.OrderedDict = collections.OrderedDict()
+        ## node id -> set of nodes including given node directly or indirectly
+        self.ancestors_cache: collections.OrderedDict = collections.OrderedDict()
+
+    def findNode(self, name) -> GraphNode:
+        """Find node by name, label or unique suffix of path. Raise ValueError if node is not found or is ambiguous."""
+        node_id = self.names_index.get(name)
+        if node_id is not None:
+            return self.graph.nodes[node_id]
+        suffix = "/" + name.lstrip("/")
+        found_list = [node for node in self.graph.nodes if node.data.name.endswith(suffix)]
+        if len(found_list) == 1:
+            return found_list[0]
+        if not found_list:
+            raise ValueError(f"node not found: {name}")
+        candidates = ", ".join(sorted(node.data.name for node in found_list)[:10])
+        raise ValueError(f"ambiguous node name: {name} (candidates: {candidates})")
+
+    def getShortestChain(self, source: GraphNode, target: GraphNode) -> List[GraphNode]:
+        """Return shortest include chain from source to target (inclusive) or empty list if target is not included."""
+        source_id = self.graph.index[source]
+        target_id = self.graph.index[target]
+        predecessors = self._getPredecessors(source_id)
+        if predecessors[target_id] < 0:
+            return []
+        chain = [target_id]
+        while chain[-1] != source_id:
+            chain.append(predecessors[chain[-1]])
+        chain.reverse()
+        return [self.graph.nodes[node_id] for node_id in chain]
+
+    def getAllChains(self, source: GraphNode, target: GraphNode, limit=None) -> List[List[GraphNode]]:
+        """Return include chains from source to target sorted by length.
+
+        Number of chains can grow exponentially, so searching stops after 'limit' chains.
+        """
+        source_id = self.graph.index[source]
+        target_id = self.graph.index[target]
+        ## only nodes including target can be part of chain
+        allowed = self._getAncestors(target_id)
+        if source_id not in allowed:
+            return []
+        children = self.graph.children
+        chains: List[List[int]] = []
+        ## depth first search, stack holds pairs (node id, position of node in path)
+        path: List[int] = []
+        stack = [(source_id, 0)]
+        while stack:
+            node_id, depth = stack.pop()
+            del path[depth:]
+            path.append(node_id)
+            if node_id == target_id:
+                chains.append(list(path))
+                if limit is not None and len(chains) >= limit:
+                    break
+                continue
+            for child_id in reversed(children[node_id]):
+                if (child_id in allowed or child_id == target_id) and child_id not in path:
+                    stack.append((child_id, depth + 1))
+        chains.sort(key=len)
+        return [[self.graph.nodes[node_id] for node_id in chain] for chain in chains]
+
+    def getIncluders(self, target: GraphNode) -> List[GraphNode]:
+        """Return direct includers of node sorted by name."""
+        target_id = self.graph.index[target]
+        return [self.graph.nodes[node_id] for node_id in sorted(set(self.graph.parents[target_id]))]
+
+    def getIncludingObjects(self, target: GraphNode) -> List[GraphNode]:
+        """Return object files including node directly or indirectly sorted by name."""
+        return sorted(target.data.all_obj_files or [], key=lambda item: item.data.name)
+
+    def _getPredecessors(self, source_id) -> List[int]:
+        predecessors = self.predecessors_cache.get(source_id)
+        if predecessors is not None:
+            self.predecessors_cache.move_to_end(source_id)
+            return predecessors
+        children = self.graph.children
+        predecessors = [-1] * len(children)
+        predecessors[source_id] = source_id
+        queue = collections.deque([source_id])
+        while queue:
+            node_id = queue.popleft()
+            for child_id in children[node_id]:
+                if predecessors[child_id] < 0:
+                    predecessors[child_id] = node_id
+                    queue.append(child_id)
+        store_cache(self.predecessors_cache, source_id, predecessors)
+        return predecessors
+
+    def _getAncestors(self, target_id) -> Set[int]:
+        cached_ancestors = self.ancestors_cache.get(target_id)
+        if cached_ancestors is not None:
+            self.ancestors_cache.move_to_end(target_id)
+            return cached_ancestors
+        parents = self.graph.parents
+        ancestors: Set[int] = set()
+        queue = collections.deque([target_id])
+        while queue:
+            node_id = queue.popleft()
+            for parent_id in parents[node_id]:
+                if parent_id not in ancestors:
+                    ancestors.add(parent_id)
+                    queue.append(parent_id)
+        store_cache(self.ancestors_cache, target_id, ancestors)
+        return ancestors
+
+
+def store_cache(cache_dict, key, value):
+    cache_dict[key] = value
+    while len(cache_dict) > CACHE_SIZE:
+        cache_dict.popitem(last=False)
+
+
+## ============================================================
+
+
+def get_node_label(node: GraphNode) -> str:
+    return node.data.label or node.data.name
+
+
+def format_chain(chain: List[GraphNode]) -> str:
+    return " -> ".join(get_node_label(node) for node in chain)
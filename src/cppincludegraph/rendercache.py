@@ -0,0 +1,110 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Content addressed cache of rendered graphs.
+##
+## Rendered content is stored under hash of graph source (DOT), so unchanged graphs are
+## never rendered twice. Cache can be shared by multiple processes -- files are written
+## atomically.
+##
+
+import os
+import logging
+import hashlib
+
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class RenderCache:
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def getPath(self, key, extension):
+        return os.path.join(self.cache_dir, key[:2], key[2:] + "." + extension)
+
+    def get(self, key, extension):
+        cache_path = self.getPath(key, extension)
+        try:
+            with open(cache_path, "r", encoding="utf-8") as cache_file:
+                return cache_file.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, key, extension, content):
+        cache_path = self.getPath(key, extension)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        write_file_atomic(cache_path, content)
+
+    ## return rendered content of given source, 'render_func' is called only if content is not cached
+    def render(self, source, extension, render_func):
+        key = calculate_hash(source)
+        content = self.get(key, extension)
+        if content is not None:
+            self.hits += 1
+            return content
+        self.misses += 1
+        content = render_func()
+        self.store(key, extension, content)
+        return content
+
+
+def calculate_hash(content: str):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+## write text or binary content to file, readers never see partially written file
+def write_file_atomic(out_path, content):
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    if isinstance(content, bytes):
+        with open(tmp_path, "wb") as out_file:
+            out_file.write(content)
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as out_file:
+            out_file.write(content)
+    os.replace(tmp_path, out_path)
+
+
+## write content to file only if it differs from content on disk, returns True if file was written
+def write_file_if_changed(out_path, content) -> bool:
+    try:
+        with open(out_path, "r", encoding="utf-8") as in_file:
+            if in_file.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    with open(out_path, "w", encoding="utf-8") as out_file:
+        out_file.write(content)
+    return True
+
+
+## replace file by temporary file only if content differs, temporary file is removed, returns True if file was replaced
+def replace_file_if_changed(tmp_path, out_path) -> bool:
+    if os.path.isfile(out_path) and is_same_content(tmp_path, out_path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def is_same_content(first_path, second_path) -> bool:
+    if os.path.getsize(first_path) != os.path.getsize(second_path):
+        return False
+    with open(first_path, "rb") as first_file, open(second_path, "rb") as second_file:
+        while True:
+            first_chunk = first_file.read(CHUNK_SIZE)
+            if first_chunk != second_file.read(CHUNK_SIZE):
+                return False
+            if not first_chunk:
+                return True
@@ -0,0 +1,173 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Local HTTP server presenting pages of graph.
+##
+## Graph is loaded once and pages are rendered on first request, so only visited pages
+## are generated. Rendered pages are kept in LRU cache limited by size of content.
+##
+
+import io
+import logging
+import collections
+import urllib.parse
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph
+from cppincludegraph.dotwriter import DotGraph
+from cppincludegraph.pagewriter import PageIndex
+from cppincludegraph.generator import (
+    generate_dot_graph2,
+    get_main_page_params,
+    get_node_page_params,
+    write_html_page,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+## pages are served from root of URL space
+SERVER_ROOT = "/"
+
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+
+class PageCache:
+    """LRU cache of rendered pages limited by summary size of content."""
+
+    def __init__(self, size_limit=DEFAULT_CACHE_SIZE):
+        self.size_limit = size_limit
+        self.size = 0
+        self.items: collections.OrderedDict = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> bytes:
+        content = self.items.get(key)
+        if content is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def put(self, key, content: bytes):
+        old_content = self.items.pop(key, None)
+        if old_content is not None:
+            self.size -= len(old_content)
+        if len(content) > self.size_limit:
+            ## item bigger than whole cache
+            return
+        self.items[key] = content
+        self.size += len(content)
+        while self.size > self.size_limit:
+            _, removed_content = self.items.popitem(last=False)
+            self.size -= len(removed_content)
+
+
+class PageRenderer:
+    """Render pages of graph on demand.
+
+    'pages_config' is result of 'get_pages_config()' with 'output_dir' set to 'SERVER_ROOT'
+    and embedded graphs.
+    """
+
+    def __init__(self, build_tree: IncludeGraph, pages_config, cache_size=DEFAULT_CACHE_SIZE):
+        self.build_tree = build_tree
+        self.pages_config = pages_config
+        self.root_dir = pages_config["output_dir"]
+        self.build_tree.setRootDir(self.root_dir)
+        self.page_index = PageIndex(build_tree, self.root_dir)
+        ## page path (relative to root) to node
+        self.pages_dict: Dict[str, GraphNode] = {link: node for node, link in self.page_index.links.items()}
+        self.cache = PageCache(cache_size)
+
+    ## return content of page or None if page does not exist
+    def getPage(self, page_path) -> bytes:
+        content = self.cache.get(page_path)
+        if content is not None:
+            return content
+        content = self.renderPage(page_path)
+        if content is None:
+            return None
+        self.cache.put(page_path, content)
+        return content
+
+    def renderPage(self, page_path) -> bytes:
+        node = self.pages_dict.get(page_path)
+        if node is not None:
+            _LOGGER.info("rendering page of %s", node.data.name)
+            out_path, page_params = get_node_page_params(self.build_tree, node, self.pages_config, make_dirs=False)
+        elif page_path == "index.html":
+            _LOGGER.info("rendering main page")
+            package_nodes = self.build_tree.getPackageNodes()
+            graph_config = self.pages_config["graph_config"]
+            graph: DotGraph = generate_dot_graph2(self.build_tree, package_nodes, self.root_dir, graph_config)
+            out_path, page_params = get_main_page_params(self.build_tree, graph, self.pages_config)
+        else:
+            return None
+
+        out_file = io.StringIO()
+        tables_config = self.pages_config["tables_config"]
+        write_html_page(out_file, out_path, page_params, self.page_index, tables_config=tables_config)
+        return out_file.getvalue().encode("utf-8")
+
+
+class ReportServer(HTTPServer):
+    """Single threaded server -- pages are rendered one at a time."""
+
+    def __init__(self, server_address, renderer: PageRenderer):
+        super().__init__(server_address, PageRequestHandler)
+        self.renderer = renderer
+
+
+class PageRequestHandler(BaseHTTPRequestHandler):
+    server: ReportServer
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        page_path = get_page_path(self.path)
+        try:
+            content = self.server.renderer.getPage(page_path)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("unable to render page: %s", page_path)
+            self.send_error(500)
+            return
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        _LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+
+## convert URL path to path of page relative to root
+def get_page_path(url_path) -> str:
+    page_path = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path)
+    page_path = page_path.lstrip("/")
+    if not page_path:
+        return "index.html"
+    return page_path
+
+
+def serve_pages(renderer: PageRenderer, host="127.0.0.1", port=8000):
+    server = ReportServer((host, port), renderer)
+    _LOGGER.info("serving pages on: http://%s:%s/", host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    cache = renderer.cache
+    _LOGGER.info("page cache: %s hits, %s misses, %s pages in cache", cache.hits, cache.misses, len(cache.items))
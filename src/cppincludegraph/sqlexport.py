@@ -0,0 +1,159 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Export of include graph to SQLite database for ad-hoc queries.
+##
+## Database contains tables:
+##    'nodes' -- properties of nodes ('objects' is number of including object files),
+##    'edges' -- direct includes,
+##    'object_includes' -- headers reachable from object files ('count' is value of include
+##                         counter of object file, the same as presented on pages),
+##    'meta' -- format version and names base directory.
+##
+## Rows are inserted in batches inside single transaction and indexes are created after
+## inserting data. Database is written to temporary file and moved in place at the end.
+##
+
+import os
+import logging
+import sqlite3
+import itertools
+from typing import List, Dict, Iterable, Tuple
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph, NodeData
+
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+DEFAULT_BATCH_SIZE = 50000
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE nodes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    label TEXT,
+    type TEXT,
+    fsize INTEGER,
+    dc_size INTEGER,
+    ai_size INTEGER,
+    ex_size INTEGER,
+    objects INTEGER
+);
+CREATE TABLE edges (parent_id INTEGER NOT NULL, child_id INTEGER NOT NULL);
+CREATE TABLE object_includes (object_id INTEGER NOT NULL, header_id INTEGER NOT NULL, count INTEGER);
+"""
+
+INDEXES = """
+CREATE INDEX nodes_name ON nodes (name);
+CREATE INDEX nodes_label ON nodes (label);
+CREATE INDEX nodes_type ON nodes (type);
+CREATE INDEX nodes_ai_size ON nodes (ai_size);
+CREATE UNIQUE INDEX edges_parent ON edges (parent_id, child_id);
+CREATE INDEX edges_child ON edges (child_id);
+CREATE UNIQUE INDEX object_includes_object ON object_includes (object_id, header_id);
+CREATE INDEX object_includes_header ON object_includes (header_id);
+"""
+
+
+def export_sqlite(build_tree: IncludeGraph, out_path, batch_size=DEFAULT_BATCH_SIZE):
+    _LOGGER.info("exporting graph to database: %s", out_path)
+    ## nodes sorted by name, so ids are stable
+    nodes_list: List[GraphNode] = sorted(build_tree.root.data.all_children, key=lambda item: item.data.name)
+    index: Dict[GraphNode, int] = {node: node_id for node_id, node in enumerate(nodes_list)}
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            write_database(connection, build_tree, nodes_list, index, batch_size)
+        finally:
+            connection.close()
+    except BaseException:
+        ## incomplete database is not left on disk
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, out_path)
+
+
+def write_database(
+    connection: sqlite3.Connection, build_tree: IncludeGraph, nodes_list, index, batch_size=DEFAULT_BATCH_SIZE
+):
+    ## journal is not needed -- incomplete file is never moved in place
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.executescript(SCHEMA)
+    with connection:
+        meta_rows = [("version", str(SCHEMA_VERSION)), ("names_base_dir", build_tree.names_base_dir or "")]
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", meta_rows)
+        insert_batched(
+            connection,
+            "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            get_nodes_rows(nodes_list),
+            batch_size,
+        )
+        insert_batched(connection, "INSERT INTO edges VALUES (?, ?)", get_edges_rows(nodes_list, index), batch_size)
+        insert_batched(
+            connection,
+            "INSERT INTO object_includes VALUES (?, ?, ?)",
+            get_object_includes_rows(nodes_list, index),
+            batch_size,
+        )
+    connection.executescript(INDEXES)
+    connection.execute("ANALYZE")
+
+
+def insert_batched(connection: sqlite3.Connection, statement, rows: Iterable[Tuple], batch_size=DEFAULT_BATCH_SIZE):
+    rows_iter = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows_iter, batch_size))
+        if not batch:
+            return
+        connection.executemany(statement, batch)
+
+
+def get_nodes_rows(nodes_list: List[GraphNode]):
+    for node_id, node in enumerate(nodes_list):
+        data = node.data
+        type_name = data.getTypeName() or None
+        objects_count = len(data.all_obj_files or [])
+        yield (
+            node_id,
+            data.name,
+            data.label,
+            type_name,
+            data.fsize,
+            data.dc_size,
+            data.ai_size,
+            data.ex_size,
+            objects_count,
+        )
+
+
+def get_edges_rows(nodes_list: List[GraphNode], index: Dict[GraphNode, int]):
+    for node_id, node in enumerate(nodes_list):
+        ## node can have duplicated children
+        children_ids = {index[child] for child in node.children if child in index}
+        for child_id in sorted(children_ids):
+            yield (node_id, child_id)
+
+
+def get_object_includes_rows(nodes_list: List[GraphNode], index: Dict[GraphNode, int]):
+    for node_id, node in enumerate(nodes_list):
+        if node.data.type is not NodeData.NodeType.OBJ_FILE:
+            continue
+        include_counter = node.data.include_counter or {}
+        headers_ids = {index[header]: header for header in node.data.all_children if header in index}
+        for header_id in sorted(headers_ids):
+            header_name = headers_ids[header_id].data.name
+            yield (node_id, header_id, include_counter.get(header_name, 0))
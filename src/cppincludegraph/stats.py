@@ -0,0 +1,124 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Statistics of include graph (lists of biggest headers) written as text, JSON or CSV.
+##
+## Statistics are calculated directly from include graph, so neither graphs nor pages
+## are generated (suitable for CI checks).
+##
+
+import csv
+import json
+import operator
+import logging
+from typing import List, Dict, Any
+
+from cppincludegraph.includegraph import GraphNode, IncludeGraph, NodeData
+
+
+_LOGGER = logging.getLogger(__name__)
+
+STATS_FORMATS = ["text", "json", "csv"]
+
+DEFAULT_STATS_LIMIT = 50
+
+## orders of lists of headers: key of row -> title
+STATS_ORDERS = {
+    "objects": "object files count",
+    "ai_size": "size with includes",
+    "total_size": "total size",
+}
+
+STATS_COLUMNS = ["name", "objects", "fsize", "ai_size", "ex_size", "total_size"]
+
+
+def calculate_stats(build_tree: IncludeGraph, limit=DEFAULT_STATS_LIMIT) -> Dict[str, Any]:
+    all_nodes = build_tree.root.data.all_children
+    headers_list: List[GraphNode] = []
+    obj_files_list: List[GraphNode] = []
+    for node in all_nodes:
+        if node.data.type is NodeData.NodeType.HEADER:
+            headers_list.append(node)
+        elif node.data.type is NodeData.NodeType.OBJ_FILE:
+            obj_files_list.append(node)
+    ## sorted by label, so equal items are in stable order
+    headers_list.sort(key=lambda item: item.data.label)
+    headers_rows = [get_header_row(node) for node in headers_list]
+
+    stats: Dict[str, Any] = {
+        "summary": {
+            "packages": len(build_tree.getPackageNodes()),
+            "object_files": len(obj_files_list),
+            "headers": len(headers_list),
+            "total_size": sum(node.data.ai_size for node in obj_files_list),
+        }
+    }
+    for order in STATS_ORDERS:
+        ordered_rows = sorted(headers_rows, key=operator.itemgetter(order), reverse=True)
+        stats[order] = ordered_rows[:limit]
+    return stats
+
+
+def get_header_row(node: GraphNode) -> Dict[str, Any]:
+    data = node.data
+    objects_count = len(data.all_obj_files or [])
+    return {
+        "name": data.label,
+        "objects": objects_count,
+        "fsize": data.fsize,
+        "ai_size": data.ai_size,
+        "ex_size": data.ex_size,
+        "total_size": objects_count * data.fsize,
+    }
+
+
+## ============================================================
+
+
+def write_stats(stats: Dict[str, Any], out_file, stats_format="text"):
+    if stats_format == "json":
+        json.dump(stats, out_file, indent=4)
+        out_file.write("\n")
+    elif stats_format == "csv":
+        write_stats_csv(stats, out_file)
+    elif stats_format == "text":
+        write_stats_text(stats, out_file)
+    else:
+        raise ValueError(f"invalid stats format: {stats_format}")
+
+
+## single table, column 'order' tells list of row
+def write_stats_csv(stats: Dict[str, Any], out_file):
+    writer = csv.writer(out_file, lineterminator="\n")
+    writer.writerow(["order", "rank"] + STATS_COLUMNS)
+    for order in STATS_ORDERS:
+        for rank, row in enumerate(stats[order], 1):
+            writer.writerow([order, rank] + [row[column] for column in STATS_COLUMNS])
+
+
+def write_stats_text(stats: Dict[str, Any], out_file):
+    summary = stats["summary"]
+    out_file.write(f"Packages: {summary['packages']}\n")
+    out_file.write(f"Object files: {summary['object_files']}\n")
+    out_file.write(f"Headers: {summary['headers']}\n")
+    out_file.write(f"Total size: {size_kb(summary['total_size'])} kB\n")
+    for order, title in STATS_ORDERS.items():
+        rows = stats[order]
+        out_file.write(f"\nTop {len(rows)} headers by {title}:\n")
+        out_file.write(
+            f"{'objects':>8} {'file [kB]':>12} {'includes [kB]':>14} {'exclusive [kB]':>15} {'total [kB]':>14}  name\n"
+        )
+        for row in rows:
+            out_file.write(
+                f"{row['objects']:>8} {size_kb(row['fsize']):>12} {size_kb(row['ai_size']):>14}"
+                f" {size_kb(row['ex_size']):>15} {size_kb(row['total_size']):>14}  {row['name']}\n"
+            )
+
+
+def size_kb(f_size):
+    return round(f_size / 1024, 2)
@@ -0,0 +1,176 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Generator of synthetic build logs (compiler '-H' output) for tests and benchmarks.
+##
+## Headers are split into layers ('depth'), every header includes about 'fanout' headers of
+## next layer placed near its own position, so object files share parts of include trees.
+## With probability 'sharing' include points to one of common headers (like standard library
+## headers) and with probability 'cycles' header additionally includes header of previous
+## layer, which makes cycle in graph. Output depends only on configuration, so the same seed
+## always gives the same log.
+##
+
+import os
+import random
+import logging
+from typing import List, Set, Dict, Tuple, Any
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_SYNTH_CONFIG: Dict[str, Any] = {
+    "objects": 1000,
+    "headers": None,  ## number of headers, if not given then half of objects plus 100
+    "fanout": 3,  ## average number of includes of file
+    "depth": 5,  ## number of layers of headers
+    "sharing": 0.2,  ## probability of including one of common headers
+    "cycles": 0.01,  ## probability of including header of previous layer
+    "seed": 1,
+    "root_dir": "/synth",
+}
+
+## number of files in single directory
+DIR_SIZE = 50
+
+## size of neighbourhood of included headers
+LOCALITY = 4
+
+
+def get_synth_config(synth_config=None) -> Dict[str, Any]:
+    config = DEFAULT_SYNTH_CONFIG.copy()
+    if synth_config:
+        config.update(synth_config)
+    if config["headers"] is None:
+        config["headers"] = config["objects"] // 2 + 100
+    config["depth"] = max(1, min(config["depth"], config["headers"]))
+    return config
+
+
+def get_build_dir(synth_config=None):
+    config = get_synth_config(synth_config)
+    return os.path.join(config["root_dir"], "build")
+
+
+## write build log and files info to given directory, return paths of files
+def generate_build_files(out_dir, synth_config=None) -> Tuple[str, str]:
+    os.makedirs(out_dir, exist_ok=True)
+    log_path = os.path.join(out_dir, "build.log")
+    info_path = os.path.join(out_dir, "files_info.txt")
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        files_sizes = generate_build_log(log_file, synth_config)
+    with open(info_path, "w", encoding="utf-8") as info_file:
+        write_files_info(info_file, files_sizes)
+    return (log_path, info_path)
+
+
+def generate_build_log(log_file, synth_config=None) -> Dict[str, int]:
+    """Write synthetic build log, return sizes of all files (content of files info)."""
+    config = get_synth_config(synth_config)
+    ## seeded generator gives reproducible logs, not used for security
+    rng = random.Random(config["seed"])  # nosec
+    root_dir = config["root_dir"]
+    build_dir = get_build_dir(config)
+    objects_num = config["objects"]
+    headers_num = config["headers"]
+
+    headers_names = [f"{root_dir}/include/m{i // DIR_SIZE}/h{i}.h" for i in range(headers_num)]
+    includes_list, cycle_edges = generate_includes(rng, config)
+
+    files_sizes: Dict[str, int] = {}
+    for name in headers_names:
+        files_sizes[name] = rng.randint(200, 20000)
+
+    _LOGGER.info("generating log with %s object files and %s headers", objects_num, headers_num)
+    for obj_id in range(objects_num):
+        obj_name = f"CMakeFiles/app.dir/src/m{obj_id // DIR_SIZE}/f{obj_id}.cpp.o"
+        files_sizes[os.path.join(build_dir, obj_name)] = rng.randint(1000, 100000)
+        obj_includes = pick_includes(rng, config, obj_id / objects_num, 0)
+        percent = obj_id * 100 // objects_num
+        lines_list = [f"[{percent:3}%] Building CXX object {obj_name}"]
+        guardless_set: Set[int] = set()
+
+        ## depth first traversal, already included headers are skipped as by include guards
+        seen_set: Set[int] = set()
+        stack = [(header_id, 1, -1) for header_id in reversed(obj_includes)]
+        while stack:
+            header_id, level, parent_id = stack.pop()
+            if header_id in seen_set:
+                if (parent_id, header_id) in cycle_edges:
+                    ## header included in cycle is printed again, but not expanded
+                    lines_list.append("." * level + " " + headers_names[header_id])
+                    guardless_set.add(header_id)
+                continue
+            seen_set.add(header_id)
+            lines_list.append("." * level + " " + headers_names[header_id])
+            for child_id in reversed(includes_list[header_id]):
+                stack.append((child_id, level + 1, header_id))
+
+        lines_list.append("Multiple include guards may be useful for:")
+        lines_list.extend(headers_names[header_id] for header_id in sorted(guardless_set))
+        log_file.write("\n".join(lines_list))
+        log_file.write("\n")
+    log_file.write("[100%] Built target app\n")
+    return files_sizes
+
+
+def generate_includes(rng: random.Random, config) -> Tuple[List[List[int]], Set[Tuple[int, int]]]:
+    """Return list of includes of every header and set of edges closing cycles."""
+    headers_num = config["headers"]
+    depth = config["depth"]
+    includes_list: List[List[int]] = []
+    cycle_edges: Set[Tuple[int, int]] = set()
+    for header_id in range(headers_num):
+        layer = header_id * depth // headers_num
+        layer_start, layer_end = get_layer_range(headers_num, depth, layer)
+        position = (header_id - layer_start) / max(1, layer_end - layer_start)
+        header_includes = []
+        if layer + 1 < depth:
+            header_includes = pick_includes(rng, config, position, layer + 1)
+        if layer > 0 and rng.random() < config["cycles"]:
+            prev_start, prev_end = get_layer_range(headers_num, depth, layer - 1)
+            cycle_id = rng.randrange(prev_start, prev_end)
+            header_includes.append(cycle_id)
+            cycle_edges.add((header_id, cycle_id))
+        includes_list.append(header_includes)
+    return (includes_list, cycle_edges)
+
+
+## pick includes from given layer near given relative position (0.0 - 1.0)
+def pick_includes(rng: random.Random, config, position, layer) -> List[int]:
+    headers_num = config["headers"]
+    fanout = config["fanout"]
+    layer_start, layer_end = get_layer_range(headers_num, config["depth"], layer)
+    common_start = headers_num - max(1, headers_num // DIR_SIZE)
+    center = layer_start + int(position * (layer_end - layer_start))
+    window = fanout * LOCALITY
+    includes_num = rng.randint(max(1, fanout // 2), fanout + fanout // 2)
+    ## dict keeps order of insertion
+    picked: Dict[int, None] = {}
+    for _ in range(includes_num):
+        if rng.random() < config["sharing"]:
+            picked[rng.randrange(common_start, headers_num)] = None
+        else:
+            low = max(layer_start, center - window)
+            high = min(layer_end, center + window + 1)
+            picked[rng.randrange(low, high)] = None
+    return list(picked.keys())
+
+
+def get_layer_range(headers_num, depth, layer) -> Tuple[int, int]:
+    ## first header of layer satisfies: header_id * depth // headers_num == layer
+    start = (layer * headers_num + depth - 1) // depth
+    end = ((layer + 1) * headers_num + depth - 1) // depth
+    return (start, end)
+
+
+def write_files_info(out_file, files_sizes: Dict[str, int]):
+    ## format of 'cppincludegraphdump'
+    for name, size in files_sizes.items():
+        out_file.write(f'"{name}" "{name}" {size}\n')
@@ -0,0 +1,348 @@
+/*
+ * Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+ * All rights reserved.
+ *
+ * This source code is licensed under the BSD 3-Clause license found in the
+ * LICENSE file in the root directory of this source tree.
+ */
+
+/*
+ * Client side viewer of include graph.
+ *
+ * Graph is loaded from 'graph_data.js' (global 'GRAPH_DATA' containing columns of node
+ * properties indexed by node id). Subgraph of selected node is extracted and laid out
+ * on demand, selected node is stored in URL hash.
+ */
+
+"use strict";
+
+(function () {
+    var data = GRAPH_DATA;
+    var nodesCount = data.name.length;
+
+    var LAYER_GAP = 60;
+    var NODE_HEIGHT = 24;
+    var ROW_HEIGHT = 40;
+    var CHAR_WIDTH = 7;
+    var TOP_LIST_SIZE = 100;
+    var SEARCH_LIMIT = 30;
+
+    var parents = [];
+    for (var i = 0; i < nodesCount; ++i) {
+        parents.push([]);
+    }
+    for (var nodeId = 0; nodeId < nodesCount; ++nodeId) {
+        data.children[nodeId].forEach(function (childId) {
+            parents[childId].push(nodeId);
+        });
+    }
+
+    // ================================================================
+
+    function sizeKb(value) {
+        return String(Math.round(value / 1024 * 100) / 100);
+    }
+
+    function escapeHtml(text) {
+        return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+    }
+
+    function baseName(path) {
+        var pos = path.lastIndexOf("/");
+        if (pos < 0) {
+            return path;
+        }
+        return path.substring(pos + 1);
+    }
+
+    function typeName(id) {
+        var typeId = data.type[id];
+        if (typeId < 0) {
+            return "";
+        }
+        return data.types[typeId];
+    }
+
+    function totalSize(id) {
+        return data.objects[id] * data.fsize[id];
+    }
+
+    function nodeLink(id) {
+        return '<a href="#' + id + '"><code>' + escapeHtml(data.label[id]) + "</code></a>";
+    }
+
+    function compareBySize(first, second) {
+        return data.ai_size[second] - data.ai_size[first] || first - second;
+    }
+
+    function renderTable(title, columns, rows) {
+        var html = ['<div class="info_content">', '<span style="font-weight: bold;">' + escapeHtml(title) + "</span>"];
+        html.push('<table class="alternate"><tr>');
+        columns.forEach(function (column) {
+            html.push("<th>" + escapeHtml(column) + "</th>");
+        });
+        html.push("</tr>");
+        rows.forEach(function (row) {
+            html.push("<tr><td>" + row.join("</td><td>") + "</td></tr>");
+        });
+        html.push("</table></div>");
+        return html.join("\n");
+    }
+
+    function nodesRows(nodesList) {
+        return nodesList.map(function (id) {
+            return [nodeLink(id), sizeKb(data.fsize[id]), sizeKb(data.ai_size[id]), data.objects[id]];
+        });
+    }
+
+    var NODES_COLUMNS = ["File:", "File size [kB]:", "Size with includes [kB]:", "Object files:"];
+
+    // ================================================================
+
+    // collect nodes closer than 'radius' to given node, bigger nodes are taken first
+    function collectSubgraph(startId, radius, maxNodes) {
+        var selected = {};
+        selected[startId] = true;
+        var count = 1;
+        var sides = [
+            { links: parents, front: [startId] },
+            { links: data.children, front: [startId] },
+        ];
+        for (var distance = 0; distance < radius; ++distance) {
+            sides.forEach(function (side) {
+                var nextFront = [];
+                side.front.forEach(function (id) {
+                    side.links[id].forEach(function (linkedId) {
+                        if (!selected[linkedId] && nextFront.indexOf(linkedId) < 0) {
+                            nextFront.push(linkedId);
+                        }
+                    });
+                });
+                nextFront.sort(compareBySize);
+                side.front = [];
+                nextFront.forEach(function (id) {
+                    if (count >= maxNodes) {
+                        return;
+                    }
+                    selected[id] = true;
+                    count += 1;
+                    side.front.push(id);
+                });
+            });
+        }
+        var nodesList = Object.keys(selected).map(Number);
+        // numbers of hidden includers and includes
+        var hidden = {};
+        nodesList.forEach(function (id) {
+            var hiddenParents = parents[id].filter(function (item) { return !selected[item]; }).length;
+            var hiddenChildren = data.children[id].filter(function (item) { return !selected[item]; }).length;
+            if (hiddenParents > 0 || hiddenChildren > 0) {
+                hidden[id] = [hiddenParents, hiddenChildren];
+            }
+        });
+        return { nodes: nodesList, selected: selected, hidden: hidden };
+    }
+
+    // layered layout: layer is length of longest path from top nodes, order in layer by barycenter
+    function layoutSubgraph(subgraph) {
+        var selected = subgraph.selected;
+        var layer = {};
+        var inDegree = {};
+        subgraph.nodes.forEach(function (id) {
+            layer[id] = 0;
+            inDegree[id] = parents[id].filter(function (item) { return selected[item] && item !== id; }).length;
+        });
+        var processed = {};
+        var processedCount = 0;
+        var queue = subgraph.nodes.filter(function (id) { return inDegree[id] === 0; });
+        while (processedCount < subgraph.nodes.length) {
+            if (queue.length < 1) {
+                // cycle -- release any unprocessed node
+                queue.push(subgraph.nodes.filter(function (id) { return !processed[id]; })[0]);
+            }
+            var current = queue.pop();
+            if (processed[current]) {
+                continue;
+            }
+            processed[current] = true;
+            processedCount += 1;
+            data.children[current].forEach(function (childId) {
+                if (!selected[childId] || processed[childId]) {
+                    return;
+                }
+                layer[childId] = Math.max(layer[childId], layer[current] + 1);
+                inDegree[childId] -= 1;
+                if (inDegree[childId] === 0) {
+                    queue.push(childId);
+                }
+            });
+        }
+
+        var layers = [];
+        subgraph.nodes.slice().sort(function (first, second) {
+            return data.label[first] < data.label[second] ? -1 : 1;
+        }).forEach(function (id) {
+            while (layers.length <= layer[id]) {
+                layers.push([]);
+            }
+            layers[layer[id]].push(id);
+        });
+
+        var order = {};
+        layers.forEach(function (layerNodes, layerIndex) {
+            if (layerIndex > 0) {
+                var barycenter = {};
+                layerNodes.forEach(function (id) {
+                    var positions = parents[id].filter(function (item) {
+                        return selected[item] && layer[item] < layerIndex;
+                    }).map(function (item) { return order[item]; });
+                    barycenter[id] = positions.length ? positions.reduce(function (a, b) { return a + b; }, 0) / positions.length : 0;
+                });
+                layerNodes.sort(function (first, second) { return barycenter[first] - barycenter[second]; });
+            }
+            layerNodes.forEach(function (id, index) {
+                order[id] = index;
+            });
+        });
+
+        var positions = {};
+        var posX = 10;
+        var height = 0;
+        layers.forEach(function (layerNodes) {
+            var layerWidth = 0;
+            layerNodes.forEach(function (id) {
+                layerWidth = Math.max(layerWidth, nodeWidth(id));
+            });
+            layerNodes.forEach(function (id, index) {
+                positions[id] = { x: posX, y: 10 + index * ROW_HEIGHT, width: layerWidth };
+                height = Math.max(height, 10 + index * ROW_HEIGHT + NODE_HEIGHT + 10);
+            });
+            posX += layerWidth + LAYER_GAP;
+        });
+        return { positions: positions, width: posX, height: height };
+    }
+
+    function nodeWidth(id) {
+        return baseName(data.name[id]).length * CHAR_WIDTH + 20;
+    }
+
+    function renderGraph(startId, subgraph) {
+        var layout = layoutSubgraph(subgraph);
+        var positions = layout.positions;
+        var svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="' + layout.width + '" height="' + layout.height + '">'];
+        svg.push('<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" orient="auto">');
+        svg.push('<path d="M 0 0 L 10 5 L 0 10 z"/></marker></defs>');
+        subgraph.nodes.forEach(function (id) {
+            var from = positions[id];
+            data.children[id].forEach(function (childId) {
+                var to = positions[childId];
+                if (!subgraph.selected[childId] || childId === id) {
+                    return;
+                }
+                svg.push('<line class="edge" x1="' + (from.x + from.width) + '" y1="' + (from.y + NODE_HEIGHT / 2) +
+                         '" x2="' + to.x + '" y2="' + (to.y + NODE_HEIGHT / 2) + '"/>');
+            });
+        });
+        subgraph.nodes.forEach(function (id) {
+            var pos = positions[id];
+            var nodeClass = "node";
+            if (id === startId) {
+                nodeClass += " selected";
+            } else if (parents[id].every(function (item) { return !subgraph.selected[item]; })) {
+                nodeClass += " top";
+            }
+            var title = data.label[id];
+            var hidden = subgraph.hidden[id];
+            if (hidden) {
+                title += "\n+" + hidden[0] + " more includers, +" + hidden[1] + " more includes";
+            }
+            svg.push('<a href="#' + id + '"><g class="' + nodeClass + '"><title>' + escapeHtml(title) + "</title>");
+            svg.push('<rect x="' + pos.x + '" y="' + pos.y + '" width="' + pos.width + '" height="' + NODE_HEIGHT + '"' +
+                     (hidden ? ' stroke-dasharray="4 2"' : "") + "/>");
+            svg.push('<text x="' + (pos.x + 10) + '" y="' + (pos.y + 16) + '">' + escapeHtml(baseName(data.name[id])) + "</text></g></a>");
+        });
+        svg.push("</svg>");
+        return svg.join("\n");
+    }
+
+    // ================================================================
+
+    function renderNode(id) {
+        var info = ['<div><span style="font-weight: bold;">' + escapeHtml(data.label[id]) + "</span></div><br />", "<table>"];
+        info.push("<tr><td>Type:</td><td>" + typeName(id) + "</td></tr>");
+        info.push("<tr><td>File size:</td><td>" + sizeKb(data.fsize[id]) + " kB</td></tr>");
+        info.push("<tr><td>Size with includes:</td><td>" + sizeKb(data.ai_size[id]) + " kB</td></tr>");
+        info.push("<tr><td>Exclusive size:</td><td>" + sizeKb(data.ex_size[id]) + " kB</td></tr>");
+        info.push("<tr><td>Object files:</td><td>" + data.objects[id] + "</td></tr>");
+        info.push("<tr><td>Total size:</td><td>" + sizeKb(totalSize(id)) + " kB</td></tr>");
+        info.push("</table>");
+        document.getElementById("info_section").innerHTML = info.join("\n");
+
+        var radius = Math.max(1, parseInt(document.getElementById("radius_input").value, 10) || 1);
+        var maxNodes = Math.max(1, parseInt(document.getElementById("max_nodes_input").value, 10) || 100);
+        var subgraph = collectSubgraph(id, radius, maxNodes);
+        document.getElementById("graph_section").innerHTML = renderGraph(id, subgraph);
+
+        var includers = parents[id].slice().sort(compareBySize);
+        var includes = data.children[id].slice().sort(compareBySize);
+        var lists = [];
+        lists.push(renderTable("Includers (sorted by size):", NODES_COLUMNS, nodesRows(includers)));
+        lists.push(renderTable("Direct includes (sorted by size):", NODES_COLUMNS, nodesRows(includes)));
+        document.getElementById("lists_section").innerHTML = lists.join("\n");
+    }
+
+    function renderMain() {
+        document.getElementById("info_section").innerHTML = '<span style="font-weight: bold;">Main graph</span>';
+        document.getElementById("graph_section").innerHTML = "";
+
+        var packagesRows = data.packages.map(function (id) {
+            return [nodeLink(id), sizeKb(data.dc_size[id])];
+        });
+        var headers = [];
+        for (var id = 0; id < nodesCount; ++id) {
+            if (typeName(id) === "HEADER") {
+                headers.push(id);
+            }
+        }
+        headers.sort(function (first, second) { return totalSize(second) - totalSize(first) || first - second; });
+        var headersRows = headers.slice(0, TOP_LIST_SIZE).map(function (id) {
+            return [nodeLink(id), data.objects[id], sizeKb(data.fsize[id]), sizeKb(data.ai_size[id]),
+                    sizeKb(data.ex_size[id]), sizeKb(totalSize(id))];
+        });
+        var lists = [];
+        lists.push(renderTable("Packages:", ["File:", "Object files size [kB]:"], packagesRows));
+        lists.push(renderTable("Top " + headersRows.length + " of " + headers.length + " headers (sorted by total size):",
+                               ["File:", "Object files:", "File size [kB]:", "Size with includes [kB]:",
+                                "Exclusive size [kB]:", "Total size [kB]:"], headersRows));
+        document.getElementById("lists_section").innerHTML = lists.join("\n");
+    }
+
+    function update() {
+        var id = parseInt(window.location.hash.substring(1), 10);
+        if (isNaN(id) || id < 0 || id >= nodesCount) {
+            renderMain();
+            return;
+        }
+        renderNode(id);
+        window.scrollTo(0, 0);
+    }
+
+    function search() {
+        var text = document.getElementById("search_input").value.toLowerCase();
+        var results = [];
+        if (text.length > 0) {
+            for (var id = 0; id < nodesCount && results.length < SEARCH_LIMIT; ++id) {
+                if (data.label[id].toLowerCase().indexOf(text) >= 0) {
+                    results.push("<div>" + nodeLink(id) + "</div>");
+                }
+            }
+        }
+        document.getElementById("search_results").innerHTML = results.join("\n");
+    }
+
+    window.addEventListener("hashchange", update);
+    document.getElementById("radius_input").addEventListener("change", update);
+    document.getElementById("max_nodes_input").addEventListener("change", update);
+    document.getElementById("search_input").addEventListener("input", search);
+    update();
+})();
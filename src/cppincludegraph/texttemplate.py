@@ -7,9 +7,7 @@
 
 import os
 import logging
-
-import texthon
-import texthon.parser
+from typing import Dict, Iterable, Tuple, Any
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,8 +15,22 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _LOGGER = logging.getLogger(__name__)
 
 
-## read content from file
-def generate(template_path, output_path, *args, **kwargs):
+## compiled template modules of current process (child processes inherit or compile their own)
+_MODULES_CACHE: Dict[str, Any] = {}
+
+
+## get compiled template module, template is parsed and compiled only once
+def get_module(template_path):
+    template_path = os.path.realpath(template_path)
+    module = _MODULES_CACHE.get(template_path)
+    if module is not None:
+        return module
+
+    ## imported on first use, so commands not rendering templates do not load the engine
+    import texthon  # pylint: disable=import-outside-toplevel
+    import texthon.parser  # pylint: disable=import-outside-toplevel
+
+    _LOGGER.debug("compiling template: %s", template_path)
     engine = texthon.Engine()
 
     parser = texthon.parser.Parser()
@@ -30,10 +42,35 @@ def generate(template_path, output_path, *args, **kwargs):
     engine.make()  # compile all modules
 
     module = engine.modules[module_id]
+    _MODULES_CACHE[template_path] = module
+    return module
+
+
+def clear_cache():
+    _MODULES_CACHE.clear()
+
+
+## render template to string
+def render(template_path, *args, **kwargs) -> str:
+    module = get_module(template_path)
 
     # call the template function named 'main'
-    script_content = module.main(*args, **kwargs)
+    return module.main(*args, **kwargs)
+
+
+## read content from file
+def generate(template_path, output_path, *args, **kwargs):
+    script_content = render(template_path, *args, **kwargs)
 
     ### === writing to file ===
     with open(output_path, "w", encoding="utf-8") as out_file:
         out_file.write(script_content)
+
+
+## render and write multiple files, items are pairs (output path, template kwargs)
+def generate_batch(template_path, items: Iterable[Tuple[str, Dict[str, Any]]]):
+    module = get_module(template_path)
+    for output_path, kwargs in items:
+        script_content = module.main(**kwargs)
+        with open(output_path, "w", encoding="utf-8") as out_file:
+            out_file.write(script_content)
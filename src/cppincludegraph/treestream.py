@@ -0,0 +1,73 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Streaming of raw include trees of object files as JSON Lines.
+##
+## Every object file is written as single line as soon as its include tree is read from
+## log, so neither graph is built nor file sizes are read and memory usage does not depend
+## on size of logs.
+##
+
+import os
+import json
+import logging
+from typing import List, Dict, Any
+
+from cppincludegraph.includegraph import GraphNode
+from cppincludegraph.logparser import iterate_build_log_file
+
+
+_LOGGER = logging.getLogger(__name__)
+
+TREE_FORMATS = ["nested", "flat"]
+
+
+def write_include_trees(log_files_list, build_dir, out_file, build_regex=None, tree_format="nested") -> int:
+    """Write include trees of object files of given logs, return number of written object files."""
+    if tree_format not in TREE_FORMATS:
+        raise ValueError(f"invalid tree format: {tree_format}")
+    objects_counter = 0
+    for log_path in log_files_list:
+        if not os.path.isfile(log_path):
+            _LOGGER.warning("unable to read file: %s", log_path)
+            continue
+        _LOGGER.info("streaming log file: %s", log_path)
+        try:
+            for obj_node in iterate_build_log_file(log_path, build_dir, build_regex):
+                tree_dict = get_tree_dict(obj_node, tree_format)
+                tree_dict["log"] = log_path
+                out_file.write(json.dumps(tree_dict) + "\n")
+                objects_counter += 1
+        except UnicodeDecodeError as exc:
+            _LOGGER.error("unable to decode file %s: %s", log_path, exc)
+        except ValueError:
+            ## error already logged, object files read before error are already written
+            pass
+    return objects_counter
+
+
+## 'nested' tree holds lists of children, 'flat' tree holds unique headers in order of first include
+def get_tree_dict(obj_node: GraphNode, tree_format="nested") -> Dict[str, Any]:
+    if tree_format == "flat":
+        return {"object": obj_node.data.name, "includes": get_flat_includes(obj_node)}
+    return {"object": obj_node.data.name, "includes": [get_nested_includes(child) for child in obj_node.children]}
+
+
+def get_nested_includes(node: GraphNode) -> Dict[str, Any]:
+    return {"name": node.data.name, "includes": [get_nested_includes(child) for child in node.children]}
+
+
+def get_flat_includes(obj_node: GraphNode) -> List[str]:
+    ## dict keeps order of insertion
+    names_dict: Dict[str, None] = {}
+    stack = list(reversed(obj_node.children))
+    while stack:
+        node = stack.pop()
+        names_dict[node.data.name] = None
+        stack.extend(reversed(node.children))
+    return list(names_dict.keys())
@@ -0,0 +1,87 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Client side viewer of include graph.
+##
+## Graph is written once as single compact data file (columns of node properties and adjacency
+## lists indexed by node id). Static HTML/JS viewer loads the file, extracts subgraph of selected
+## node and lays it out in browser, so no graph is rendered during generation.
+##
+## Data is stored as JSON assigned to global variable, so viewer works also from local
+## filesystem (browsers block loading of plain JSON files through 'file://').
+##
+
+import os
+import json
+import shutil
+import logging
+from typing import List, Dict, Any
+
+from cppincludegraph.includegraph import IncludeGraph, CompactGraph
+from cppincludegraph.rendercache import write_file_if_changed
+
+
+_LOGGER = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+VIEWER_DIR = os.path.join(SCRIPT_DIR, "template", "viewer")
+VIEWER_FILES = ["index.html", "viewer.js"]
+
+DATA_FILE_NAME = "graph_data.js"
+DATA_VERSION = 1
+
+TYPES_LIST = ["PACKAGE", "OBJ_FILE", "HEADER"]
+
+
+##
+def generate_viewer(build_tree: IncludeGraph, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for file_name in VIEWER_FILES:
+        shutil.copyfile(os.path.join(VIEWER_DIR, file_name), os.path.join(out_dir, file_name))
+    data_path = os.path.join(out_dir, DATA_FILE_NAME)
+    write_graph_data(build_tree, data_path)
+    _LOGGER.info("viewer written to: file://%s", os.path.join(out_dir, "index.html"))
+
+
+def write_graph_data(build_tree: IncludeGraph, out_path):
+    graph_data = get_graph_data(build_tree)
+    content = "var GRAPH_DATA = " + json.dumps(graph_data, separators=(",", ":")) + ";\n"
+    if write_file_if_changed(out_path, content):
+        _LOGGER.info("writing graph data: %s", out_path)
+    else:
+        _LOGGER.info("graph data unchanged: %s", out_path)
+
+
+def get_graph_data(build_tree: IncludeGraph) -> Dict[str, Any]:
+    """Return graph as dict of columns indexed by node id (nodes are sorted by name)."""
+    nodes_list = sorted(build_tree.root.data.all_children, key=lambda item: item.data.name)
+    compact_graph = CompactGraph(nodes_list)
+    index = compact_graph.index
+
+    graph_data: Dict[str, Any] = {"version": DATA_VERSION, "types": TYPES_LIST}
+    graph_data["name"] = [node.data.name for node in nodes_list]
+    graph_data["label"] = [node.data.label for node in nodes_list]
+    graph_data["type"] = [get_type_id(node.data.getTypeName()) for node in nodes_list]
+    graph_data["fsize"] = [node.data.fsize for node in nodes_list]
+    graph_data["dc_size"] = [node.data.dc_size for node in nodes_list]
+    graph_data["ai_size"] = [node.data.ai_size for node in nodes_list]
+    graph_data["ex_size"] = [node.data.ex_size for node in nodes_list]
+    ## number of object files including node
+    graph_data["objects"] = [len(node.data.all_obj_files or []) for node in nodes_list]
+    graph_data["children"] = compact_graph.children
+    packages_list: List[int] = [index[node] for node in build_tree.getPackageNodes() if node in index]
+    graph_data["packages"] = sorted(packages_list)
+    return graph_data
+
+
+def get_type_id(type_name) -> int:
+    try:
+        return TYPES_LIST.index(type_name)
+    except ValueError:
+        return -1
@@ -0,0 +1,83 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Simulation of include changes on already built graph.
+##
+
+import logging
+import time
+from typing import List, Tuple
+
+from cppincludegraph.includegraph import GraphNode, NodeData, IncludeGraph
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SimulationResult:
+    """Result of include changes simulation."""
+
+    def __init__(self):
+        self.size_delta: int = 0  ## change of summed 'ai_size' of all object files (in bytes)
+        self.objects_count: int = 0  ## number of affected object files
+        self.updated_nodes: int = 0  ## number of nodes with recalculated data
+        self.elapsed_ms: float = 0.0  ## simulation time in milliseconds
+
+    def getSizeDeltaKB(self):
+        return round(self.size_delta / 1024, 2)
+
+    def __str__(self):
+        return (
+            f"total size change: {self.getSizeDeltaKB()} kB, affected object files: {self.objects_count},"
+            f" updated nodes: {self.updated_nodes}, time: {round(self.elapsed_ms, 3)} ms"
+        )
+
+
+def simulate_include_changes(
+    build_tree: IncludeGraph,
+    removed_includes: List[Tuple[str, str]] = None,
+    added_includes: List[Tuple[str, str]] = None,
+) -> SimulationResult:
+    """Apply (includer, included) changes to graph in place and return change of include sizes.
+
+    Changes can be reverted by simulating opposite changes.
+    """
+    start_time = time.perf_counter()
+
+    removed_edges = get_edges(build_tree, removed_includes)
+    added_edges = get_edges(build_tree, added_includes)
+    for parent, child in removed_edges:
+        if child not in parent.children:
+            _LOGGER.warning("include does not exist: %s -> %s", parent.data.name, child.data.name)
+
+    graph_change = build_tree.updateEdges(added_edges, removed_edges)
+
+    result = SimulationResult()
+    for node, old_ai_size in graph_change.old_ai_size.items():
+        if node.data.type is not NodeData.NodeType.OBJ_FILE:
+            continue
+        result.size_delta += node.data.ai_size - old_ai_size
+        result.objects_count += 1
+    result.updated_nodes = len(graph_change.ancestors | graph_change.descendants)
+    result.elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+    return result
+
+
+def get_edges(build_tree: IncludeGraph, includes_list: List[Tuple[str, str]]) -> List[Tuple[GraphNode, GraphNode]]:
+    if not includes_list:
+        return []
+    ret_list = []
+    for parent_name, child_name in includes_list:
+        parent = build_tree.findNode(parent_name)
+        if parent is None:
+            raise ValueError(f"unable to find node: {parent_name}")
+        child = build_tree.findNode(child_name)
+        if child is None:
+            raise ValueError(f"unable to find node: {child_name}")
+        ret_list.append((parent, child))
+    return ret_list
@@ -20,7 +20,7 @@ def read_list(file_path):
 
 packages_list = find_packages(include=["cppincludegraph", "cppincludegraph.*"])
 
-packages_data = {"cppincludegraph": ["template/*.tmpl"]}
+packages_data = {"cppincludegraph": ["template/*.tmpl", "template/viewer/*"]}
 
 ## additional scripts to install
 additional_scripts = ["cppincludegraphdump", "cppincludegraphgen"]
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+##
+## Scaling benchmark of main processing stages on synthetic build logs.
+##
+## For every scale (number of object files) log is generated and following stages are timed:
+## reading log ('read_build_log_file'), merging trees ('GraphBuilder.addTree'), calculating
+## graph ('IncludeGraph') and generating pages ('generate_graph_pages'). Results are appended
+## to JSON history file, so they can be tracked over time. Run fails (exit code 2) if stage is
+## slower than in previous run with the same configuration by more than '--fail_ratio' or if
+## its time grows faster than '--max_exponent' power of size of log.
+##
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import datetime
+import platform
+import tempfile
+from typing import List, Dict, Any
+
+from cppincludegraph.includegraph import GraphNode, NodeData, IncludeGraph
+from cppincludegraph.logparser import GraphBuilder, read_build_log_file, read_files_info
+from cppincludegraph.generator import generate_graph_pages, get_graph_config
+from cppincludegraph.synthlog import generate_build_files, get_synth_config, get_build_dir, DEFAULT_SYNTH_CONFIG
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+STAGES = ["read_log", "add_tree", "include_graph", "graph_pages"]
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+
+
+def run_benchmark(work_dir, synth_config, pages=True, jobs=1) -> Dict[str, Any]:
+    config = get_synth_config(synth_config)
+    log_path, info_path = generate_build_files(work_dir, config)
+    build_dir = get_build_dir(config)
+    files_info_dict = read_files_info(info_path)
+    times_dict: Dict[str, float] = {}
+
+    start_time = time.perf_counter()
+    obj_files_list = read_build_log_file(log_path, build_dir)
+    times_dict["read_log"] = time.perf_counter() - start_time
+
+    ## the same as in 'read_build_logs'
+    package_node = GraphNode()
+    package_node.data.name = os.path.basename(build_dir)
+    package_node.data.type = NodeData.NodeType.PACKAGE
+    package_node.addChildren(obj_files_list)
+    graph_builder = GraphBuilder(files_info_dict)
+    start_time = time.perf_counter()
+    graph_builder.addTree(package_node)
+    times_dict["add_tree"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    build_tree = IncludeGraph(graph_builder.build_list)
+    times_dict["include_graph"] = time.perf_counter() - start_time
+
+    if pages:
+        pages_dir = os.path.join(work_dir, "pages")
+        os.makedirs(pages_dir, exist_ok=True)
+        start_time = time.perf_counter()
+        generate_graph_pages(build_tree, {}, get_graph_config(), pages_dir, {"jobs": jobs})
+        times_dict["graph_pages"] = time.perf_counter() - start_time
+
+    return {
+        "objects": config["objects"],
+        "headers": config["headers"],
+        "log_size": os.path.getsize(log_path),
+        "nodes": len(build_tree.root.data.all_children),
+        "times": times_dict,
+    }
+
+
+## exponent of growth of stage time relative to size of log between subsequent scales (1.0 means linear)
+def calculate_exponents(results_list: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    exponents_dict: Dict[str, List[float]] = {}
+    for prev_result, next_result in zip(results_list, results_list[1:]):
+        size_ratio = next_result["log_size"] / prev_result["log_size"]
+        for stage in STAGES:
+            prev_time = prev_result["times"].get(stage)
+            next_time = next_result["times"].get(stage)
+            if not prev_time or not next_time or size_ratio <= 1.0:
+                continue
+            exponent = math.log(next_time / prev_time) / math.log(size_ratio)
+            exponents_dict.setdefault(stage, []).append(round(exponent, 3))
+    return exponents_dict
+
+
+## return list of messages about regressions
+def check_regressions(run_dict, history_list, fail_ratio=None, max_exponent=None) -> List[str]:
+    messages_list = []
+    if max_exponent is not None:
+        for stage, exponents_list in run_dict["exponents"].items():
+            for exponent in exponents_list:
+                if exponent > max_exponent:
+                    messages_list.append(f"stage {stage} grows with exponent {exponent} (limit: {max_exponent})")
+    if fail_ratio is not None:
+        prev_runs = [item for item in history_list if item.get("config") == run_dict["config"]]
+        if prev_runs:
+            prev_results = {result["objects"]: result for result in prev_runs[-1]["results"]}
+            for result in run_dict["results"]:
+                prev_result = prev_results.get(result["objects"])
+                if prev_result is None:
+                    continue
+                for stage, stage_time in result["times"].items():
+                    prev_time = prev_result["times"].get(stage)
+                    if prev_time and stage_time > prev_time * fail_ratio:
+                        messages_list.append(
+                            f"stage {stage} for {result['objects']} objects: {stage_time:.3f}s,"
+                            f" previously: {prev_time:.3f}s"
+                        )
+    return messages_list
+
+
+def load_history(history_path) -> List[Dict[str, Any]]:
+    if not history_path or not os.path.isfile(history_path):
+        return []
+    with open(history_path, "r", encoding="utf-8") as history_file:
+        return json.load(history_file)
+
+
+def print_results(run_dict):
+    print(f"{'objects':>8} {'headers':>8} {'nodes':>8} {'log [MB]':>9}" + "".join(f" {stage:>14}" for stage in STAGES))
+    for result in run_dict["results"]:
+        times_dict = result["times"]
+        times_list = [f"{times_dict[stage]:.3f}" if stage in times_dict else "-" for stage in STAGES]
+        print(
+            f"{result['objects']:>8} {result['headers']:>8} {result['nodes']:>8}"
+            f" {result['log_size'] / 1024 / 1024:>9.2f}" + "".join(f" {item:>14}" for item in times_list)
+        )
+    for stage, exponents_list in run_dict["exponents"].items():
+        print(f"growth exponent of {stage}: {exponents_list}")
+
+
+## ============================= main section ===================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic build logs")
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        action="store",
+        required=False,
+        default=DEFAULT_SCALES,
+        help="Numbers of object files of generated logs",
+    )
+    parser.add_argument(
+        "--pages_max_objects",
+        type=int,
+        action="store",
+        required=False,
+        default=1000,
+        help="Generate pages only for logs with given maximum number of object files (rendering is slow)",
+    )
+    parser.add_argument("--jobs", type=int, action="store", required=False, default=1, help="Jobs of pages generation")
+    for key in ["fanout", "depth", "seed"]:
+        parser.add_argument(
+            f"--{key}",
+            type=int,
+            action="store",
+            required=False,
+            default=DEFAULT_SYNTH_CONFIG[key],
+            help="Log parameter",
+        )
+    for key in ["sharing", "cycles"]:
+        parser.add_argument(
+            f"--{key}",
+            type=float,
+            action="store",
+            required=False,
+            default=DEFAULT_SYNTH_CONFIG[key],
+            help="Log parameter",
+        )
+    parser.add_argument(
+        "--work_dir",
+        action="store",
+        required=False,
+        default="",
+        help="Directory for generated logs and pages (if not given, then temporary directory is used)",
+    )
+    parser.add_argument(
+        "--out_json", action="store", required=False, default="", help="History file, results are appended to it"
+    )
+    parser.add_argument(
+        "--fail_ratio",
+        type=float,
+        action="store",
+        required=False,
+        default=None,
+        help="Fail if stage is slower than in previous run by given ratio (e.g. 1.5)",
+    )
+    parser.add_argument(
+        "--max_exponent",
+        type=float,
+        action="store",
+        required=False,
+        default=None,
+        help="Fail if time of stage grows faster than given power of size of log (e.g. 1.3)",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    if args.logall is True:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    config = {key: getattr(args, key) for key in ["fanout", "depth", "sharing", "cycles", "seed"]}
+    results_list = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = args.work_dir or tmp_dir
+        for objects_num in sorted(args.scales):
+            print(f"running benchmark for {objects_num} object files", file=sys.stderr)
+            scale_config = dict(config, objects=objects_num)
+            scale_dir = os.path.join(work_dir, f"objects_{objects_num}")
+            pages = objects_num <= args.pages_max_objects
+            results_list.append(run_benchmark(scale_dir, scale_config, pages, args.jobs))
+
+    run_dict = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results_list,
+        "exponents": calculate_exponents(results_list),
+    }
+    print_results(run_dict)
+
+    history_list = load_history(args.out_json)
+    messages_list = check_regressions(run_dict, history_list, args.fail_ratio, args.max_exponent)
+    if args.out_json:
+        history_list.append(run_dict)
+        with open(args.out_json, "w", encoding="utf-8") as history_file:
+            json.dump(history_list, history_file, indent=4)
+            history_file.write("\n")
+
+    for message in messages_list:
+        _LOGGER.error("regression: %s", message)
+    if messages_list:
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from testcppincludegraph import get_data_path
+
+from cppincludegraph.includegraph import IncludeGraph
+from cppincludegraph.logparser import read_files_info, read_build_logs
+from cppincludegraph.dircollapse import collapse_directories, get_collapse_dir
+
+
+BUILD_DIR = "/proj/build"
+
+
+class DirCollapseTest(unittest.TestCase):
+    def test_collapse_dirs(self):
+        files_info_dict = read_files_info(get_data_path("files_info.txt"))
+        graph_list = read_build_logs([get_data_path("build_log.txt")], BUILD_DIR, files_info_dict)
+        dir_nodes = collapse_directories(graph_list, ["/proj/include/"])
+        self.assertEqual(["/proj/include"], list(dir_nodes.keys()))
+        build_tree = IncludeGraph(graph_list)
+
+        self.assertIsNone(build_tree.findNode("/proj/include/a.h"))
+        dir_node = build_tree.getNode("/proj/include")
+        self.assertEqual(100 + 200 + 300 + 400 + 500, dir_node.data.fsize)
+        self.assertEqual([], dir_node.children)
+        self.assertEqual(2, len(dir_node.parents))
+
+        util_node = build_tree.getNode(BUILD_DIR + "/CMakeFiles/app.dir/util.cpp.o")
+        self.assertEqual([dir_node], util_node.children)
+        self.assertEqual(2000 + 1500, util_node.data.ai_size)
+
+    def test_collapse_dir_depth(self):
+        self.assertEqual("/usr/include", get_collapse_dir("/usr/include/boost/any.hpp", collapse_depth=2))
+        self.assertEqual("/usr/include", get_collapse_dir("/usr/include/stdio.h", collapse_depth=3))
+        self.assertEqual("/proj/src/core", get_collapse_dir("/proj/src/core/a/b.h", collapse_depth=2, base_dir="/proj"))
+        self.assertEqual("/opt", get_collapse_dir("/opt/lib/x.h", ["/opt"], collapse_depth=2, base_dir="/proj"))
+        self.assertIsNone(get_collapse_dir("/proj/a.h", collapse_depth=2, base_dir="/proj"))
+        self.assertIsNone(get_collapse_dir("/proj/src/a.h", ["/opt"]))
@@ -0,0 +1,39 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from cppincludegraph.dominator import calculate_dominators, calculate_exclusive_sizes, aggregate_exclusive_sizes
+
+
+class DominatorTest(unittest.TestCase):
+    def test_dominators_diamond(self):
+        ## 0 -> 1 -> 3, 0 -> 2 -> 3, 3 -> 4
+        children = [[1, 2], [3], [3], [4], []]
+        order, idom = calculate_dominators(children, 0)
+        dominators = {order[pos]: order[idom[pos]] for pos in range(len(order))}
+        self.assertEqual({0: 0, 1: 0, 2: 0, 3: 0, 4: 3}, dominators)
+
+    def test_dominators_cycle(self):
+        ## 0 -> 1 -> 2 -> 1, 2 -> 3
+        children = [[1], [2], [1, 3], []]
+        order, idom = calculate_dominators(children, 0)
+        dominators = {order[pos]: order[idom[pos]] for pos in range(len(order))}
+        self.assertEqual({0: 0, 1: 0, 2: 1, 3: 2}, dominators)
+
+    def test_exclusive_sizes(self):
+        children = [[1, 2], [3], [3], [4], [], []]
+        sizes = [1, 10, 20, 30, 40, 50]
+        order, exclusive = calculate_exclusive_sizes(children, sizes, 0)
+        exclusive_dict = dict(zip(order, exclusive))
+        self.assertEqual({0: 101, 1: 10, 2: 20, 3: 70, 4: 40}, exclusive_dict)
+
+    def test_aggregate_exclusive_sizes(self):
+        children = [[2], [2, 3], [3], []]
+        sizes = [1, 1, 10, 100]
+        ex_sizes = aggregate_exclusive_sizes(children, sizes, [0, 1])
+        self.assertEqual([0, 0, 110 + 10, 100 + 100], ex_sizes)
@@ -0,0 +1,66 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.dotwriter import DotGraph, set_node_style, quote
+from cppincludegraph.generator import generate_dot_graph2, get_graph_config
+
+
+class DotGraphTest(unittest.TestCase):
+    def test_to_string(self):
+        graph = DotGraph("graph_name")
+        graph.set("rankdir", "LR")
+        node = graph.addNode("a", shape="box", label='a "quoted"')
+        self.assertIsNone(graph.addNode("a"))
+        graph.addNode("b")
+        graph.addEdge("a", "b")
+        set_node_style(node, {"style": "filled"})
+        graph.setNodesRank(graph.getNodesTop(), "min")
+
+        content = graph.toString()
+        expected = """digraph "graph_name" {
+rankdir="LR";
+"a" [shape="box", label="a \\"quoted\\"", style="filled"];
+"b";
+"a" -> "b";
+{rank="min"; "a";}
+}
+"""
+        self.assertEqual(expected, content)
+
+    def test_quote(self):
+        self.assertEqual('"a.h"', quote("a.h"))
+        self.assertEqual('"a \\"b\\""', quote('a "b"'))
+        self.assertEqual('"C:\\\\dir\\\\a.h"', quote("C:\\dir\\a.h"))
+        ## backslash in value does not escape following quote
+        self.assertEqual('"dir\\\\\\""', quote('dir\\"'))
+
+    def test_include_graph(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        c_node = build_tree.getNode("/proj/include/c.h")
+        graph = generate_dot_graph2(build_tree, [c_node], "/out")
+
+        labels = sorted(item.get("label") for item in graph.nodes.values())
+        self.assertEqual(["a.h", "b.h", "build", "c.h", "d.h", "main.cpp.o", "util.cpp.o"], labels)
+        self.assertIn(("/proj/include/c.h", "/proj/include/d.h"), graph.edges)
+        self.assertEqual("red", graph.getNode("/proj/include/c.h").get("fillcolor"))
+        self.assertEqual("yellow", graph.getNode("build").get("fillcolor"))
+
+    def test_include_graph_bounded(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        c_node = build_tree.getNode("/proj/include/c.h")
+        graph = generate_dot_graph2(build_tree, [c_node], "/out", get_graph_config(graph_max_nodes=2))
+
+        self.assertEqual("+2 more includers", graph.getNode("/proj/include/b.h#includers").get("label"))
+        self.assertEqual("+1 more includes", graph.getNode("/proj/include/c.h#includes").get("label"))
+        self.assertIn(("/proj/include/c.h", "/proj/include/c.h#includes"), graph.edges)
+        self.assertEqual("yellow", graph.getNode("/proj/include/b.h").get("fillcolor"))
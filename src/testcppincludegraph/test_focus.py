@@ -0,0 +1,57 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.pagewriter import PageIndex
+from cppincludegraph.focus import select_focus_nodes
+
+
+def get_names(nodes_set):
+    return sorted(node.data.name for node in nodes_set)
+
+
+class FocusTest(unittest.TestCase):
+    def test_no_selector(self):
+        build_tree = load_graph()
+        self.assertIsNone(select_focus_nodes(build_tree, None))
+        self.assertIsNone(select_focus_nodes(build_tree, {"hops": 2}))
+
+    def test_names(self):
+        build_tree = load_graph()
+        focus_nodes = select_focus_nodes(build_tree, {"names": ["*/a.h", "*/e.*"]})
+        self.assertEqual(["/proj/include/a.h", "/proj/include/e.h"], get_names(focus_nodes))
+        focus_nodes = select_focus_nodes(build_tree, {"regex": r"[cd]\.h$"})
+        self.assertEqual(["/proj/include/c.h", "/proj/include/d.h"], get_names(focus_nodes))
+
+    def test_top(self):
+        build_tree = load_graph()
+        focus_nodes = select_focus_nodes(build_tree, {"top": 2})
+        self.assertEqual(["/proj/include/a.h", "/proj/include/b.h"], get_names(focus_nodes))
+        focus_nodes = select_focus_nodes(build_tree, {"top": 2, "top_order": "objects"})
+        self.assertEqual(["/proj/include/b.h", "/proj/include/c.h"], get_names(focus_nodes))
+
+    def test_packages_hops(self):
+        build_tree = load_graph()
+        focus_nodes = select_focus_nodes(build_tree, {"packages": ["build"]})
+        self.assertEqual(
+            ["/proj/build/CMakeFiles/app.dir/main.cpp.o", "/proj/build/CMakeFiles/app.dir/util.cpp.o", "build"],
+            get_names(focus_nodes),
+        )
+        focus_nodes = select_focus_nodes(build_tree, {"names": ["/proj/include/a.h"], "hops": 1})
+        self.assertEqual(
+            ["/proj/build/CMakeFiles/app.dir/main.cpp.o", "/proj/include/a.h", "/proj/include/c.h"],
+            get_names(focus_nodes),
+        )
+
+    def test_page_links(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        page_index = PageIndex(build_tree, "/out", {"/proj/include/a.h"})
+        self.assertEqual(["/proj/include/a.h"], get_names(page_index.links))
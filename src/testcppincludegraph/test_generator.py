@@ -0,0 +1,31 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import gzip
+import unittest
+import tempfile
+
+from cppincludegraph.generator import write_svg_file
+
+
+class GeneratorTest(unittest.TestCase):
+    def test_write_svg_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            svg_path = write_svg_file("<svg>a</svg>", tmp_dir)
+            self.assertEqual(svg_path, write_svg_file("<svg>a</svg>", tmp_dir))
+            self.assertNotEqual(svg_path, write_svg_file("<svg>b</svg>", tmp_dir))
+            self.assertEqual(2, len(os.listdir(tmp_dir)))
+            with open(svg_path, encoding="utf-8") as svg_file:
+                self.assertEqual("<svg>a</svg>", svg_file.read())
+
+            svgz_path = write_svg_file("<svg>a</svg>", tmp_dir, compress=True)
+            self.assertTrue(svgz_path.endswith(".svgz"))
+            with open(svgz_path, "rb") as svgz_file:
+                svgz_data = svgz_file.read()
+            self.assertEqual(b"<svg>a</svg>", gzip.decompress(svgz_data))
+            self.assertEqual(svgz_data, gzip.compress(b"<svg>a</svg>", mtime=0))
@@ -0,0 +1,56 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.graphstore import save_graph
+from cppincludegraph.graphdiff import summarize_graph, summarize_graph_file, diff_graphs
+from cppincludegraph.whatif import simulate_include_changes
+
+
+class GraphDiffTest(unittest.TestCase):
+    def test_summary_file(self):
+        build_tree = load_graph()
+        summary = summarize_graph(build_tree)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph_path = os.path.join(tmp_dir, "graph.bin")
+            save_graph(build_tree, graph_path)
+            file_summary = summarize_graph_file(graph_path)
+        self.assertEqual(summary.nodes, file_summary.nodes)
+        self.assertEqual(summary.edges, file_summary.edges)
+
+    def test_diff_same(self):
+        summary = summarize_graph(load_graph())
+        graph_diff = diff_graphs(summary, summary)
+        self.assertEqual(0, graph_diff.getTotalSizeDelta())
+        self.assertEqual([], graph_diff.added_edges)
+        self.assertEqual([], graph_diff.removed_edges)
+        self.assertEqual([], graph_diff.nodes_diff)
+
+    def test_diff_removed_include(self):
+        build_tree = load_graph()
+        old_summary = summarize_graph(build_tree)
+        simulate_include_changes(build_tree, removed_includes=[("b.h", "c.h")])
+        new_summary = summarize_graph(build_tree)
+
+        graph_diff = diff_graphs(old_summary, new_summary)
+        self.assertEqual(-(300 + 400), graph_diff.getTotalSizeDelta())
+        self.assertEqual([("/proj/include/b.h", "/proj/include/c.h")], graph_diff.removed_edges)
+        self.assertEqual([], graph_diff.added_edges)
+        self.assertEqual([], graph_diff.added_nodes)
+
+        ## improvements are placed at the end
+        last_item = graph_diff.nodes_diff[-1]
+        self.assertEqual("/proj/include/b.h", last_item.label)
+        self.assertEqual(-(300 + 400), last_item.getSizeDelta())
+        self.assertEqual(0, last_item.getObjectsDelta())
+        c_item = [item for item in graph_diff.nodes_diff if item.label == "/proj/include/c.h"][0]
+        self.assertEqual(-1, c_item.getObjectsDelta())
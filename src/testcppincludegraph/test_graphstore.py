@@ -0,0 +1,53 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.graphstore import save_graph, load_graph as load_graph_file
+
+
+def get_state(build_tree):
+    ret_dict = {}
+    for node in [build_tree.root] + list(build_tree.root.data.all_children):
+        data = node.data
+        ret_dict[data.name] = (
+            data.label,
+            data.type,
+            data.fsize,
+            data.dc_size,
+            data.ai_size,
+            data.ex_size,
+            data.href,
+            [child.data.name for child in node.children],
+            sorted(parent.data.name for parent in node.parents),
+            sorted(child.data.name for child in data.all_children),
+            sorted(obj.data.name for obj in data.all_obj_files or []),
+            dict(data.include_counter),
+        )
+    return ret_dict
+
+
+class GraphStoreTest(unittest.TestCase):
+    def test_save_load(self):
+        build_tree = load_graph()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph_path = os.path.join(tmp_dir, "graph.bin")
+            save_graph(build_tree, graph_path)
+            loaded_tree = load_graph_file(graph_path)
+        self.assertEqual(get_state(build_tree), get_state(loaded_tree))
+        self.assertEqual(build_tree.nodes_dict.keys(), loaded_tree.nodes_dict.keys())
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph_path = os.path.join(tmp_dir, "graph.bin")
+            with open(graph_path, "wb") as graph_file:
+                graph_file.write(b"invalid content")
+            self.assertRaises(ValueError, load_graph_file, graph_path)
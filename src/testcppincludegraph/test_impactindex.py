@@ -0,0 +1,58 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import io
+import unittest
+import tempfile
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.impactindex import build_impact_index, save_impact_index, load_impact_index, write_impact
+
+
+MAIN_OBJ = "/proj/build/CMakeFiles/app.dir/main.cpp.o"
+UTIL_OBJ = "/proj/build/CMakeFiles/app.dir/util.cpp.o"
+
+
+class ImpactIndexTest(unittest.TestCase):
+    def test_getImpact(self):
+        build_tree = load_graph()
+        index = build_impact_index(build_tree)
+
+        impact = index.getImpact(["include/a.h"])
+        self.assertEqual([MAIN_OBJ], impact["objects"])
+        self.assertEqual(["build"], impact["packages"])
+        self.assertEqual(build_tree.getNode(MAIN_OBJ).data.ai_size, impact["total_size"])
+
+        impact = index.getImpact(["/proj/include/d.h", "app.dir/main.cpp", "src/missing.h", "clude/e.h"])
+        self.assertEqual([MAIN_OBJ, UTIL_OBJ], impact["objects"])
+        self.assertEqual(["src/missing.h", "clude/e.h"], impact["unmatched_files"])
+        self.assertEqual(4, impact["changed_files"])
+
+        ## source file rebuilds only its object file
+        impact = index.getImpact(["./CMakeFiles/app.dir/util.cpp"])
+        self.assertEqual([UTIL_OBJ], impact["objects"])
+
+    def test_save_load(self):
+        index = build_impact_index(load_graph())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path = os.path.join(tmp_dir, "impact.bin")
+            save_impact_index(index, index_path)
+            loaded_index = load_impact_index(index_path)
+        changed_list = ["b.h", "c.h", "main.cpp"]
+        self.assertEqual(index.getImpact(changed_list), loaded_index.getImpact(changed_list))
+        self.assertEqual(index.files_names, loaded_index.files_names)
+
+    def test_write_impact(self):
+        impact = build_impact_index(load_graph()).getImpact(["e.h"])
+        out_file = io.StringIO()
+        write_impact(impact, out_file, "list")
+        self.assertEqual(f"{MAIN_OBJ}\n{UTIL_OBJ}\n", out_file.getvalue())
+        out_file = io.StringIO()
+        write_impact(impact, out_file, "text")
+        self.assertIn("Affected object files: 2\n", out_file.getvalue())
@@ -0,0 +1,122 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from testcppincludegraph import get_data_path
+
+from cppincludegraph.includegraph import IncludeGraph
+from cppincludegraph.logparser import read_files_info, read_build_logs
+from cppincludegraph.whatif import simulate_include_changes
+
+
+BUILD_DIR = "/proj/build"
+
+
+def load_graph() -> IncludeGraph:
+    files_info_dict = read_files_info(get_data_path("files_info.txt"))
+    graph_list = read_build_logs([get_data_path("build_log.txt")], BUILD_DIR, files_info_dict)
+    return IncludeGraph(graph_list)
+
+
+class IncludeGraphTest(unittest.TestCase):
+    def test_sizes(self):
+        build_tree = load_graph()
+        self.assertEqual(100 + 300 + 400, build_tree.getNode("/proj/include/a.h").data.ai_size)
+        self.assertEqual(200 + 300 + 400 + 500, build_tree.getNode("/proj/include/b.h").data.ai_size)
+
+    def test_exclusive_sizes(self):
+        build_tree = load_graph()
+        ex_sizes = {name: build_tree.getNode(name).data.ex_size for name in build_tree.nodes_dict}
+        self.assertEqual(100, ex_sizes["/proj/include/a.h"])
+        self.assertEqual(700 + 1400, ex_sizes["/proj/include/b.h"])
+        self.assertEqual(700 + 700, ex_sizes["/proj/include/c.h"])
+        self.assertEqual(800, ex_sizes["/proj/include/d.h"])
+        self.assertEqual(1000, ex_sizes["/proj/include/e.h"])
+
+    def test_connected_bounded(self):
+        build_tree = load_graph()
+        a_node = build_tree.getNode("/proj/include/a.h")
+        b_node = build_tree.getNode("/proj/include/b.h")
+        c_node = build_tree.getNode("/proj/include/c.h")
+        d_node = build_tree.getNode("/proj/include/d.h")
+
+        nodes, hidden = build_tree.getConnectedNodesBounded([c_node], radius=1)
+        self.assertEqual({a_node, b_node, c_node, d_node}, nodes)
+        self.assertEqual({a_node: (1, 0), b_node: (2, 0)}, hidden)
+
+        nodes, hidden = build_tree.getConnectedNodesBounded([c_node], max_nodes=2)
+        self.assertEqual({b_node, c_node}, nodes)
+        self.assertEqual({b_node: (2, 0), c_node: (1, 1)}, hidden)
+
+        nodes, hidden = build_tree.getConnectedNodesBounded([c_node])
+        self.assertEqual(build_tree.getConnectedNodes([c_node]), nodes)
+        self.assertEqual({}, hidden)
+
+    def test_simulate_remove(self):
+        build_tree = load_graph()
+        result = simulate_include_changes(build_tree, removed_includes=[("b.h", "c.h")])
+        self.assertEqual(-(300 + 400), result.size_delta)
+        self.assertEqual(2, result.objects_count)
+
+        util_node = build_tree.getNode(BUILD_DIR + "/CMakeFiles/app.dir/util.cpp.o")
+        self.assertEqual(2000 + 200 + 500, util_node.data.ai_size)
+        c_node = build_tree.getNode("/proj/include/c.h")
+        self.assertEqual(
+            ["/proj/build/CMakeFiles/app.dir/main.cpp.o"], [obj.data.name for obj in c_node.data.all_obj_files]
+        )
+        self.assertEqual(300 + 400, c_node.data.ex_size)
+        self.assertEqual(1, build_tree.root.data.include_counter["/proj/include/c.h"])
+
+    def test_simulate_revert(self):
+        build_tree = load_graph()
+        counter = build_tree.root.data.include_counter.copy()
+        simulate_include_changes(build_tree, removed_includes=[("b.h", "c.h")])
+        result = simulate_include_changes(build_tree, added_includes=[("b.h", "c.h")])
+        self.assertEqual(300 + 400, result.size_delta)
+        self.assertEqual(counter, build_tree.root.data.include_counter)
+        self.assertEqual(700 + 1400, build_tree.getNode("/proj/include/b.h").data.ex_size)
+
+    def test_simulate_after_chop(self):
+        files_info_dict = read_files_info(get_data_path("files_info.txt"))
+        graph_list = read_build_logs([get_data_path("build_log.txt")], BUILD_DIR, files_info_dict)
+        ## chopped node is removed from its parents, but remains parent of its children
+        for package_node in graph_list:
+            package_node.chopNodes("/proj/include/b.h")
+        build_tree = IncludeGraph(graph_list)
+        self.assertNotIn("/proj/include/b.h", build_tree.nodes_dict)
+
+        result = simulate_include_changes(build_tree, removed_includes=[("c.h", "d.h")])
+        self.assertEqual(-400, result.size_delta)
+        self.assertEqual(1, result.objects_count)
+        self.assertEqual(300, build_tree.getNode("/proj/include/c.h").data.ai_size)
+        self.assertNotIn("/proj/include/d.h", build_tree.root.data.include_counter)
+
+    def test_remove_object(self):
+        build_tree = load_graph()
+        util_name = BUILD_DIR + "/CMakeFiles/app.dir/util.cpp.o"
+        build_tree.removeObject(util_name)
+        self.assertNotIn(util_name, build_tree.nodes_dict)
+
+        b_node = build_tree.getNode("/proj/include/b.h")
+        self.assertEqual(
+            ["/proj/build/CMakeFiles/app.dir/main.cpp.o"], [obj.data.name for obj in b_node.data.all_obj_files]
+        )
+        self.assertEqual(700, b_node.data.ex_size)
+        package_node = build_tree.getNode("build")
+        self.assertEqual(1000 + 100 + 200 + 300 + 400 + 500, package_node.data.ai_size)
+
+    def test_replace_package(self):
+        build_tree = load_graph()
+        sizes = {name: (node.data.ai_size, node.data.ex_size) for name, node in build_tree.nodes_dict.items()}
+        counter = build_tree.root.data.include_counter.copy()
+
+        package_list = load_graph().getPackageNodes()
+        build_tree.replacePackage(package_list[0])
+        new_sizes = {name: (node.data.ai_size, node.data.ex_size) for name, node in build_tree.nodes_dict.items()}
+        self.assertEqual(sizes, new_sizes)
+        self.assertEqual(counter, build_tree.root.data.include_counter)
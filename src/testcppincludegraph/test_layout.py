@@ -0,0 +1,55 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+from unittest import mock
+import subprocess  # nosec
+
+from cppincludegraph.dotwriter import DotGraph
+from cppincludegraph.layout import calculate_layered_layout, select_engine, get_layout_config, render_graph
+
+
+def create_graph(edges_list):
+    graph = DotGraph()
+    for edge in edges_list:
+        graph.addNode(edge[0], label=edge[0])
+        graph.addNode(edge[1], label=edge[1])
+        graph.addEdge(*edge)
+    return graph
+
+
+class LayoutTest(unittest.TestCase):
+    def test_layered_layout(self):
+        graph = create_graph([("a", "b"), ("b", "c"), ("a", "c"), ("a", "d")])
+        positions = calculate_layered_layout(graph)
+        self.assertLess(positions["a"][0], positions["b"][0])
+        self.assertLess(positions["b"][0], positions["c"][0])
+        self.assertEqual(positions["b"][0], positions["d"][0])
+        self.assertNotEqual(positions["b"][1], positions["d"][1])
+
+    def test_layered_layout_cycle(self):
+        graph = create_graph([("a", "b"), ("b", "c"), ("c", "b")])
+        positions = calculate_layered_layout(graph)
+        self.assertEqual({"a", "b", "c"}, positions.keys())
+        self.assertLess(positions["a"][0], positions["b"][0])
+
+    def test_select_engine(self):
+        graph = create_graph([("a", "b"), ("b", "c")])
+        self.assertEqual("dot", select_engine(graph, get_layout_config()))
+        self.assertEqual("neato", select_engine(graph, get_layout_config({"threshold": 2, "engine": "neato"})))
+        self.assertEqual("dot", select_engine(graph, get_layout_config({"threshold": 0})))
+
+    def test_timeout_fallback(self):
+        graph = create_graph([("a", "b")])
+        with mock.patch("cppincludegraph.layout.render_dot") as render_mock:
+            render_mock.side_effect = [subprocess.TimeoutExpired("dot", 1), b"<svg/>"]
+            self.assertEqual(b"<svg/>", render_graph(graph, "svg", {"timeout": 1}))
+        fallback_call = render_mock.call_args_list[1]
+        self.assertEqual(("svg", "neato"), fallback_call.args[1:3])
+        self.assertEqual(["-n2"], fallback_call.kwargs["extra_args"])
+        self.assertIn("pos=", fallback_call.args[0])
+        self.assertIsNone(graph.getNode("a").get("pos"))
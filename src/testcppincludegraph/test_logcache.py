@@ -0,0 +1,51 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import shutil
+import unittest
+import tempfile
+
+from testcppincludegraph import get_data_path
+from testcppincludegraph.test_includegraph import BUILD_DIR
+
+from cppincludegraph.logparser import read_build_log_file
+from cppincludegraph.logcache import LogCache, tree_to_list
+
+
+def get_trees_state(trees_list):
+    names_dict = {}
+    items_list = [tree_to_list(names_dict, tree) for tree in trees_list]
+    return (items_list, list(names_dict.keys()))
+
+
+class LogCacheTest(unittest.TestCase):
+    def test_store_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "build_log.txt")
+            shutil.copyfile(get_data_path("build_log.txt"), log_path)
+            trees_list = read_build_log_file(log_path, BUILD_DIR)
+
+            log_cache = LogCache(os.path.join(tmp_dir, "cache"))
+            self.assertEqual((False, None), log_cache.load(log_path, BUILD_DIR, None))
+            log_cache.store(log_path, BUILD_DIR, None, trees_list)
+            cache_valid, cached_list = log_cache.load(log_path, BUILD_DIR, None)
+            self.assertTrue(cache_valid)
+            self.assertEqual(get_trees_state(trees_list), get_trees_state(cached_list))
+
+            ## different parameters
+            self.assertFalse(log_cache.load(log_path, "/other/build", None)[0])
+
+            ## touched file with same content
+            stat = os.stat(log_path)
+            os.utime(log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            self.assertTrue(log_cache.load(log_path, BUILD_DIR, None)[0])
+
+            ## changed content
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("\n")
+            self.assertFalse(log_cache.load(log_path, BUILD_DIR, None)[0])
@@ -0,0 +1,79 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import os
+import tempfile
+import unittest
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.pagewriter import PageIndex, PageWriter
+
+
+class PageWriterTest(unittest.TestCase):
+    def test_links(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        page_index = PageIndex(build_tree, "/out/")
+        c_node = build_tree.getNode("/proj/include/c.h")
+        self.assertEqual("_proj_include_c.h.html", page_index.links[c_node])
+        self.assertEqual("", page_index.getLinkPrefix("/out"))
+        self.assertEqual("../", page_index.getLinkPrefix("/out/sub"))
+
+    def test_include_tables(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        page_index = PageIndex(build_tree, "/out")
+        out_file = io.StringIO()
+        page_writer = PageWriter(out_file, page_index, "/out")
+        c_node = build_tree.getNode("/proj/include/c.h")
+        d_node = build_tree.getNode("/proj/include/d.h")
+        page_writer.writeIncludeTables([(d_node, 2, 0.78), (c_node, 1, 0.29)])
+        content = out_file.getvalue()
+
+        self.assertEqual(3, content.count("Total inclusions: 3"))
+        self.assertEqual(3, content.count('<a href="_proj_include_c.h.html">/proj/include/c.h</a>'))
+        ## sorted by name in descending order, then by number of object files
+        d_positions = [pos for pos in range(len(content)) if content.startswith("/proj/include/d.h<", pos)]
+        c_positions = [pos for pos in range(len(content)) if content.startswith("/proj/include/c.h<", pos)]
+        self.assertLess(d_positions[0], c_positions[0])
+        self.assertLess(d_positions[1], c_positions[1])
+
+    def test_sort_orders(self):
+        build_tree = load_graph()
+        build_tree.setRootDir("/out")
+        page_index = PageIndex(build_tree, "/out")
+        names = ["/proj/include/e.h", "/proj/include/a.h", "/proj/include/c.h"]
+        nodes_list = [build_tree.getNode(name) for name in names]
+        self.assertEqual(sorted(names), [node.data.name for node in page_index.sortByName(nodes_list)])
+        by_size = [node.data.name for node in page_index.sortByFileSize(nodes_list)]
+        self.assertEqual(["/proj/include/e.h", "/proj/include/c.h", "/proj/include/a.h"], by_size)
+
+    def test_table_limit(self):
+        build_tree = load_graph()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_tree.setRootDir(tmp_dir)
+            page_index = PageIndex(build_tree, tmp_dir)
+            out_file = io.StringIO()
+            listing_base = os.path.join(tmp_dir, "index")
+            page_writer = PageWriter(out_file, page_index, tmp_dir, listing_base, {"limit": 1, "page_size": 2})
+            nodes_list = [build_tree.getNode(f"/proj/include/{name}.h") for name in "abcde"]
+            page_writer.writeObjectFilesTables(nodes_list)
+            content = out_file.getvalue()
+
+            self.assertEqual(2, content.count("Presented 1 of 5 items."))
+            self.assertIn('<a href="index.objects_size.3.html">3</a>', content)
+            ## largest file on page, remaining files in listing
+            self.assertNotIn("/proj/include/d.h<", content.split("sorted by size")[1])
+            self.assertIn("/proj/include/e.h<", content.split("sorted by size")[1])
+            with open(os.path.join(tmp_dir, "index.objects_size.2.html"), encoding="utf-8") as listing_file:
+                listing_content = listing_file.read()
+            self.assertIn("items 3-4 of 5:", listing_content)
+            self.assertIn("/proj/include/b.h<", listing_content)
+            self.assertIn("/proj/include/c.h<", listing_content)
+            self.assertNotIn("/proj/include/a.h<", listing_content)
@@ -0,0 +1,59 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.querygraph import IncludeQuery, format_chain
+
+
+def get_names(nodes_list):
+    return [node.data.name.split("/")[-1] for node in nodes_list]
+
+
+class IncludeQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.query = IncludeQuery(load_graph())
+
+    def test_findNode(self):
+        node = self.query.findNode("c.h")
+        self.assertEqual("/proj/include/c.h", node.data.name)
+        self.assertIs(node, self.query.findNode("/proj/include/c.h"))
+        self.assertRaises(ValueError, self.query.findNode, "missing.h")
+        ## suffix has to match whole path items
+        self.assertRaises(ValueError, self.query.findNode, "clude/c.h")
+
+    def test_getShortestChain(self):
+        obj = self.query.findNode("main.cpp.o")
+        header = self.query.findNode("d.h")
+        chain = self.query.getShortestChain(obj, header)
+        self.assertEqual(["main.cpp.o", "a.h", "c.h", "d.h"], get_names(chain))
+        ## cached predecessors give the same answer
+        self.assertEqual(chain, self.query.getShortestChain(obj, header))
+        self.assertEqual(1, len(self.query.predecessors_cache))
+
+        ## header does not include object file
+        self.assertEqual([], self.query.getShortestChain(header, obj))
+        self.assertTrue(format_chain(chain).endswith("/c.h -> /proj/include/d.h"))
+
+    def test_getAllChains(self):
+        source = self.query.findNode("main.cpp.o")
+        target = self.query.findNode("d.h")
+        chains = self.query.getAllChains(source, target)
+        names = sorted(get_names(chain) for chain in chains)
+        self.assertEqual([["main.cpp.o", "a.h", "c.h", "d.h"], ["main.cpp.o", "b.h", "c.h", "d.h"]], names)
+        self.assertEqual(1, len(self.query.getAllChains(source, target, limit=1)))
+
+        util = self.query.findNode("util.cpp.o")
+        chains = self.query.getAllChains(util, self.query.findNode("a.h"))
+        self.assertEqual([], chains)
+
+    def test_getIncluders(self):
+        target = self.query.findNode("c.h")
+        self.assertEqual(["a.h", "b.h"], get_names(self.query.getIncluders(target)))
+        self.assertEqual(["main.cpp.o", "util.cpp.o"], get_names(self.query.getIncludingObjects(target)))
@@ -0,0 +1,55 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from cppincludegraph.rendercache import RenderCache, write_file_if_changed, replace_file_if_changed
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_render(self):
+        rendered = []
+
+        def render_func(content):
+            rendered.append(content)
+            return "<svg>" + content + "</svg>"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            render_cache = RenderCache(tmp_dir)
+            self.assertEqual("<svg>a</svg>", render_cache.render("a", "svg", lambda: render_func("a")))
+            self.assertEqual("<svg>a</svg>", render_cache.render("a", "svg", lambda: render_func("a")))
+            self.assertEqual("<svg>b</svg>", render_cache.render("b", "svg", lambda: render_func("b")))
+
+            ## cache shared between instances
+            render_cache = RenderCache(tmp_dir)
+            self.assertEqual("<svg>b</svg>", render_cache.render("b", "svg", lambda: render_func("b")))
+        self.assertEqual(["a", "b"], rendered)
+        self.assertEqual(1, render_cache.hits)
+        self.assertEqual(0, render_cache.misses)
+
+    def test_write_if_changed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, "page.html")
+            self.assertTrue(write_file_if_changed(out_path, "content"))
+            self.assertFalse(write_file_if_changed(out_path, "content"))
+            self.assertTrue(write_file_if_changed(out_path, "new content"))
+            with open(out_path, encoding="utf-8") as in_file:
+                self.assertEqual("new content", in_file.read())
+
+    def test_replace_if_changed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, "page.html")
+            tmp_path = out_path + ".tmp"
+            for content, expected in [("content", True), ("content", False), ("new content", True)]:
+                with open(tmp_path, "w", encoding="utf-8") as tmp_file:
+                    tmp_file.write(content)
+                self.assertEqual(expected, replace_file_if_changed(tmp_path, out_path))
+                self.assertFalse(os.path.exists(tmp_path))
+            with open(out_path, encoding="utf-8") as in_file:
+                self.assertEqual("new content", in_file.read())
@@ -0,0 +1,82 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+from unittest import mock
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.generator import get_graph_config, get_pages_config
+from cppincludegraph.server import PageCache, PageRenderer, get_page_path, SERVER_ROOT
+
+
+class PageCacheTest(unittest.TestCase):
+    def test_evict_least_recent(self):
+        cache = PageCache(10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        self.assertEqual(b"1234", cache.get("a"))
+        cache.put("c", b"1234")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"1234", cache.get("a"))
+        self.assertEqual(b"1234", cache.get("c"))
+        self.assertEqual(8, cache.size)
+        self.assertEqual(3, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_put_too_big(self):
+        cache = PageCache(10)
+        cache.put("a", b"1234")
+        cache.put("a", b"12345678901")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.size)
+
+
+class ServerTest(unittest.TestCase):
+    def test_get_page_path(self):
+        self.assertEqual("index.html", get_page_path("/"))
+        self.assertEqual("index.html", get_page_path("/index.html?x=1"))
+        self.assertEqual("proj/a b.h.html", get_page_path("/proj/a%20b.h.html"))
+
+    def test_pages_dict(self):
+        build_tree = load_graph()
+        pages_config = get_pages_config(build_tree, {}, get_graph_config(), SERVER_ROOT)
+        renderer = PageRenderer(build_tree, pages_config)
+
+        node = build_tree.getNode("/proj/include/a.h")
+        page_path = renderer.page_index.links[node]
+        self.assertFalse(page_path.startswith("/"))
+        self.assertIs(node, renderer.pages_dict[page_path])
+        self.assertIsNone(renderer.getPage("missing.html"))
+
+    def test_getPage(self):
+        build_tree = load_graph()
+        pages_config = get_pages_config(build_tree, {}, get_graph_config(), SERVER_ROOT)
+        renderer = PageRenderer(build_tree, pages_config)
+        node = build_tree.getNode("/proj/include/a.h")
+        node_path = renderer.page_index.links[node]
+
+        with mock.patch("cppincludegraph.layout.render_dot") as render_mock:
+            render_mock.return_value = b"<svg/>"
+            index_page = renderer.getPage("index.html")
+            node_page = renderer.getPage(node_path)
+            self.assertEqual(2, render_mock.call_count)
+            self.assertIn(b"<svg/>", index_page)
+            self.assertIn(node.data.name.encode("utf-8"), node_page)
+
+            cache = renderer.cache
+            self.assertEqual(0, cache.hits)
+            self.assertEqual(2, cache.misses)
+            self.assertEqual(len(index_page) + len(node_page), cache.size)
+
+            ## second request is served from cache without rendering
+            self.assertIs(index_page, renderer.getPage("index.html"))
+            self.assertIs(node_page, renderer.getPage(node_path))
+            self.assertEqual(2, render_mock.call_count)
+            self.assertEqual(2, cache.hits)
+            self.assertEqual(2, cache.misses)
+            self.assertEqual(len(index_page) + len(node_page), cache.size)
@@ -0,0 +1,72 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sqlite3
+import unittest
+import tempfile
+from unittest import mock
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.sqlexport import export_sqlite
+
+
+class SqlExportTest(unittest.TestCase):
+    def test_export(self):
+        build_tree = load_graph()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "graph.db")
+            ## small batches to cover splitting of rows
+            export_sqlite(build_tree, db_path, batch_size=2)
+            self.assertEqual(["graph.db"], os.listdir(tmp_dir))
+
+            connection = sqlite3.connect(db_path)
+            try:
+                nodes_count = connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+                self.assertEqual(len(build_tree.root.data.all_children), nodes_count)
+
+                row = connection.execute(
+                    "SELECT type, fsize, ai_size, objects FROM nodes WHERE name = ?", ("/proj/include/b.h",)
+                ).fetchone()
+                self.assertEqual(("HEADER", 200, 1400, 2), row)
+
+                children = connection.execute(
+                    "SELECT child.name FROM edges JOIN nodes parent ON parent.id = edges.parent_id"
+                    " JOIN nodes child ON child.id = edges.child_id WHERE parent.name = ? ORDER BY child.name",
+                    ("/proj/include/b.h",),
+                ).fetchall()
+                self.assertEqual([("/proj/include/c.h",), ("/proj/include/e.h",)], children)
+
+                headers = connection.execute(
+                    "SELECT header.name, object_includes.count FROM object_includes"
+                    " JOIN nodes obj ON obj.id = object_includes.object_id"
+                    " JOIN nodes header ON header.id = object_includes.header_id"
+                    " WHERE obj.name LIKE '%main.cpp.o' ORDER BY header.name",
+                ).fetchall()
+                self.assertEqual(
+                    [
+                        ("/proj/include/a.h", 1),
+                        ("/proj/include/b.h", 1),
+                        ("/proj/include/c.h", 3),
+                        ("/proj/include/d.h", 4),
+                        ("/proj/include/e.h", 2),
+                    ],
+                    headers,
+                )
+            finally:
+                connection.close()
+
+    def test_export_failure(self):
+        build_tree = load_graph()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "graph.db")
+            with mock.patch("cppincludegraph.sqlexport.get_edges_rows") as rows_mock:
+                rows_mock.side_effect = RuntimeError("failure")
+                self.assertRaises(RuntimeError, export_sqlite, build_tree, db_path)
+            ## neither incomplete database nor temporary file is left
+            self.assertEqual([], os.listdir(tmp_dir))
@@ -0,0 +1,49 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import sys
+import json
+import unittest
+import subprocess  # nosec
+
+from testcppincludegraph.test_includegraph import load_graph
+
+from cppincludegraph.stats import calculate_stats, write_stats
+
+
+class StatsTest(unittest.TestCase):
+    def test_calculate_stats(self):
+        stats = calculate_stats(load_graph(), limit=2)
+        self.assertEqual({"packages": 1, "object_files": 2, "headers": 5, "total_size": 2500 + 3400}, stats["summary"])
+        self.assertEqual(["/proj/include/b.h", "/proj/include/a.h"], [row["name"] for row in stats["ai_size"]])
+        self.assertEqual(["/proj/include/e.h", "/proj/include/d.h"], [row["name"] for row in stats["total_size"]])
+        self.assertEqual(2 * 500, stats["total_size"][0]["total_size"])
+
+    def test_write_stats(self):
+        stats = calculate_stats(load_graph(), limit=1)
+
+        out_file = io.StringIO()
+        write_stats(stats, out_file, "json")
+        self.assertEqual(stats, json.loads(out_file.getvalue()))
+
+        out_file = io.StringIO()
+        write_stats(stats, out_file, "csv")
+        lines = out_file.getvalue().splitlines()
+        self.assertEqual("order,rank,name,objects,fsize,ai_size,ex_size,total_size", lines[0])
+        self.assertEqual(4, len(lines))
+
+        out_file = io.StringIO()
+        write_stats(stats, out_file, "text")
+        self.assertIn("Headers: 5", out_file.getvalue())
+
+        self.assertRaises(ValueError, write_stats, stats, out_file, "xml")
+
+    def test_no_template_engine(self):
+        code = "import sys, cppincludegraph.main; sys.exit(1 if 'texthon' in sys.modules else 0)"
+        result = subprocess.run([sys.executable, "-c", code], check=False)  # nosec
+        self.assertEqual(0, result.returncode)
@@ -0,0 +1,53 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import unittest
+import tempfile
+
+from cppincludegraph.includegraph import IncludeGraph, NodeData
+from cppincludegraph.logparser import read_build_logs, read_files_info
+from cppincludegraph.synthlog import generate_build_log, generate_build_files, get_build_dir
+
+
+class SynthLogTest(unittest.TestCase):
+    def test_deterministic(self):
+        config = {"objects": 50, "seed": 3}
+        first_log = io.StringIO()
+        first_sizes = generate_build_log(first_log, config)
+        second_log = io.StringIO()
+        second_sizes = generate_build_log(second_log, config)
+        self.assertEqual(first_log.getvalue(), second_log.getvalue())
+        self.assertEqual(first_sizes, second_sizes)
+
+        other_log = io.StringIO()
+        generate_build_log(other_log, {"objects": 50, "seed": 4})
+        self.assertNotEqual(first_log.getvalue(), other_log.getvalue())
+
+    def test_graph(self):
+        config = {"objects": 40, "headers": 60, "depth": 4, "cycles": 1.0}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path, info_path = generate_build_files(tmp_dir, config)
+            files_info_dict = read_files_info(info_path)
+            graph_list = read_build_logs([log_path], get_build_dir(config), files_info_dict)
+        build_tree = IncludeGraph(graph_list)
+
+        obj_files = [node for node in build_tree.root.data.all_children if node.data.name.endswith(".cpp.o")]
+        self.assertEqual(40, len(obj_files))
+        ## all sizes are read from files info
+        files_list = [
+            node for node in build_tree.root.data.all_children if node.data.type is not NodeData.NodeType.PACKAGE
+        ]
+        self.assertTrue(all(node.data.fsize > 0 for node in files_list))
+
+        ## some header includes its includer
+        cycles = [
+            node
+            for node in build_tree.root.data.all_children
+            if any(node in child.data.all_children for child in node.children)
+        ]
+        self.assertGreater(len(cycles), 0)
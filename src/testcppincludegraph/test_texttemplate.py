@@ -0,0 +1,45 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from cppincludegraph import texttemplate
+
+
+TEMPLATE_CONTENT = """#template main( INPUT_DICT )
+value: ${INPUT_DICT['value']}
+#end template
+"""
+
+
+class TextTemplateTest(unittest.TestCase):
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            template_path = os.path.join(tmp_dir, "page.tmpl")
+            with open(template_path, "w", encoding="utf-8") as template_file:
+                template_file.write(TEMPLATE_CONTENT)
+
+            module = texttemplate.get_module(template_path)
+            self.assertIs(module, texttemplate.get_module(template_path))
+            self.assertEqual("value: 1\n", texttemplate.render(template_path, INPUT_DICT={"value": 1}))
+            self.assertEqual("value: 2\n", texttemplate.render(template_path, INPUT_DICT={"value": 2}))
+            texttemplate.clear_cache()
+            self.assertIsNot(module, texttemplate.get_module(template_path))
+
+    def test_generate_batch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            template_path = os.path.join(tmp_dir, "page.tmpl")
+            with open(template_path, "w", encoding="utf-8") as template_file:
+                template_file.write(TEMPLATE_CONTENT)
+
+            items = [(os.path.join(tmp_dir, f"out{i}.txt"), {"INPUT_DICT": {"value": i}}) for i in range(3)]
+            texttemplate.generate_batch(template_path, items)
+            for i in range(3):
+                with open(os.path.join(tmp_dir, f"out{i}.txt"), encoding="utf-8") as out_file:
+                    self.assertEqual(f"value: {i}\n", out_file.read())
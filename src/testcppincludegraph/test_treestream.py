@@ -0,0 +1,48 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import json
+import unittest
+
+from testcppincludegraph import get_data_path
+
+from cppincludegraph.treestream import write_include_trees
+
+
+BUILD_DIR = "/proj/build"
+
+
+class TreeStreamTest(unittest.TestCase):
+    def test_nested(self):
+        out_file = io.StringIO()
+        count = write_include_trees([get_data_path("build_log.txt")], BUILD_DIR, out_file)
+        self.assertEqual(2, count)
+        lines = out_file.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        tree = json.loads(lines[0])
+        self.assertEqual(BUILD_DIR + "/CMakeFiles/app.dir/main.cpp.o", tree["object"])
+        self.assertEqual(get_data_path("build_log.txt"), tree["log"])
+        self.assertEqual(["/proj/include/a.h", "/proj/include/b.h"], [item["name"] for item in tree["includes"]])
+        header_a = tree["includes"][0]
+        self.assertEqual("/proj/include/c.h", header_a["includes"][0]["name"])
+        self.assertEqual("/proj/include/d.h", header_a["includes"][0]["includes"][0]["name"])
+
+    def test_flat(self):
+        out_file = io.StringIO()
+        write_include_trees([get_data_path("build_log.txt")], BUILD_DIR, out_file, tree_format="flat")
+        lines = out_file.getvalue().splitlines()
+        tree = json.loads(lines[1])
+        self.assertEqual(BUILD_DIR + "/CMakeFiles/app.dir/util.cpp.o", tree["object"])
+        self.assertEqual(
+            ["/proj/include/b.h", "/proj/include/c.h", "/proj/include/d.h", "/proj/include/e.h"], tree["includes"]
+        )
+
+    def test_missing_log(self):
+        out_file = io.StringIO()
+        self.assertEqual(0, write_include_trees([get_data_path("missing.txt")], BUILD_DIR, out_file))
+        self.assertEqual("", out_file.getvalue())
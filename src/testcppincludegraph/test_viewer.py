@@ -0,0 +1,48 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import json
+import unittest
+import tempfile
+
+from testcppincludegraph.test_includegraph import load_graph, BUILD_DIR
+
+from cppincludegraph.viewer import get_graph_data, generate_viewer, DATA_FILE_NAME, TYPES_LIST
+
+
+class ViewerTest(unittest.TestCase):
+    def test_get_graph_data(self):
+        build_tree = load_graph()
+        graph_data = get_graph_data(build_tree)
+        names_list = graph_data["name"]
+        self.assertEqual(sorted(names_list), names_list)
+        self.assertEqual(len(build_tree.root.data.all_children), len(names_list))
+
+        header_id = names_list.index("/proj/include/a.h")
+        self.assertEqual(TYPES_LIST.index("HEADER"), graph_data["type"][header_id])
+        self.assertEqual(100, graph_data["fsize"][header_id])
+        obj_id = names_list.index(BUILD_DIR + "/CMakeFiles/app.dir/util.cpp.o")
+        self.assertEqual(TYPES_LIST.index("OBJ_FILE"), graph_data["type"][obj_id])
+        for package_id in graph_data["packages"]:
+            self.assertEqual(TYPES_LIST.index("PACKAGE"), graph_data["type"][package_id])
+
+        node = build_tree.getNode("/proj/include/a.h")
+        children_names = sorted(names_list[child_id] for child_id in graph_data["children"][header_id])
+        self.assertEqual(sorted(child.data.name for child in node.children), children_names)
+
+    def test_generate_viewer(self):
+        build_tree = load_graph()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_viewer(build_tree, tmp_dir)
+            self.assertEqual(["graph_data.js", "index.html", "viewer.js"], sorted(os.listdir(tmp_dir)))
+            with open(os.path.join(tmp_dir, DATA_FILE_NAME), encoding="utf-8") as data_file:
+                content = data_file.read()
+            prefix = "var GRAPH_DATA = "
+            self.assertTrue(content.startswith(prefix))
+            graph_data = json.loads(content[len(prefix) :].rstrip().rstrip(";"))
+            self.assertEqual(get_graph_data(build_tree), graph_data)